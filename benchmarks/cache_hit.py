@@ -0,0 +1,182 @@
+"""
+Benchmark do caminho de cache hit em /api/v1/extract.
+
+Mede requests/s de um worker servindo apenas cache hits (Redis simulado
+em memória, sem rede) e compara o custo por hit de montar a resposta:
+
+- legado: json.loads + ExtractionResponse + jsonable_encoder + json.dumps
+- passthrough: JSON do cache inserido direto no envelope
+
+Uso:
+    python benchmarks/cache_hit.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000000")
+
+import httpx
+import structlog
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from extractor.api.endpoints.extract import render_extraction
+from extractor.core.cache import CacheEntry, CacheService
+from extractor.core.extractor import ExtractorService
+from extractor.dependencies import get_extractor
+from extractor.main import create_app
+from extractor.schemas.domains.financial import Fatura
+from extractor.schemas.domains.legal import Contrato
+from extractor.schemas.registry import schema_registry
+from extractor.schemas.requests import ExtractionResponse
+
+
+def sample_payloads() -> dict[str, str]:
+    """JSON representativo de Fatura e Contrato."""
+    fatura = Fatura.model_validate_json(
+        json.dumps(
+            {
+                "numero_fatura": "2024-0042",
+                "emitente": "Tech Solutions Ltda",
+                "destinatario": "Empresa ABC",
+                "data_emissao": "2024-01-15",
+                "data_vencimento": "2024-02-15",
+                "valor_total": "7500.00",
+                "itens": [f"Consultoria em TI, etapa {i}" for i in range(15)],
+            }
+        )
+    )
+    contrato = Contrato.model_validate_json(
+        json.dumps(
+            {
+                "tipo_contrato": "Prestação de Serviços",
+                "partes": ["Empresa A Ltda", "Empresa B S.A."],
+                "objeto": "Desenvolvimento e manutenção de software",
+                "valor": "R$ 25.000,00/mês",
+                "vigencia_inicio": "2024-01-01",
+                "vigencia_fim": "2025-12-31",
+                "clausulas_principais": [
+                    f"Cláusula {i}: obrigações e prazos da etapa {i}" for i in range(40)
+                ],
+                "penalidades": [f"Multa de {i}% por atraso" for i in range(10)],
+            }
+        )
+    )
+    return {"Fatura": fatura.model_dump_json(), "Contrato": contrato.model_dump_json()}
+
+
+class _MemoryRedis:
+    """Redis mínimo em memória (só o que o caminho de hit usa)."""
+
+    def __init__(self, store: dict[str, str]) -> None:
+        self.store = store
+
+    async def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+
+def _legacy(schema_name: str, payload: str) -> bytes:
+    """Caminho anterior: desserializa, revalida e serializa de novo."""
+    response = ExtractionResponse(schema_name=schema_name, data=json.loads(payload))
+    return json.dumps(jsonable_encoder(response)).encode()
+
+
+def bench_render(payloads: dict[str, str], number: int) -> None:
+    """Compara o custo por hit de montar a resposta."""
+    for schema_name, payload in payloads.items():
+        legacy = timeit.timeit(
+            lambda s=schema_name, p=payload: _legacy(s, p), number=number
+        )
+        fast = timeit.timeit(
+            lambda s=schema_name, p=payload: render_extraction(s, p), number=number
+        )
+        print(
+            f"{schema_name:<9} legado {legacy / number * 1e6:8.1f} µs  "
+            f"passthrough {fast / number * 1e6:6.1f} µs  "
+            f"({legacy / fast:.0f}x)"
+        )
+
+
+def build_hit_app(
+    payloads: dict[str, str],
+) -> tuple[FastAPI, dict[str, dict[str, str]]]:
+    """
+    Cria a aplicação com o cache já populado.
+
+    Returns:
+        App e, por schema, o corpo de request que resulta em cache hit
+    """
+    cache = CacheService()
+    cache.settings.cache_enabled = True
+    bodies: dict[str, dict[str, str]] = {}
+    store: dict[str, str] = {}
+    for schema_name, payload in payloads.items():
+        text = f"Documento de exemplo para {schema_name}"
+        bodies[schema_name] = {"text": text, "schema_name": schema_name}
+        entry = CacheEntry(payload=payload, expires_at=time.time() + 3600)
+        store[cache._generate_key(text, schema_name)] = entry.encode()
+    cache._redis = _MemoryRedis(store)  # type: ignore[assignment]
+
+    app = create_app()
+    app.dependency_overrides[get_extractor] = lambda: ExtractorService(
+        client=None,  # type: ignore[arg-type]
+        cache=cache,
+        registry=schema_registry,
+    )
+    return app, bodies
+
+
+async def measure_hits(
+    app: FastAPI, bodies: dict[str, dict[str, str]], total: int
+) -> dict[str, float]:
+    """Requests/s de cache hit por schema (1 worker, ASGI in-process)."""
+    results: dict[str, float] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for schema_name, body in bodies.items():
+            start = time.perf_counter()
+            for _ in range(total):
+                response = await client.post("/api/v1/extract", json=body)
+                assert response.status_code == 200, response.text
+            results[schema_name] = total / (time.perf_counter() - start)
+    return results
+
+
+async def bench_requests(payloads: dict[str, str], total: int) -> None:
+    """Mede requests/s de cache hit em um worker."""
+    app, bodies = build_hit_app(payloads)
+    for schema_name, rate in (await measure_hits(app, bodies, total)).items():
+        print(f"{schema_name:<9} {rate:8.0f} req/s (cache hit)")
+
+
+def main() -> None:
+    """Executa os benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    payloads = sample_payloads()
+
+    print("== Montagem da resposta por hit ==")
+    bench_render(payloads, args.number)
+    print("== Requests de cache hit (1 worker, ASGI in-process) ==")
+    asyncio.run(bench_requests(payloads, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark dos middlewares no caminho de cache hit.
+
+Compara requests/s com os middlewares antigos (``BaseHTTPMiddleware``,
+reproduzidos aqui) e com os atuais em ASGI puro, na mesma aplicação.
+
+Uso:
+    python benchmarks/middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import structlog
+from cache_hit import build_hit_app, measure_hits, sample_payloads
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+from extractor.api.middleware import RateLimitMiddleware, RequestLoggingMiddleware
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """RateLimitMiddleware como era antes (BaseHTTPMiddleware)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests: int = 100,
+        window: int = 60,
+        **_kwargs: object,
+    ) -> None:
+        super().__init__(app)
+        self.requests = requests
+        self.window = window
+        self._requests: dict[str, list[float]] = defaultdict(list)
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        client_ip = request.client.host if request.client else "unknown"
+        now = time.time()
+        self._requests[client_ip] = [
+            ts for ts in self._requests[client_ip] if now - ts < self.window
+        ]
+        if len(self._requests[client_ip]) >= self.requests:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+        self._requests[client_ip].append(now)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(self.requests)
+        response.headers["X-RateLimit-Remaining"] = str(
+            self.requests - len(self._requests[client_ip])
+        )
+        return response
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """RequestLoggingMiddleware como era antes (BaseHTTPMiddleware)."""
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        start_time = time.perf_counter()
+        logger.info("request_started", method=request.method, path=request.url.path)
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        logger.info(
+            "request_completed",
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration_ms=round(process_time * 1000, 2),
+        )
+        response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+        return response
+
+
+_LEGACY: dict[type, type] = {
+    RateLimitMiddleware: LegacyRateLimitMiddleware,
+    RequestLoggingMiddleware: LegacyRequestLoggingMiddleware,
+}
+
+
+def use_legacy_middlewares(app: FastAPI) -> None:
+    """Troca os middlewares da app pelas versões antigas."""
+    app.user_middleware = [
+        Middleware(_LEGACY[m.cls], *m.args, **m.kwargs) if m.cls in _LEGACY else m
+        for m in app.user_middleware
+    ]
+
+
+async def run(total: int, rounds: int) -> None:
+    """Mede as duas variantes, alternando para reduzir ruído."""
+    payloads = sample_payloads()
+    best: dict[str, dict[str, float]] = {"BaseHTTPMiddleware": {}, "ASGI puro": {}}
+
+    for _ in range(rounds):
+        for variant, rates in best.items():
+            app, bodies = build_hit_app(payloads)
+            if variant == "BaseHTTPMiddleware":
+                use_legacy_middlewares(app)
+            for schema_name, rate in (await measure_hits(app, bodies, total)).items():
+                rates[schema_name] = max(rate, rates.get(schema_name, 0.0))
+
+    before, after = best["BaseHTTPMiddleware"], best["ASGI puro"]
+    for schema_name in before:
+        print(
+            f"{schema_name:<9} antes {before[schema_name]:7.0f} req/s  "
+            f"depois {after[schema_name]:7.0f} req/s  "
+            f"({after[schema_name] / before[schema_name] - 1:+.0%})"
+        )
+
+
+def main() -> None:
+    """Executa o benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de memória e tempo do rate limiter com muitos IPs distintos.
+
+Compara a lista de timestamps por IP (implementação anterior, reproduzida
+aqui) com o TokenBucketLimiter, incluindo a remoção de clientes parados.
+
+Uso:
+    python benchmarks/rate_limit_memory.py --clients 100000 --requests 100
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from extractor.core.rate_limit import TokenBucketLimiter
+
+
+class LegacyLimiter:
+    """Limitador anterior: lista com todos os timestamps de cada IP."""
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self._requests: dict[str, list[float]] = defaultdict(list)
+
+    def acquire(self, client: str, now: float) -> bool:
+        self._requests[client] = [
+            ts for ts in self._requests[client] if now - ts < self.window
+        ]
+        if len(self._requests[client]) >= self.limit:
+            return False
+        self._requests[client].append(now)
+        return True
+
+
+def _run(
+    acquire: Callable[[str, float], object], ips: list[str], requests: int
+) -> float:
+    """Envia ``requests`` rodadas de uma request por IP; retorna o tempo gasto."""
+    start = time.perf_counter()
+    now = 0.0
+    for _ in range(requests):
+        for ip in ips:
+            acquire(ip, now)
+            now += 0.0001
+    return time.perf_counter() - start
+
+
+def measure(
+    name: str,
+    factory: Callable[[], Callable[[str, float], object]],
+    clients: int,
+    requests: int,
+) -> None:
+    """Mostra memória retida (tracemalloc) e tempo por request (sem tracemalloc)."""
+    ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+
+    elapsed = _run(factory(), ips, requests)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    acquire = factory()
+    _run(acquire, ips, requests)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    print(
+        f"{name:<16} {retained / 2**20:8.1f} MiB  "
+        f"{retained / clients:6.0f} B/cliente  "
+        f"{elapsed / (clients * requests) * 1e6:5.2f} µs/request"
+    )
+
+
+def _bucket_acquire(limiter: TokenBucketLimiter) -> Callable[[str, float], object]:
+    """Adapta TokenBucketLimiter.acquire à assinatura (ip, now)."""
+    return lambda ip, now: limiter.acquire(ip, now=now)
+
+
+def main() -> None:
+    """Executa o benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    measure(
+        "lista (antes)",
+        lambda: LegacyLimiter(args.limit, args.window).acquire,
+        args.clients,
+        args.requests,
+    )
+
+    measure(
+        "token bucket",
+        lambda: _bucket_acquire(TokenBucketLimiter(args.limit, args.window)),
+        args.clients,
+        args.requests,
+    )
+    bucket = TokenBucketLimiter(args.limit, args.window)
+    for ip_index in range(args.clients):
+        bucket.acquire(f"ip{ip_index}", now=0.0)
+
+    # Depois de uma janela sem tráfego, a remoção devolve toda a memória
+    evicted = bucket.evict_idle(now=args.window)
+    print(f"clientes parados removidos: {evicted} (restam {len(bucket)})")
+
+
+if __name__ == "__main__":
+    main()
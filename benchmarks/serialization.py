@@ -0,0 +1,110 @@
+"""
+Benchmark de CPU da serialização das respostas de extração.
+
+Para payloads representativos de Fatura e Contrato (com ``Decimal`` e
+``date``), compara por resposta:
+
+- ``jsonable_encoder`` + ``json.dumps`` (caminho do FastAPI < 0.130)
+- orjson sobre ``model_dump`` (o que um ``ORJSONResponse`` faria)
+- ``dump_json`` do Pydantic (caminho atual do FastAPI com response_model)
+- conversão do JSON pronto para msgpack (``Accept: application/msgpack``)
+
+e a decodificação de um corpo de request grande em JSON e em msgpack.
+
+Uso:
+    python benchmarks/serialization.py --number 5000
+"""
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+import msgpack
+import orjson
+from cache_hit import sample_payloads
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from extractor.api.endpoints.extract import render_extraction
+from extractor.api.negotiation import to_msgpack
+from extractor.schemas.registry import schema_registry
+from extractor.schemas.requests import ExtractionResponse
+
+_adapter = TypeAdapter(ExtractionResponse)
+
+
+def _orjson_default(value: Any) -> str:
+    """Tipos que o orjson não serializa sozinho."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _report(label: str, func: Callable[[], object], number: int) -> float:
+    """Imprime e retorna o tempo médio por chamada em µs."""
+    elapsed = timeit.timeit(func, number=number) / number * 1e6
+    print(f"  {label:<28} {elapsed:8.1f} µs")
+    return elapsed
+
+
+def bench_responses(number: int) -> None:
+    """Serialização de ExtractionResponse com dados tipados."""
+    for schema_name, payload in sample_payloads().items():
+        schema = schema_registry.get(schema_name)
+        data = schema.model_validate_json(payload).model_dump()
+        response = ExtractionResponse(schema_name=schema_name, data=data)
+        json_body = _adapter.dump_json(response)
+        rendered = Response(
+            render_extraction(schema_name, payload), media_type="application/json"
+        )
+
+        print(f"{schema_name} (JSON {len(json_body)} B)")
+        legacy = _report(
+            "jsonable_encoder + json",
+            lambda r=response: json.dumps(jsonable_encoder(r)).encode(),
+            number,
+        )
+        _report(
+            "orjson(model_dump)",
+            lambda r=response: orjson.dumps(r.model_dump(), default=_orjson_default),
+            number,
+        )
+        current = _report(
+            "Pydantic dump_json", lambda r=response: _adapter.dump_json(r), number
+        )
+        _report("JSON -> msgpack", lambda r=rendered: to_msgpack(r), number)
+        print(
+            f"  dump_json {legacy / current:.0f}x mais rápido que jsonable_encoder; "
+            f"msgpack {len(to_msgpack(rendered).body)} B"
+        )
+
+
+def bench_request_body(number: int) -> None:
+    """Decodificação de um ExtractionRequest com texto de 50.000 caracteres."""
+    body = {
+        "text": "Cláusula de teste com acentuação. " * 1470,
+        "schema_name": "Contrato",
+    }
+    as_json, as_msgpack = json.dumps(body).encode(), msgpack.packb(body)
+
+    print(f"Request (JSON {len(as_json)} B, msgpack {len(as_msgpack)} B)")
+    _report("json.loads", lambda: json.loads(as_json), number)
+    _report("msgpack.unpackb", lambda: msgpack.unpackb(as_msgpack), number)
+
+
+def main() -> None:
+    """Executa o benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    bench_responses(args.number)
+    bench_request_body(args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""
+Compressão gzip/zstd de requests e responses.
+
+``CompressionMiddleware`` (ASGI puro):
+
+- descomprime corpos com ``Content-Encoding: gzip`` ou ``zstd`` aos poucos,
+  chunk a chunk. Nas rotas comuns o corpo é lido antes de chegar à
+  aplicação, com limite de tamanho descomprimido (400/413 na hora); nas
+  rotas de streaming (``streaming_paths``) a aplicação recebe os chunks
+  descomprimidos à medida que chegam, sem limite de tamanho total;
+- comprime respostas a partir de ``minimum_size`` bytes conforme o
+  ``Accept-Encoding`` (zstd tem preferência). Em respostas em streaming
+  cada chunk é comprimido e descarregado na hora, para que o cliente
+  receba os dados sem esperar o fim.
+"""
+
+import gzip
+import zlib
+from collections.abc import Collection, Iterator
+from typing import Protocol
+
+import zstandard
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ENCODINGS = ("zstd", "gzip")
+
+# Tipos que já chegam comprimidos ou que não podem ser bufferizados
+_SKIP_MEDIA_TYPES = ("image/", "video/", "audio/", "text/event-stream")
+
+
+class _Encoder(Protocol):
+    """Compressor incremental."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Comprime um chunk (a saída pode ficar retida no compressor)."""
+        ...
+
+    def flush(self) -> bytes:
+        """Descarrega o que já foi comprimido sem fechar o stream."""
+        ...
+
+    def finish(self) -> bytes:
+        """Fecha o stream comprimido."""
+        ...
+
+
+class _GzipEncoder:
+    """gzip com flush por chunk (Z_SYNC_FLUSH)."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdEncoder:
+    """zstd com flush de bloco por chunk."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class DecompressionError(ValueError):
+    """Corpo comprimido inválido."""
+
+
+class BodyTooLargeError(ValueError):
+    """Corpo descomprimido maior que o limite."""
+
+
+class _Decoder(Protocol):
+    """Descompressor incremental."""
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        """Descomprime um chunk em pedaços de tamanho limitado."""
+        ...
+
+    def finish(self) -> None:
+        """Confere que o stream comprimido terminou."""
+        ...
+
+
+# Saída máxima do gzip por pedaço descomprimido
+_GZIP_PIECE = 64 * 1024
+# zstd não limita a saída de uma chamada; o chunk é entregue em fatias
+# pequenas para que uma fatia não se expanda mais que alguns MiB
+_ZSTD_SLICE = 256
+
+
+class _GzipDecoder:
+    """gzip incremental, com saída limitada por ``max_length``."""
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(31)
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        try:
+            while data:
+                piece = self._decompressor.decompress(data, _GZIP_PIECE)
+                data = self._decompressor.unconsumed_tail
+                if piece:
+                    yield piece
+        except zlib.error as e:
+            raise DecompressionError(str(e)) from e
+
+    def finish(self) -> None:
+        if not self._decompressor.eof:
+            raise DecompressionError("Stream gzip incompleto")
+
+
+class _ZstdDecoder:
+    """zstd incremental, alimentado em fatias."""
+
+    def __init__(self) -> None:
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        try:
+            for start in range(0, len(data), _ZSTD_SLICE):
+                piece = self._decompressor.decompress(data[start : start + _ZSTD_SLICE])
+                if piece:
+                    yield piece
+        except zstandard.ZstdError as e:
+            raise DecompressionError(str(e)) from e
+
+    def finish(self) -> None:
+        if not self._decompressor.eof:
+            raise DecompressionError("Stream zstd incompleto")
+
+
+def _decoder(encoding: str) -> _Decoder:
+    """Descompressor incremental para a codificação da request."""
+    if encoding == "zstd":
+        return _ZstdDecoder()
+    return _GzipDecoder()
+
+
+def decompress(body: bytes, encoding: str, max_size: int) -> bytes:
+    """
+    Descomprime um corpo de request.
+
+    Lê no máximo ``max_size + 1`` bytes descomprimidos, de modo que um
+    corpo pequeno que se expande demais (zip bomb) não esgota a memória.
+
+    Raises:
+        DecompressionError: Corpo corrompido
+        BodyTooLargeError: Corpo descomprimido maior que ``max_size``
+    """
+    try:
+        if encoding == "gzip":
+            data = zlib.decompressobj(31).decompress(body, max_size + 1)
+        else:
+            reader = zstandard.ZstdDecompressor().stream_reader(body)
+            with reader:
+                data = reader.read(max_size + 1)
+    except (zlib.error, zstandard.ZstdError) as e:
+        raise DecompressionError(str(e)) from e
+
+    if len(data) > max_size:
+        raise BodyTooLargeError(f"Corpo descomprimido maior que {max_size} bytes")
+    return data
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Codificação a usar na resposta (``None`` = sem compressão)."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.strip().lower()] = q
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Middleware de compressão de requests e responses (gzip/zstd)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        max_request_size: int = 10 * 1024 * 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        *,
+        streaming_paths: Collection[str] = (),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_request_size = max_request_size
+        self.streaming_paths = frozenset(streaming_paths)
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Descomprime o corpo da request e comprime o da resposta."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").lower()
+        if content_encoding != "identity":
+            result = await self._decompress_request(scope, receive, content_encoding)
+            if isinstance(result, JSONResponse):
+                await result(scope, receive, send)
+                return
+            scope, receive = result
+
+        encoding = choose_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, self._compressing_send(send, encoding))
+
+    async def _decompress_request(
+        self, scope: Scope, receive: Receive, encoding: str
+    ) -> tuple[Scope, Receive] | JSONResponse:
+        """Descomprime o corpo; retorna o novo scope/receive ou um erro."""
+        if encoding not in ENCODINGS:
+            return JSONResponse(
+                {"detail": f"Content-Encoding não suportado: {encoding}"},
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        decoded = self._decoding_receive(receive, _decoder(encoding), encoding)
+        scope = dict(scope)
+        headers = MutableHeaders(scope={"headers": list(scope["headers"])})
+        del headers["content-encoding"]
+
+        # Streaming: a aplicação consome os chunks descomprimidos à medida
+        # que chegam, com memória constante qualquer que seja o upload
+        if scope["path"] in self.streaming_paths:
+            del headers["content-length"]
+            scope["headers"] = headers.raw
+            return scope, decoded
+
+        too_large = JSONResponse(
+            {"detail": f"Corpo maior que {self.max_request_size} bytes"},
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        )
+        chunks: list[bytes] = []
+        received = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await decoded()
+                chunks.append(message.get("body", b""))
+                received += len(chunks[-1])
+                if received > self.max_request_size:
+                    return too_large
+                more_body = message.get("more_body", False)
+        except DecompressionError as e:
+            return JSONResponse(
+                {"detail": f"Corpo {encoding} inválido: {e}"},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        body = b"".join(chunks)
+        headers["content-length"] = str(len(body))
+        scope["headers"] = headers.raw
+
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return scope, replay
+
+    def _decoding_receive(
+        self, receive: Receive, decoder: _Decoder, encoding: str
+    ) -> Receive:
+        """
+        Envolve ``receive`` descomprimindo cada chunk do corpo.
+
+        Cada mensagem entrega um pedaço de tamanho limitado; o corpo
+        comprimido nunca é acumulado.
+
+        Raises:
+            DecompressionError: Corpo corrompido ou truncado
+        """
+        pieces: Iterator[bytes] = iter(())
+        body_done = False
+        finished = False
+
+        async def receive_decoded() -> Message:
+            nonlocal pieces, body_done, finished
+            while True:
+                try:
+                    piece = next(pieces, None)
+                    if piece is None and body_done and not finished:
+                        decoder.finish()
+                except DecompressionError:
+                    logger.warning("request_decompression_failed", encoding=encoding)
+                    # Falha reportada uma vez; depois, só as mensagens do
+                    # servidor, como a desconexão do cliente
+                    pieces, body_done, finished = iter(()), True, True
+                    raise
+
+                if piece is not None:
+                    return {"type": "http.request", "body": piece, "more_body": True}
+                if body_done:
+                    if finished:
+                        return await receive()
+                    finished = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                pieces = decoder.decompress(message.get("body", b""))
+                body_done = not message.get("more_body", False)
+
+        return receive_decoded
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        """Comprime um corpo completo."""
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _encoder(self, encoding: str) -> _Encoder:
+        """Compressor para a codificação escolhida."""
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        return _GzipEncoder(self.gzip_level)
+
+    def _compressing_send(self, send: Send, encoding: str) -> Send:
+        """Envolve ``send`` comprimindo o corpo quando vale a pena."""
+        start: Message | None = None
+        encoder: _Encoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "")
+                if "content-encoding" in headers or media_type.startswith(
+                    _SKIP_MEDIA_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Só decide ao ver o primeiro chunk do corpo
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                if not more_body:
+                    # Resposta completa: comprime de uma vez, com tamanho
+                    compressed = self._compress(encoding, body)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({**message, "body": compressed})
+                    return
+                encoder = self._encoder(encoding)
+                del headers["Content-Length"]
+                await send(start)
+
+            compressed = encoder.compress(body)
+            compressed += encoder.flush() if more_body else encoder.finish()
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+
+        return send_compressed
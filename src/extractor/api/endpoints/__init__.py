@@ -1,5 +1,5 @@
 """API endpoints."""
 
-from extractor.api.endpoints import extract, health, schemas
+from extractor.api.endpoints import cache, extract, health, schemas
 
-__all__ = ["extract", "health", "schemas"]
+__all__ = ["cache", "extract", "health", "schemas"]
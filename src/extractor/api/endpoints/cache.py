@@ -0,0 +1,194 @@
+"""Endpoints administrativos do cache."""
+
+import secrets
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+
+from extractor.api.negotiation import MsgpackRoute
+from extractor.config import Settings, get_settings
+from extractor.core.admission import AdmissionController
+from extractor.core.cache import CacheService
+from extractor.core.singleflight import SingleFlight
+from extractor.dependencies import (
+    get_admission_controller,
+    get_cache_service,
+    get_single_flight,
+)
+from extractor.schemas.requests import (
+    AdmissionStats,
+    BloomFilterStats,
+    CacheClearResponse,
+    CacheCounters,
+    CacheKeySample,
+    CacheLookupRequest,
+    CacheLookupResponse,
+    CacheStatsResponse,
+    ErrorResponse,
+    LLMCallStats,
+    SchemaCacheStats,
+)
+from extractor.utils.logging import get_logger
+
+router = APIRouter(prefix="/cache", tags=["cache"], route_class=MsgpackRoute)
+logger = get_logger(__name__)
+
+
+def require_admin_key(
+    settings: Annotated[Settings, Depends(get_settings)],
+    admin_key: Annotated[str | None, Header(alias="X-Admin-Key")] = None,
+) -> None:
+    """
+    Exige a chave administrativa (``ADMIN_API_KEY``).
+
+    Raises:
+        HTTPException: 403 se nenhuma chave estiver configurada, 401 se o
+            header faltar ou não conferir
+    """
+    if not settings.admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoint administrativo desativado (configure ADMIN_API_KEY)",
+        )
+    if admin_key is None or not secrets.compare_digest(
+        admin_key.encode(), settings.admin_api_key.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="X-Admin-Key ausente ou inválida",
+        )
+
+
+async def purge_cache(cache: CacheService, schema_name: str | None) -> None:
+    """Limpa o cache depois da resposta; o cliente cair não interrompe."""
+    try:
+        if schema_name is None:
+            deleted = await cache.clear_all()
+        else:
+            deleted = await cache.purge_schema(schema_name)
+    except Exception as e:
+        logger.error("cache_clear_failed", schema=schema_name, error=str(e))
+        return
+
+    logger.info("cache_clear_completed", schema=schema_name, count=deleted)
+
+
+@router.delete(
+    "",
+    response_model=CacheClearResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_key)],
+    responses={
+        401: {"model": ErrorResponse, "description": "X-Admin-Key inválida"},
+        403: {"model": ErrorResponse, "description": "ADMIN_API_KEY não configurada"},
+    },
+    summary="Limpa o cache de extração",
+    description="""
+    Remove entradas do cache usando SCAN + UNLINK em lotes, sem bloquear
+    o Redis. Informe `schema_name` para remover apenas um schema.
+
+    Exige o header `X-Admin-Key` com o valor de `ADMIN_API_KEY` (sem ela
+    configurada o endpoint fica desativado). A limpeza roda em background
+    depois da resposta 202; o resultado vai para o log
+    (`cache_clear_completed`).
+    """,
+)
+async def clear_cache(
+    background_tasks: BackgroundTasks,
+    cache: Annotated[CacheService, Depends(get_cache_service)],
+    schema_name: Annotated[
+        str | None,
+        Query(description="Remove apenas as entradas deste schema"),
+    ] = None,
+) -> CacheClearResponse:
+    """Agenda a limpeza do cache (total ou por schema)."""
+    background_tasks.add_task(purge_cache, cache, schema_name)
+    logger.info("cache_clear_requested", schema=schema_name)
+    return CacheClearResponse(schema_name=schema_name)
+
+
+@router.get(
+    "/stats",
+    response_model=CacheStatsResponse,
+    summary="Estatísticas do cache",
+    description="""
+    Contadores de hit/miss/set/erro por schema (locais a este worker) e
+    estimativas de quantidade de chaves, memória e distribuição de TTL
+    obtidas por amostragem (SCAN + MEMORY USAGE + TTL). Com o Bloom
+    filter ativo, inclui a taxa estimada de falso positivo e, nos
+    contadores, os lookups evitados (`bloom_skips`). Inclui também a
+    ocupação do controle de admissão e as extrações recusadas (fila
+    cheia) ou descartadas por deadline, além das chamadas ao LLM
+    compartilhadas e das canceladas (com o tempo de geração descartado).
+    """,
+)
+async def cache_stats(
+    cache: Annotated[CacheService, Depends(get_cache_service)],
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+    flights: Annotated[SingleFlight, Depends(get_single_flight)],
+    sample_size: Annotated[
+        int,
+        Query(ge=0, le=10000, description="Máximo de chaves amostradas"),
+    ] = 1000,
+) -> CacheStatsResponse:
+    """Retorna estatísticas do cache."""
+    counters = cache.counters()
+    sample = await cache.sample_keys(sample_size) if sample_size else None
+    sampled = sample["schemas"] if sample else {}
+
+    total: dict[str, int] = {}
+    for counts in counters.values():
+        for name, value in counts.items():
+            total[name] = total.get(name, 0) + value
+
+    schemas = {
+        name: SchemaCacheStats(
+            counters=CacheCounters(**counters.get(name, {})),
+            keys=CacheKeySample(**sampled[name]) if name in sampled else None,
+        )
+        for name in sorted(counters.keys() | sampled.keys())
+    }
+    bloom = cache.bloom_stats()
+
+    return CacheStatsResponse(
+        redis_connected=await cache.health_check(),
+        sample_exact=bool(sample and sample["exact"]),
+        total=CacheCounters(**total),
+        schemas=schemas,
+        bloom=BloomFilterStats(**bloom) if bloom else None,
+        admission=AdmissionStats.model_validate(admission.counters()),
+        llm_calls=LLMCallStats.model_validate(flights.counters()),
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=CacheLookupResponse,
+    summary="Verifica quais pares texto/schema estão em cache",
+    description="""
+    Recebe até 1000 pares `(text, schema_name)` e informa, por posição,
+    quais já estão em cache. Pipelines de ingestão podem enviar para
+    `/extract` apenas os misses.
+    """,
+)
+async def lookup_cache(
+    request: CacheLookupRequest,
+    cache: Annotated[CacheService, Depends(get_cache_service)],
+) -> CacheLookupResponse:
+    """Consulta vários pares no cache em uma única ida ao Redis."""
+    cached = await cache.exists_many(
+        [(item.text, item.schema_name) for item in request.items]
+    )
+    return CacheLookupResponse(
+        cached=cached,
+        hits=sum(cached),
+        total=len(cached),
+    )
@@ -1,29 +1,264 @@
 """Endpoint principal de extração."""
 
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.types import Receive
 
+from extractor.api.compression import DecompressionError
+from extractor.api.middleware import client_key
+from extractor.api.negotiation import MsgpackRoute
+from extractor.config import get_settings
+from extractor.core.admission import DeadlineExceededError, OverloadedError
+from extractor.core.bulk import RawLine, map_unordered, ndjson_lines
+from extractor.core.cost import estimate_tokens
 from extractor.core.extractor import ExtractionError, ExtractorService
+from extractor.core.idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyMismatchError,
+    StoredResponse,
+    fingerprint,
+)
 from extractor.dependencies import get_extractor
+from extractor.schemas.registry import schema_registry
 from extractor.schemas.requests import (
+    BulkExtractionError,
+    BulkExtractionItem,
     ErrorResponse,
     ExtractionRequest,
     ExtractionResponse,
 )
 from extractor.utils.logging import get_logger
 
-router = APIRouter(tags=["extraction"])
+router = APIRouter(tags=["extraction"], route_class=MsgpackRoute)
 logger = get_logger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+IdempotencyKey = Annotated[
+    str | None, Header(alias="Idempotency-Key", min_length=1, max_length=255)
+]
+
+
+def render_extraction(schema_name: str, data_json: str) -> bytes:
+    """
+    Monta o corpo de ``ExtractionResponse`` a partir do JSON dos dados.
+
+    O JSON dos dados (vindo do cache ou de ``model_dump_json``) é inserido
+    como está, sem desserializar nem revalidar.
+    """
+    return (
+        f'{{"success":true,"schema_name":{json.dumps(schema_name)},"data":{data_json}}}'
+    ).encode()
+
+
+class TokenBudget:
+    """
+    Orçamento de tokens do cliente para uma extração.
+
+    O custo estimado (texto mais a saída esperada do schema, ver
+    ``estimate_tokens``) só é debitado quando a extração chama o LLM
+    (``charge``); cache hits, falhas rápidas do cache negativo e recusas
+    da fila não consomem o orçamento. O custo é limitado ao orçamento
+    inteiro para que nenhuma extração válida fique impossível.
+    """
+
+    def __init__(self, http_request: Request, request: ExtractionRequest) -> None:
+        """Prepara o débito para o cliente da request (sem tocar no limitador)."""
+        self.limiter = getattr(http_request.app.state, "token_limiter", None)
+        self.request = request
+        settings = get_settings()
+        self.client = client_key(
+            http_request.scope,
+            settings.rate_limit_key,
+            frozenset(settings.rate_limit_api_keys),
+        )
+        # Custo debitado e saldo depois do débito (0 enquanto não houve)
+        self.cost = 0
+        self._remaining = 0
+
+    async def charge(self) -> None:
+        """
+        Debita o custo estimado antes da chamada ao LLM.
+
+        Raises:
+            HTTPException: 429 com ``Retry-After`` se o orçamento acabou
+        """
+        if self.limiter is None:
+            return
+
+        schema = (
+            schema_registry.get(self.request.schema_name)
+            if schema_registry.has(self.request.schema_name)
+            else None
+        )
+        cost = min(
+            estimate_tokens(self.request.text, schema, self.request.system_prompt),
+            self.limiter.limit,
+        )
+        decision = await self.limiter.check(self.client, cost)
+        if not decision.allowed:
+            logger.warning("token_budget_exceeded", client=self.client, cost=cost)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Token budget exceeded. Try again later.",
+                headers={
+                    **self._headers(decision.limit, decision.remaining, cost),
+                    "Retry-After": str(decision.retry_after_seconds),
+                },
+            )
+        self.cost = cost
+        self._remaining = decision.remaining
+
+    async def headers(self) -> dict[str, str]:
+        """Headers ``X-TokenBudget-*`` com o custo debitado e o saldo."""
+        if self.limiter is None:
+            return {}
+        if not self.cost:
+            # Sem chamada ao LLM: só consulta o saldo
+            decision = await self.limiter.check(self.client, 0)
+            return self._headers(decision.limit, decision.remaining, 0)
+        return self._headers(self.limiter.limit, self._remaining, self.cost)
+
+    @staticmethod
+    def _headers(limit: int, remaining: int, cost: int) -> dict[str, str]:
+        return {
+            "X-TokenBudget-Limit": str(limit),
+            "X-TokenBudget-Remaining": str(remaining),
+            "X-TokenBudget-Cost": str(cost),
+        }
+
+
+def idempotency_scope(http_request: Request, key: str) -> str:
+    """
+    Escopo da Idempotency-Key: a credencial do cliente, quando houver.
+
+    Sem credencial a chave é global, para que reentregas vindas de outro
+    host (outro IP) ainda sejam reconhecidas.
+    """
+    client = client_key(http_request.scope, "api_key")
+    return f"{client}:{key}" if client.startswith("key:") else key
+
+
+async def idempotent(
+    http_request: Request,
+    key: str,
+    request: ExtractionRequest,
+    produce: Callable[[], Awaitable[StoredResponse]],
+    deadline: float | None = None,
+) -> tuple[StoredResponse, bool]:
+    """
+    Executa ``produce`` uma vez por Idempotency-Key.
+
+    Repetições recebem a resposta gravada (ou esperam a original), sem
+    debitar o orçamento de tokens nem chamar o LLM de novo.
+
+    Returns:
+        Resposta e se ela é uma repetição da gravada
+
+    Raises:
+        IdempotencyMismatchError: Chave usada antes com outro corpo
+        IdempotencyInProgressError: Original ainda em andamento
+    """
+    store = getattr(http_request.app.state, "idempotency", None)
+    if store is None:
+        return await produce(), False
+
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    async with store.claim(
+        idempotency_scope(http_request, key),
+        fingerprint(request.model_dump_json()),
+        timeout,
+    ) as claim:
+        if claim.replay is not None:
+            return claim.replay, True
+        response = await produce()
+        await store.save(claim, response)
+        return response, False
+
+
+async def idempotent_response(
+    http_request: Request,
+    key: str,
+    request: ExtractionRequest,
+    respond: Callable[[], Awaitable[Response]],
+    deadline: float | None = None,
+) -> Response:
+    """
+    ``idempotent`` para um endpoint: erros HTTP também são gravados.
+
+    Repetições levam o header ``Idempotent-Replayed: true``.
+
+    Raises:
+        HTTPException: 422 se a chave foi usada com outro corpo, 409 se a
+            original não terminou a tempo
+    """
+
+    async def produce() -> StoredResponse:
+        try:
+            response = await respond()
+        except HTTPException as e:
+            return StoredResponse(
+                status=e.status_code,
+                body=json.dumps({"detail": e.detail}).encode(),
+                headers={**(e.headers or {}), "content-type": "application/json"},
+            )
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        }
+        return StoredResponse(response.status_code, bytes(response.body), headers)
+
+    try:
+        stored, replayed = await idempotent(
+            http_request, key, request, produce, deadline
+        )
+    except IdempotencyMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+        ) from e
+    except IdempotencyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        ) from e
+
+    headers = {**stored.headers, "Idempotent-Replayed": "true"} if replayed else None
+    return Response(
+        content=stored.body,
+        status_code=stored.status,
+        headers=headers or stored.headers,
+    )
+
 
 @router.post(
     "/extract",
     response_model=ExtractionResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Schema não encontrado"},
+        409: {"model": ErrorResponse, "description": "Idempotency-Key em andamento"},
         422: {"model": ErrorResponse, "description": "Validação falhou"},
+        429: {"model": ErrorResponse, "description": "Orçamento de tokens esgotado"},
         500: {"model": ErrorResponse, "description": "Erro de extração"},
+        503: {"model": ErrorResponse, "description": "Fila de extração cheia"},
+        504: {"model": ErrorResponse, "description": "Deadline não cumprido"},
     },
     summary="Extrai dados estruturados de texto",
     description="""
@@ -31,26 +266,187 @@ logger = get_logger(__name__)
 
     O sistema usa LLMs (Ollama local ou APIs cloud) com validação Pydantic
     para garantir outputs tipados. Retry automático em caso de falha.
+
+    Cada extração que chama o LLM consome do orçamento de tokens do cliente
+    o custo estimado (tamanho do texto + saída do schema); cache hits não
+    consomem. Os headers `X-TokenBudget-*` mostram o custo e o saldo.
+
+    Com a fila de chamadas ao LLM cheia a resposta é 503 imediato, com
+    `Retry-After`. O header opcional `X-Request-Timeout` (segundos) define
+    quanto o cliente está disposto a esperar: a request responde 504 quando
+    ele vence, e a extração é descartada antes da chamada ao LLM se a espera
+    na fila mais a latência média não couberem nele.
+
+    Com o header `Idempotency-Key`, repetições da mesma request (retries,
+    reentregas de filas) recebem a resposta gravada, com
+    `Idempotent-Replayed: true`, ou esperam a original terminar, mesmo com
+    `use_cache=false`. Reusar a chave com outro corpo responde 422.
     """,
 )
 async def extract_data(
+    http_request: Request,
     request: ExtractionRequest,
     extractor: Annotated[ExtractorService, Depends(get_extractor)],
-) -> ExtractionResponse:
+    request_timeout: Annotated[
+        float | None, Header(alias="X-Request-Timeout", gt=0)
+    ] = None,
+    idempotency_key: IdempotencyKey = None,
+) -> Response:
     """Extrai dados estruturados do texto."""
+    deadline = None if request_timeout is None else time.monotonic() + request_timeout
+
+    async def respond() -> Response:
+        budget = TokenBudget(http_request, request)
+        data_json = await run_extraction(extractor, request, deadline, budget.charge)
+        return Response(
+            content=render_extraction(request.schema_name, data_json),
+            media_type="application/json",
+            headers=await budget.headers(),
+        )
+
+    if idempotency_key is None:
+        return await respond()
+    return await idempotent_response(
+        http_request, idempotency_key, request, respond, deadline
+    )
+
+
+@router.post(
+    "/extract/ndjson",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {NDJSON_MEDIA_TYPE: {}},
+            "description": "Uma linha de resultado por documento",
+        }
+    },
+    summary="Extrai dados de um lote NDJSON em streaming",
+    description="""
+    Recebe um corpo NDJSON (`application/x-ndjson`), uma linha por
+    documento: `{"id": ..., "text": ..., "schema_name": ...}` e os demais
+    campos de `/extract`.
+
+    As linhas são lidas à medida que chegam e processadas com concorrência
+    limitada (`BULK_CONCURRENCY`); os resultados voltam em NDJSON na ordem
+    em que terminam, marcados com o `id`. Linhas com erro geram uma linha
+    `{"success": false, "id", "line", "status", "error", "detail"}` sem
+    interromper o lote. Cada documento que chama o LLM consome o orçamento
+    de tokens.
+
+    Com `Idempotency-Key`, cada documento é idempotente pela chave mais o
+    seu `id`: reenviar o lote devolve os resultados já gravados e só
+    extrai os documentos que faltaram.
+    """,
+)
+async def extract_ndjson(
+    http_request: Request,
+    extractor: Annotated[ExtractorService, Depends(get_extractor)],
+    idempotency_key: IdempotencyKey = None,
+) -> StreamingResponse:
+    """Extrai dados de cada linha do corpo NDJSON."""
+    settings = get_settings()
+    body_read = asyncio.Event()
+    body_error: DecompressionError | None = None
+    last_line = 0
+
+    async def body() -> AsyncIterator[bytes]:
+        nonlocal body_error
+        try:
+            async for chunk in http_request.stream():
+                yield chunk
+        except DecompressionError as e:
+            # Corpo comprimido corrompido no meio do lote: as linhas já lidas
+            # seguem, e o resto vira uma linha de erro no final
+            logger.warning("bulk_body_decompression_failed", error=str(e))
+            body_error = e
+        finally:
+            body_read.set()
+
+    async def process(raw: RawLine) -> bytes:
+        nonlocal last_line
+        last_line = max(last_line, raw.number)
+        return await _process_line(http_request, extractor, raw, idempotency_key)
+
+    async def results() -> AsyncIterator[bytes]:
+        lines = ndjson_lines(body(), settings.bulk_max_line_bytes)
+        async for line in map_unordered(lines, process, settings.bulk_concurrency):
+            yield line
+        if body_error is not None:
+            yield _error_line(
+                RawLine(last_line + 1, b""),
+                status.HTTP_400_BAD_REQUEST,
+                f"Corpo comprimido inválido: {body_error}",
+            )
+
+    return _DuplexStreamingResponse(
+        results(), body_read=body_read, media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que responde enquanto o corpo da request é lido.
+
+    O ``StreamingResponse`` padrão escuta ``receive`` em paralelo para
+    detectar a desconexão do cliente e descartaria os chunks do corpo;
+    aqui a escuta só começa depois que o corpo foi lido até o fim.
+    """
+
+    def __init__(
+        self,
+        content: AsyncIterator[bytes],
+        body_read: asyncio.Event,
+        media_type: str,
+    ) -> None:
+        super().__init__(content, media_type=media_type)
+        self._body_read = body_read
+
+    async def listen_for_disconnect(self, receive: Receive) -> None:
+        """Espera o fim do corpo antes de escutar a desconexão."""
+        await self._body_read.wait()
+        await super().listen_for_disconnect(receive)
+
+
+async def run_extraction(
+    extractor: ExtractorService,
+    request: ExtractionRequest,
+    deadline: float | None = None,
+    before_llm_call: Callable[[], Awaitable[None]] | None = None,
+) -> str:
+    """
+    Executa a extração e retorna o JSON dos dados.
+
+    ``before_llm_call`` (débito do orçamento de tokens) só roda se a
+    extração chamar o LLM.
+
+    Raises:
+        HTTPException: 400 para schema desconhecido, 500 para erro de
+            extração, 503 com a fila cheia e 504 se o deadline estourar
+    """
     try:
-        result = await extractor.extract(
+        return await extractor.extract_json(
             text=request.text,
             schema_name=request.schema_name,
             system_prompt=request.system_prompt,
             use_cache=request.use_cache,
-        )
-        return ExtractionResponse(
-            success=True,
-            schema_name=request.schema_name,
-            data=result,
+            use_negative_cache=request.use_negative_cache,
+            deadline=deadline,
+            before_llm_call=before_llm_call,
         )
 
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        ) from e
+
+    except DeadlineExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e),
+        ) from e
+
     except KeyError as e:
         logger.warning("schema_not_found", schema=request.schema_name)
         raise HTTPException(
@@ -64,3 +460,86 @@ async def extract_data(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro na extração: {e}",
         ) from e
+
+
+def _error_line(
+    raw: RawLine, status_code: int, detail: str, item_id: str | int | None = None
+) -> bytes:
+    """Linha NDJSON de erro para um documento do lote."""
+    error = BulkExtractionError(
+        id=item_id,
+        line=raw.number,
+        status=status_code,
+        error=HTTPStatus(status_code).phrase,
+        detail=detail,
+    )
+    return error.model_dump_json().encode() + b"\n"
+
+
+async def _process_line(
+    http_request: Request,
+    extractor: ExtractorService,
+    raw: RawLine,
+    idempotency_key: str | None = None,
+) -> bytes:
+    """Valida, cobra e extrai uma linha do lote; erros viram linhas de erro."""
+    if raw.too_long:
+        return _error_line(
+            raw,
+            status.HTTP_413_CONTENT_TOO_LARGE,
+            f"Linha maior que {get_settings().bulk_max_line_bytes} bytes",
+        )
+
+    try:
+        item = BulkExtractionItem.model_validate_json(raw.data)
+    except ValidationError as e:
+        detail = "; ".join(
+            f"{'.'.join(map(str, err['loc'])) or 'linha'}: {err['msg']}"
+            for err in e.errors(include_url=False)
+        )
+        return _error_line(raw, status.HTTP_422_UNPROCESSABLE_CONTENT, detail)
+
+    async def produce() -> StoredResponse:
+        try:
+            budget = TokenBudget(http_request, item)
+            data_json = await run_extraction(extractor, item, None, budget.charge)
+        except HTTPException as e:
+            line = _error_line(raw, e.status_code, str(e.detail), item.id)
+            return StoredResponse(e.status_code, line)
+
+        return StoredResponse(
+            status.HTTP_200_OK,
+            b'{"id":'
+            + json.dumps(item.id).encode()
+            + b","
+            + render_extraction(item.schema_name, data_json)[1:]
+            + b"\n",
+        )
+
+    try:
+        if idempotency_key is None:
+            stored = await produce()
+        else:
+            stored, _ = await idempotent(
+                http_request, f"{idempotency_key}:{json.dumps(item.id)}", item, produce
+            )
+    except IdempotencyMismatchError as e:
+        return _error_line(raw, status.HTTP_422_UNPROCESSABLE_CONTENT, str(e), item.id)
+    except IdempotencyInProgressError as e:
+        return _error_line(raw, status.HTTP_409_CONFLICT, str(e), item.id)
+    except Exception as e:
+        # Falha inesperada (Redis da idempotência, erro não mapeado): vira
+        # linha de erro sem ser gravada, e o lote segue com os demais
+        logger.error(
+            "bulk_line_failed",
+            line=raw.number,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return _error_line(
+            raw,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            f"Erro ao processar o documento: {e}",
+            item.id,
+        )
+    return stored.body
@@ -1,13 +1,24 @@
-"""Endpoint de health check."""
+"""
+Endpoints de health check.
+
+``/livez`` só indica que o processo responde; ``/readyz`` e ``/health``
+leem o último resultado dos probes em background (``HealthMonitor``), sem
+tocar no Redis nem no provider LLM a cada chamada.
+"""
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 
 from extractor.config import Settings, get_settings
-from extractor.core.cache import CacheService
-from extractor.dependencies import get_cache_service
-from extractor.schemas.requests import HealthResponse
+from extractor.core.health import HealthMonitor
+from extractor.dependencies import get_health_monitor
+from extractor.schemas.requests import (
+    HealthResponse,
+    LivenessResponse,
+    ProbeStatus,
+    ReadinessResponse,
+)
 
 router = APIRouter(tags=["health"])
 
@@ -20,15 +31,73 @@ router = APIRouter(tags=["health"])
 )
 async def health_check(
     settings: Annotated[Settings, Depends(get_settings)],
-    cache: Annotated[CacheService, Depends(get_cache_service)],
+    monitor: Annotated[HealthMonitor, Depends(get_health_monitor)],
 ) -> HealthResponse:
     """Retorna status do serviço."""
-    redis_connected = await cache.health_check()
+    redis = monitor.results.get("redis")
 
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        redis_connected=redis_connected,
+        redis_connected=redis is not None and redis.ok,
         llm_provider=settings.llm_provider,
         llm_model=settings.active_model,
     )
+
+
+@router.get(
+    "/livez",
+    response_model=LivenessResponse,
+    summary="Liveness probe",
+    description="""
+    Indica apenas que o processo está vivo e o event loop responde.
+
+    Não verifica dependências: Redis ou LLM fora não devem reiniciar o
+    container. Use `/readyz` para decidir se a instância recebe tráfego.
+    """,
+)
+async def liveness() -> LivenessResponse:
+    """Retorna sempre 200 enquanto o processo responde."""
+    return LivenessResponse()
+
+
+@router.get(
+    "/readyz",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse, "description": "Não pronta"}},
+    summary="Readiness probe",
+    description="""
+    Indica se a instância pode receber tráfego.
+
+    Reporta o último resultado dos probes de Redis, provider LLM (modelo
+    disponível) e warmup, atualizados em background. Responde 503 até o
+    primeiro warmup completo (modelo e Bloom filter carregados). Depois
+    disso falhas marcam `degraded` com 200: o provider LLM é comum a todas
+    as réplicas, e uma queda dele não deve tirar de rotação a frota
+    inteira, que ainda atende cache hits.
+    """,
+)
+async def readiness(
+    response: Response,
+    monitor: Annotated[HealthMonitor, Depends(get_health_monitor)],
+) -> ReadinessResponse:
+    """Retorna o estado cacheado das dependências."""
+    ready = monitor.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(
+        status=monitor.status,
+        ready=ready,
+        probes={
+            name: ProbeStatus(
+                ok=result.ok,
+                critical=name in monitor.critical,
+                checked_at=result.checked_at,
+                latency_ms=result.latency_ms,
+                details=result.details,
+                error=result.error,
+            )
+            for name, result in monitor.results.items()
+        },
+    )
@@ -1,28 +1,82 @@
-"""Endpoint para listar schemas disponíveis."""
+"""Endpoints do catálogo de schemas."""
 
-from typing import Annotated
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
-from fastapi import APIRouter, Depends
+from extractor.api.negotiation import MsgpackRoute
+from extractor.config import get_settings
+from extractor.schemas.registry import CachedDocument, schema_registry
+from extractor.schemas.requests import ErrorResponse, SchemaListResponse
 
-from extractor.core.extractor import ExtractorService
-from extractor.dependencies import get_extractor
-from extractor.schemas.requests import SchemaListResponse
+router = APIRouter(tags=["schemas"], route_class=MsgpackRoute)
 
-router = APIRouter(tags=["schemas"])
+
+def _weak(etag: str) -> str:
+    """ETag sem o prefixo ``W/`` (comparação fraca)."""
+    return etag.strip().removeprefix("W/")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Indica se o ``If-None-Match`` da request casa com o ETag atual."""
+    if not if_none_match:
+        return False
+    candidates = [_weak(tag) for tag in if_none_match.split(",")]
+    return "*" in candidates or _weak(etag) in candidates
+
+
+def cached_response(request: Request, document: CachedDocument) -> Response:
+    """
+    Serve um documento pré-serializado com ``ETag`` e ``Cache-Control``.
+
+    Se o cliente já tem a versão atual (``If-None-Match``), responde 304
+    sem corpo.
+    """
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": f"public, max-age={get_settings().schemas_cache_max_age}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), document.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(document.body, media_type="application/json", headers=headers)
 
 
 @router.get(
     "/schemas",
     response_model=SchemaListResponse,
+    responses={304: {"description": "Catálogo não mudou (If-None-Match)"}},
     summary="Lista schemas disponíveis",
-    description="Retorna todos os schemas de extração registrados com seus metadados.",
+    description="""
+    Retorna todos os schemas de extração registrados com seus metadados.
+
+    O catálogo é serializado uma vez e servido com `ETag` e
+    `Cache-Control`; envie `If-None-Match` para receber 304 enquanto ele
+    não mudar.
+    """,
 )
-async def list_schemas(
-    extractor: Annotated[ExtractorService, Depends(get_extractor)],
-) -> SchemaListResponse:
+async def list_schemas(request: Request) -> Response:
     """Lista todos os schemas disponíveis."""
-    schemas = extractor.list_schemas()
-    return SchemaListResponse(
-        schemas=schemas,
-        total=len(schemas),
-    )
+    return cached_response(request, schema_registry.catalog())
+
+
+@router.get(
+    "/schemas/{schema_name}",
+    responses={
+        200: {
+            "content": {"application/json": {}},
+            "description": "JSON Schema do schema",
+        },
+        304: {"description": "Schema não mudou (If-None-Match)"},
+        404: {"model": ErrorResponse, "description": "Schema não encontrado"},
+    },
+    summary="JSON Schema de um schema",
+    description="Retorna o JSON Schema de um schema registrado, com `ETag`.",
+)
+async def get_json_schema(request: Request, schema_name: str) -> Response:
+    """Retorna o JSON Schema de um schema registrado."""
+    try:
+        document = schema_registry.json_schema(schema_name)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    return cached_response(request, document)
@@ -1,90 +1,240 @@
-"""Middlewares da API."""
+"""
+Middlewares da API.
 
+Implementados como ASGI puro (sem ``BaseHTTPMiddleware``): não criam memory
+streams por request e não interferem em respostas em streaming nem no
+cancelamento quando o cliente desconecta. Só o ``DisconnectMiddleware`` cria
+tasks, e apenas nos caminhos configurados (rotas de extração).
+"""
+
+import asyncio
+import hashlib
 import time
-from collections import defaultdict
-from collections.abc import Awaitable, Callable
+from collections.abc import Collection
+from typing import Literal
 
-from fastapi import HTTPException, Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from extractor.core.rate_limit import RateLimiter, TokenBucketLimiter
 from extractor.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware de rate limiting simples em memória."""
+def client_key(
+    scope: Scope,
+    key_by: Literal["ip", "api_key"] = "ip",
+    api_keys: Collection[str] | None = None,
+) -> str:
+    """
+    Identifica o cliente para o rate limiting.
+
+    Com ``key_by="api_key"`` usa ``X-API-Key`` ou ``Authorization: Bearer``
+    (só o hash entra na chave); sem credencial, cai para o IP. Com
+    ``api_keys`` só as chaves da lista valem e qualquer outra cai para o
+    IP: trocar a credencial a cada request não gera um bucket novo.
+    """
+    if key_by == "api_key":
+        headers = dict(scope["headers"])
+        api_key = headers.get(b"x-api-key")
+        if api_key is None:
+            scheme, _, token = headers.get(b"authorization", b"").partition(b" ")
+            api_key = token if scheme.lower() == b"bearer" and token else None
+        if api_key and (api_keys is None or api_key.decode("latin-1") in api_keys):
+            return f"key:{hashlib.sha256(api_key).hexdigest()[:16]}"
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """
+    Middleware de rate limiting (token bucket / GCRA por cliente).
+
+    Permite rajadas de até ``requests`` e repõe a cota continuamente ao
+    longo de ``window`` segundos. Excedido o limite, responde 429 com
+    ``Retry-After``. Por padrão o estado fica na memória do processo;
+    passe um ``RedisRateLimiter`` para compartilhá-lo entre processos.
+
+    Caminhos em ``exempt_paths`` (probes de liveness/readiness) não passam
+    pelo limitador: não custam uma ida ao Redis e não recebem 429 quando
+    vários pods compartilham o IP do kubelet.
+    """
 
     def __init__(
         self,
         app: ASGIApp,
         requests: int = 100,
         window: int = 60,
+        limiter: RateLimiter | None = None,
+        key_by: Literal["ip", "api_key"] = "ip",
+        *,
+        api_keys: Collection[str] | None = None,
+        exempt_paths: Collection[str] = (),
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.requests = requests
         self.window = window
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self.limiter = limiter or TokenBucketLimiter(requests, window)
+        self.key_by = key_by
+        self.api_keys = api_keys
+        self.exempt_paths = frozenset(exempt_paths)
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Processa request com rate limiting."""
-        client_ip = request.client.host if request.client else "unknown"
-
-        now = time.time()
-        self._requests[client_ip] = [
-            ts for ts in self._requests[client_ip] if now - ts < self.window
-        ]
-
-        if len(self._requests[client_ip]) >= self.requests:
-            logger.warning("rate_limit_exceeded", client_ip=client_ip)
-            raise HTTPException(
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope, self.key_by, self.api_keys)
+        decision = await self.limiter.check(client)
+        rate_headers = {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+        }
+
+        if not decision.allowed:
+            logger.warning("rate_limit_exceeded", client=client)
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded. Try again later."},
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Try again later.",
+                headers={
+                    **rate_headers,
+                    "Retry-After": str(decision.retry_after_seconds),
+                },
             )
+            await response(scope, receive, send)
+            return
 
-        self._requests[client_ip].append(now)
-        response = await call_next(request)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.update(rate_headers)
+            await send(message)
 
-        response.headers["X-RateLimit-Limit"] = str(self.requests)
-        response.headers["X-RateLimit-Remaining"] = str(
-            self.requests - len(self._requests[client_ip])
-        )
-
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware para logging de requests."""
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Loga request e response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.perf_counter()
+        method, path = scope["method"], scope["path"]
+        status_code = 500
 
-        logger.info(
-            "request_started",
-            method=request.method,
-            path=request.url.path,
-        )
+        logger.info("request_started", method=method, path=path)
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Tempo até o início da resposta (o corpo pode ser streaming)
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+            await send(message)
 
-        response = await call_next(request)
-        process_time = time.perf_counter() - start_time
+        await self.app(scope, receive, send_with_timing)
 
         logger.info(
             "request_completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            duration_ms=round(process_time * 1000, 2),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
         )
 
-        response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
-        return response
+
+class DisconnectMiddleware:
+    """
+    Cancela o processamento da request quando o cliente desconecta.
+
+    Depois que a aplicação leu o corpo inteiro, o middleware passa a escutar
+    ``receive`` por conta própria. Um ``http.disconnect`` antes do fim da
+    resposta cancela a aplicação, e o cancelamento chega à chamada ao LLM
+    em andamento. Chamadas posteriores da aplicação a ``receive`` esperam
+    o mesmo ``http.disconnect``, sem disputar as mensagens com o middleware.
+
+    A escuta custa duas tasks por request, então fica restrita aos caminhos
+    que começam com ``path_prefixes`` (vazio: todos), onde há chamada ao LLM
+    para cancelar.
+    """
+
+    def __init__(self, app: ASGIApp, *, path_prefixes: Collection[str] = ()) -> None:
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Executa a aplicação, cancelando-a se o cliente desconectar."""
+        if scope["type"] != "http" or (
+            self.path_prefixes and not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body_read = asyncio.Event()
+        disconnected = asyncio.Event()
+        response_sent = False
+
+        async def receive_body() -> Message:
+            if body_read.is_set():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+                body_read.set()
+            elif not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_sent
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_sent = True
+            await send(message)
+
+        async def run_app() -> None:
+            await self.app(scope, receive_body, send_tracking)
+
+        app_task = asyncio.create_task(run_app())
+
+        async def listen_for_disconnect() -> None:
+            await body_read.wait()
+            while not disconnected.is_set():
+                if (await receive())["type"] == "http.disconnect":
+                    disconnected.set()
+            if not response_sent:
+                app_task.cancel()
+
+        listener = asyncio.create_task(listen_for_disconnect())
+        start_time = time.perf_counter()
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            # Cancelada pelo listener: não há a quem responder
+            logger.info(
+                "request_cancelled",
+                method=scope["method"],
+                path=scope["path"],
+                elapsed_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+        finally:
+            listener.cancel()
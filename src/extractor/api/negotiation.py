@@ -0,0 +1,123 @@
+"""
+Negociação de conteúdo JSON/msgpack.
+
+Rotas criadas com ``MsgpackRoute`` aceitam corpo ``application/msgpack``
+e respondem em msgpack quando o ``Accept`` o prefere. Os endpoints não
+mudam: o corpo msgpack é entregue ao FastAPI como se fosse o JSON já
+decodificado, e a resposta JSON (serializada pelo Pydantic) é convertida
+no fim, sem passar por ``jsonable_encoder``.
+"""
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import msgpack
+import orjson
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+MSGPACK_MEDIA_TYPES = frozenset({"application/msgpack", "application/x-msgpack"})
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def _media_type(content_type: str | None) -> str:
+    """Media type sem parâmetros, em minúsculas."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    """
+    Indica se o header ``Accept`` prefere msgpack a JSON.
+
+    Compara os pesos ``q`` explícitos; wildcards (``*/*``) não contam a
+    favor de nenhum dos dois, e em empate vale msgpack.
+    """
+    msgpack_q = json_q = 0.0
+    for media_range in (accept or "").split(","):
+        media_type, *params = media_range.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type == "application/json":
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+class _MsgpackRequest(Request):
+    """Request cujo corpo msgpack é lido pelo FastAPI como JSON."""
+
+    async def json(self) -> Any:
+        """Decodifica o corpo msgpack (uma vez)."""
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body())
+            except (ValueError, msgpack.UnpackException) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Corpo msgpack inválido",
+                ) from e
+        return self._json
+
+
+def _as_json_request(request: Request) -> Request:
+    """Reapresenta uma request msgpack como JSON para o FastAPI."""
+    scope = dict(request.scope)
+    headers = MutableHeaders(scope={"headers": list(scope["headers"])})
+    headers["content-type"] = "application/json"
+    scope["headers"] = headers.raw
+    return _MsgpackRequest(scope, request.receive)
+
+
+def to_msgpack(response: Response) -> Response:
+    """
+    Converte uma resposta JSON já renderizada em msgpack.
+
+    Respostas que não são JSON (ou em streaming) voltam inalteradas.
+    """
+    if _media_type(response.headers.get("content-type")) != "application/json":
+        return response
+    body = getattr(response, "body", None)
+    if body is None:
+        return response
+
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key not in {"content-length", "content-type"}
+    }
+    return Response(
+        content=msgpack.packb(orjson.loads(body)),
+        status_code=response.status_code,
+        headers=headers,
+        media_type=MSGPACK_MEDIA_TYPE,
+        background=response.background,
+    )
+
+
+class MsgpackRoute(APIRoute):
+    """Rota com negociação JSON/msgpack na entrada e na saída."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Envolve o handler do FastAPI com a conversão de formatos."""
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if _media_type(request.headers.get("content-type")) in MSGPACK_MEDIA_TYPES:
+                request = _as_json_request(request)
+
+            response = await handler(request)
+            if prefers_msgpack(request.headers.get("accept")):
+                response = to_msgpack(response)
+            response.headers["Vary"] = "Accept"
+            return response
+
+        return negotiated_handler
@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter
 
-from extractor.api.endpoints import extract, health, schemas
+from extractor.api.endpoints import cache, extract, health, schemas
 
 api_router = APIRouter()
 
 api_router.include_router(extract.router)
 api_router.include_router(schemas.router)
+api_router.include_router(cache.router)
 api_router.include_router(health.router)
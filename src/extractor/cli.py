@@ -0,0 +1,169 @@
+"""CLI administrativa do serviço."""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Callable, Coroutine, Sequence
+from pathlib import Path
+from typing import Any
+
+import redis.asyncio as redis
+
+from extractor.config import get_settings
+from extractor.core.cache import CacheService
+from extractor.core.snapshot import SnapshotReader, write_snapshot
+from extractor.utils.logging import setup_logging
+
+Handler = Callable[[argparse.Namespace], Coroutine[Any, Any, int]]
+
+
+def _progress(label: str) -> Callable[[int], None]:
+    """Cria callback que mostra o progresso no stderr."""
+
+    def report(count: int) -> None:
+        print(f"\r{count} chaves {label}...", end="", file=sys.stderr, flush=True)
+
+    return report
+
+
+async def _cache_clear(args: argparse.Namespace) -> int:
+    """Executa `extractor cache clear`."""
+    cache = CacheService(get_settings())
+    await cache.connect()
+
+    try:
+        if args.schema:
+            deleted = await cache.purge_schema(
+                args.schema, args.batch_size, _progress("removidas")
+            )
+        else:
+            deleted = await cache.clear_all(args.batch_size, _progress("removidas"))
+    finally:
+        await cache.disconnect()
+
+    print(file=sys.stderr)
+    print(f"{deleted} chaves removidas")
+    return 0
+
+
+async def _cache_export(args: argparse.Namespace) -> int:
+    """Executa `extractor cache export`."""
+    cache = CacheService(get_settings())
+    await cache.connect()
+
+    try:
+        exported = await write_snapshot(
+            args.path,
+            cache.export_entries(args.batch_size),
+            _progress("exportadas"),
+        )
+    except redis.RedisError as e:
+        # Não deixa um snapshot parcial para trás
+        args.path.unlink(missing_ok=True)
+        print(f"\nErro ao ler o Redis: {e}", file=sys.stderr)
+        return 1
+    finally:
+        await cache.disconnect()
+
+    print(file=sys.stderr)
+    print(f"{exported} chaves exportadas para {args.path}")
+    return 0
+
+
+async def _cache_import(args: argparse.Namespace) -> int:
+    """Executa `extractor cache import`."""
+    try:
+        snapshot = SnapshotReader(args.path)
+    except (OSError, ValueError) as e:
+        print(f"Snapshot inválido: {e}", file=sys.stderr)
+        return 1
+
+    cache = CacheService(get_settings())
+    await cache.connect()
+
+    try:
+        imported = await cache.import_entries(
+            snapshot,
+            batch_size=args.batch_size,
+            replace=args.replace,
+            on_progress=_progress("importadas"),
+        )
+    except redis.RedisError as e:
+        print(f"\nErro ao gravar no Redis: {e}", file=sys.stderr)
+        return 1
+    finally:
+        await cache.disconnect()
+
+    print(file=sys.stderr)
+    print(f"{imported} chaves importadas ({snapshot.expired} já vencidas ignoradas)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o parser de argumentos."""
+    parser = argparse.ArgumentParser(
+        prog="extractor",
+        description="Ferramentas administrativas do Data Validator & Extractor.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cache_parser = commands.add_parser("cache", help="Operações sobre o cache")
+    cache_commands = cache_parser.add_subparsers(dest="cache_command", required=True)
+
+    clear = cache_commands.add_parser(
+        "clear",
+        help="Remove entradas do cache (SCAN + UNLINK em lotes)",
+    )
+    clear.add_argument("--schema", help="Remove apenas as entradas deste schema")
+    clear.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Chaves por lote (padrão: CACHE_CLEAR_BATCH_SIZE)",
+    )
+    clear.set_defaults(handler=_cache_clear)
+
+    export = cache_commands.add_parser(
+        "export",
+        help="Exporta as entradas e seus TTLs para um arquivo gzip",
+    )
+    export.add_argument("path", type=Path, help="Arquivo de destino (.jsonl.gz)")
+    export.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Chaves por lote (padrão: CACHE_CLEAR_BATCH_SIZE)",
+    )
+    export.set_defaults(handler=_cache_export)
+
+    load = cache_commands.add_parser(
+        "import",
+        help="Carrega um arquivo gerado por `cache export`",
+    )
+    load.add_argument("path", type=Path, help="Snapshot (.jsonl.gz)")
+    load.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Chaves por pipeline (padrão: CACHE_CLEAR_BATCH_SIZE)",
+    )
+    load.add_argument(
+        "--replace",
+        action="store_true",
+        help="Sobrescreve chaves existentes (padrão: só grava as ausentes)",
+    )
+    load.set_defaults(handler=_cache_import)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point da CLI."""
+    args = build_parser().parse_args(argv)
+    setup_logging(debug=get_settings().debug)
+    handler: Handler = args.handler
+    return asyncio.run(handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,17 @@
 from functools import lru_cache
 from typing import Literal
 
-from pydantic import Field, RedisDsn
+from pydantic import BaseModel, Field, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RedisShard(BaseModel):
+    """Primário de um shard do cache e suas réplicas de leitura."""
+
+    url: RedisDsn
+    replicas: list[RedisDsn] = Field(default_factory=list)
+
+
 class Settings(BaseSettings):
     """Configurações da aplicação."""
 
@@ -31,15 +38,83 @@ class Settings(BaseSettings):
     llm_model: str = "llama3.1:8b"
 
     redis_url: RedisDsn = Field(default="redis://localhost:6379/0")  # type: ignore[assignment]
+    # Vários primários (hashing consistente), cada um com réplicas opcionais;
+    # quando informado, substitui redis_url
+    redis_shards: list[RedisShard] = Field(default_factory=list)
+    redis_socket_timeout: float = 0.25
+    redis_connect_timeout: float = 0.25
+    redis_breaker_failure_threshold: int = 5
+    redis_breaker_cooldown_seconds: float = 10.0
     cache_ttl_seconds: int = 3600
     cache_enabled: bool = True
+    cache_clear_batch_size: int = 1000
+    cache_negative_ttl_seconds: int = 300
+    cache_ttl_jitter: float = Field(default=0.1, ge=0, lt=1)
+    cache_xfetch_beta: float = Field(default=1.0, ge=0)
+    cache_stale_while_revalidate: bool = False
+    cache_stale_ttl_seconds: int = 600
+    cache_write_behind: bool = False
+    cache_write_queue_size: int = 10_000
+    cache_write_batch_size: int = 100
+    cache_bloom_filter: bool = False
+    cache_bloom_capacity: int = 1_000_000
+    cache_bloom_error_rate: float = Field(default=0.01, gt=0, lt=1)
+
+    local_cache_path: str | None = None
+    local_cache_mode: Literal["fallback", "write_through"] = "fallback"
+    local_cache_max_entries: int = 100_000
 
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = False
+    # Cache-Control (max-age) do catálogo de schemas; clientes revalidam
+    # com If-None-Match depois disso
+    schemas_cache_max_age: int = Field(default=60, ge=0)
+    # Probes de /readyz rodam em background a cada interval (com timeout);
+    # os endpoints de health só leem o último resultado
+    health_probe_interval_seconds: float = Field(default=15.0, gt=0)
+    health_probe_timeout_seconds: float = Field(default=2.0, gt=0)
+    # Respostas menores que isso não são comprimidas (gzip/zstd)
+    compression_minimum_size: int = 1024
+    # Limite do corpo de request descomprimido (exceto rotas de streaming)
+    compression_max_request_bytes: int = 10 * 1024 * 1024
+
+    # Chave dos endpoints administrativos (header X-Admin-Key); vazia
+    # desativa a limpeza do cache pela API
+    admin_api_key: str = Field(default="", repr=False)
 
     rate_limit_requests: int = 100
     rate_limit_window_seconds: int = 60
+    # memory: por processo; redis: compartilhado entre workers e réplicas
+    rate_limit_backend: Literal["memory", "redis"] = "memory"
+    rate_limit_redis_url: RedisDsn | None = None
+    # ip, ou api_key (X-API-Key / Authorization: Bearer, com fallback para o IP)
+    rate_limit_key: Literal["ip", "api_key"] = "ip"
+    # Chaves aceitas no modo api_key (JSON); outras contam pelo IP, para
+    # que credenciais inventadas não ganhem um bucket novo a cada request
+    rate_limit_api_keys: list[str] = Field(default_factory=list, repr=False)
+    # Orçamento por cliente em tokens estimados (texto + saída do schema)
+    # na mesma janela; 0 desativa
+    rate_limit_tokens: int = Field(default=200_000, ge=0)
+
+    # /extract/ndjson: extrações em paralelo por conexão e tamanho máximo
+    # de cada linha do corpo
+    bulk_concurrency: int = Field(default=8, ge=1)
+    bulk_max_line_bytes: int = 256 * 1024
+
+    # Controle de admissão: chamadas simultâneas ao LLM por processo e
+    # extrações em espera; com a fila cheia a API responde 503 na hora
+    admission_max_concurrency: int = Field(default=4, ge=1)
+    admission_max_queue: int = Field(default=32, ge=0)
+
+    # Idempotency-Key: respostas guardadas no Redis por idempotency_ttl;
+    # o marcador "em andamento" expira em idempotency_lock (dono caiu) e
+    # repetições esperam a original por até idempotency_wait
+    idempotency_enabled: bool = True
+    idempotency_redis_url: RedisDsn | None = None
+    idempotency_ttl_seconds: int = Field(default=86_400, ge=1)
+    idempotency_lock_seconds: int = Field(default=300, ge=1)
+    idempotency_wait_seconds: float = Field(default=30.0, ge=0)
 
     max_retries: int = 3
     retry_delay_seconds: float = 2.0
@@ -0,0 +1,170 @@
+"""
+Controle de admissão das chamadas ao LLM.
+
+Limita as chamadas simultâneas ao provider e o tamanho da fila de espera.
+Com a fila cheia, novas extrações são recusadas na hora (``OverloadedError``)
+em vez de esperar até o cliente desistir. Com um deadline informado pelo
+cliente, a extração é descartada antes da chamada ao LLM se a espera
+estimada mais o tempo médio de serviço não couberem nele.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class OverloadedError(Exception):
+    """Fila de admissão cheia."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Registra o tempo sugerido até nova tentativa (segundos)."""
+        super().__init__("Serviço sobrecarregado, fila de extração cheia")
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """``retry_after`` arredondado para cima (header ``Retry-After``)."""
+        return max(1, math.ceil(self.retry_after))
+
+
+class DeadlineExceededError(Exception):
+    """O deadline do cliente não pode mais ser cumprido."""
+
+
+class AdmissionController:
+    """
+    Semáforo com fila limitada e estimativa de latência.
+
+    O tempo de serviço é uma média móvel exponencial das chamadas
+    concluídas; a espera estimada de quem entra na fila é
+    ``(na_fila + 1) * serviço / concorrência`` quando não há vaga livre.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        smoothing: float = 0.2,
+    ) -> None:
+        """Inicializa o controlador sem histórico de latência."""
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.smoothing = smoothing
+        self.service_time = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.expired = 0
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    def estimated_wait(self) -> float:
+        """Espera estimada na fila para uma nova chamada (segundos)."""
+        if self.in_flight < self.max_concurrency and not self.waiting:
+            return 0.0
+        return (self.waiting + 1) * self.service_time / self.max_concurrency
+
+    def check(self, deadline: float | None = None) -> None:
+        """
+        Recusa na hora o que não tem chance de ser atendido.
+
+        Raises:
+            OverloadedError: Sem vaga livre e fila cheia
+            DeadlineExceededError: Deadline não cabe na espera + serviço
+        """
+        # Reservas ainda sem vaga contam em waiting mesmo com vaga livre
+        if self.in_flight + self.waiting >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                "admission_rejected", waiting=self.waiting, in_flight=self.in_flight
+            )
+            raise OverloadedError(self.estimated_wait() or self.service_time or 1.0)
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining < self.estimated_wait() + self.service_time:
+                raise self._expire("fila", remaining)
+
+    def reserve(self, deadline: float | None = None) -> None:
+        """
+        Verifica a admissão e já conta a request na fila, sem ``await``.
+
+        Checagem e contagem no mesmo passo do event loop: requests
+        concorrentes não passam todas pela checagem de fila cheia antes de
+        alguma ser contada. A reserva é consumida por ``admit(reserved=True)``
+        ou devolvida com ``cancel_reservation()``.
+
+        Raises:
+            OverloadedError: Sem vaga livre e fila cheia
+            DeadlineExceededError: Deadline não cabe na espera + serviço
+        """
+        self.check(deadline)
+        self.waiting += 1
+
+    def cancel_reservation(self) -> None:
+        """Devolve uma reserva que não chegou a ``admit()``."""
+        self.waiting -= 1
+
+    def counters(self) -> dict[str, float]:
+        """Ocupação atual e recusas acumuladas."""
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "service_ms": round(self.service_time * 1000, 1),
+        }
+
+    def _expire(self, reason: str, remaining: float) -> DeadlineExceededError:
+        """Conta e registra um descarte por deadline."""
+        self.expired += 1
+        logger.warning(
+            "admission_deadline_exceeded",
+            reason=reason,
+            remaining_ms=round(remaining * 1000, 1),
+            service_ms=round(self.service_time * 1000, 1),
+        )
+        return DeadlineExceededError(
+            f"Deadline não pode ser cumprido ({reason}): restam "
+            f"{max(remaining, 0) * 1000:.0f} ms, serviço estimado "
+            f"{self.service_time * 1000:.0f} ms"
+        )
+
+    @asynccontextmanager
+    async def admit(self, *, reserved: bool = False) -> AsyncIterator[None]:
+        """
+        Reserva uma vaga para chamar o LLM.
+
+        Args:
+            reserved: A fila já foi reservada com ``reserve()``
+
+        Raises:
+            OverloadedError: Sem vaga livre e fila cheia
+        """
+        if not reserved:
+            self.reserve()
+
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+        # Só chamadas concluídas entram na média (timeouts a distorceriam)
+        elapsed = time.monotonic() - start
+        self.service_time = (
+            elapsed
+            if not self.service_time
+            else self.smoothing * elapsed + (1 - self.smoothing) * self.service_time
+        )
@@ -0,0 +1,63 @@
+"""Bloom filter em memória."""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Bloom filter de tamanho fixo.
+
+    Dimensionado para ``capacity`` itens com taxa de falso positivo
+    ``error_rate``. Nunca há falso negativo: ``key not in bloom`` garante
+    que a chave nunca foi adicionada. Acima da capacidade a taxa de falso
+    positivo cresce (ver ``false_positive_rate``).
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01) -> None:
+        """Aloca o vetor de bits."""
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        """Posições dos bits da chave (double hashing)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Adiciona uma chave."""
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+
+    def __contains__(self, key: object) -> bool:
+        """Indica se a chave pode ter sido adicionada."""
+        if not isinstance(key, str):
+            return False
+        return all(
+            self._bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key)
+        )
+
+    def clear(self) -> None:
+        """Remove todas as chaves."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Taxa de falso positivo estimada para o número atual de chaves."""
+        fill = 1 - math.exp(-self.hash_count * self.count / self.size)
+        return fill**self.hash_count
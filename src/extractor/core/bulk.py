@@ -0,0 +1,123 @@
+"""
+Processamento em lote com memória constante.
+
+``ndjson_lines`` quebra um corpo em streaming em linhas sem bufferizar o
+upload inteiro, e ``map_unordered`` processa itens com concorrência
+limitada, devolvendo os resultados na ordem em que terminam. O próximo
+item só é lido quando há vaga, de modo que um upload maior que a
+capacidade de processamento é freado pelo próprio TCP.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True, slots=True)
+class RawLine:
+    """Linha de um corpo NDJSON."""
+
+    number: int
+    data: bytes
+    # Linha maior que o limite: ``data`` contém só o início
+    too_long: bool = False
+
+
+async def ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[RawLine]:
+    """
+    Quebra um corpo em streaming em linhas, ignorando linhas vazias.
+
+    Linhas maiores que ``max_line_bytes`` são descartadas à medida que
+    chegam e sinalizadas com ``too_long``; a leitura continua na linha
+    seguinte.
+    """
+    buffer = bytearray()
+    number = 0
+    discarding = False
+
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            number += 1
+            if discarding:
+                discarding = False
+                yield RawLine(number, bytes(buffer[:64]), too_long=True)
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield RawLine(number, bytes(buffer[:64]), too_long=True)
+                elif buffer.strip():
+                    yield RawLine(number, bytes(buffer))
+            buffer.clear()
+            start = end + 1
+
+        if not discarding:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                # Guarda só o início para a mensagem de erro
+                del buffer[64:]
+                discarding = True
+
+    if discarding or len(buffer) > max_line_bytes:
+        yield RawLine(number + 1, bytes(buffer[:64]), too_long=True)
+    elif buffer.strip():
+        yield RawLine(number + 1, bytes(buffer))
+
+
+async def map_unordered(
+    items: AsyncIterable[T],
+    func: Callable[[T], Coroutine[Any, Any, R]],
+    concurrency: int,
+) -> AsyncIterator[R]:
+    """
+    Aplica ``func`` a cada item com no máximo ``concurrency`` em paralelo.
+
+    Os resultados saem na ordem de conclusão, assim que ficam prontos,
+    mesmo enquanto a leitura dos itens está parada. Se o consumidor
+    abandonar o iterador, as tarefas em andamento são canceladas.
+    """
+    iterator = aiter(items)
+
+    async def next_item() -> T:
+        return await anext(iterator)
+
+    reading: asyncio.Task[T] | None = None
+    running: set[asyncio.Task[R]] = set()
+    exhausted = False
+
+    try:
+        while True:
+            if not exhausted and reading is None and len(running) < concurrency:
+                reading = asyncio.create_task(next_item())
+
+            waiting: set[asyncio.Task[T] | asyncio.Task[R]] = set(running)
+            if reading is not None:
+                waiting.add(reading)
+            if not waiting:
+                return
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if reading is not None and reading in done:
+                try:
+                    running.add(asyncio.create_task(func(reading.result())))
+                except StopAsyncIteration:
+                    exhausted = True
+                reading = None
+
+            for task in [task for task in running if task in done]:
+                running.discard(task)
+                yield task.result()
+    finally:
+        leftover: list[asyncio.Task[Any]] = [*running]
+        if reading is not None:
+            leftover.append(reading)
+        for task in leftover:
+            task.cancel()
+        await asyncio.gather(*leftover, return_exceptions=True)
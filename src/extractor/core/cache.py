@@ -1,120 +1,1138 @@
 """Sistema de cache com Redis."""
 
+import asyncio
 import hashlib
 import json
+import math
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any, cast
 
 import redis.asyncio as redis
 from pydantic import BaseModel
 
 from extractor.config import Settings, get_settings
+from extractor.core.bloom import BloomFilter
+from extractor.core.circuit_breaker import CircuitBreaker
+from extractor.core.local_cache import LocalCache
+from extractor.core.sharding import ShardedRedis, close_client
+from extractor.core.write_behind import WriteBehindQueue
 from extractor.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+KEY_PREFIX = "extract"
+
+# Número máximo de chaves por comando UNLINK dentro de um pipeline
+_UNLINK_CHUNK_SIZE = 256
+
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+# Canal pub/sub em que cada réplica anuncia as chaves que escreveu
+BLOOM_CHANNEL = f"{KEY_PREFIX}-bloom"
+
+# Espera antes de reconstruir o Bloom filter após erro no Redis
+_BLOOM_RETRY_SECONDS = 5.0
+
+# Intervalo mínimo entre reconstruções por excesso de chaves no filtro
+_BLOOM_MIN_REBUILD_SECONDS = 60.0
+
+# Trava distribuída de refresh: evita que réplicas recomputem a mesma chave
+_REFRESH_LOCK_TTL_SECONDS = 300
+
+# Entrada exportada: (chave, valor, TTL restante em ms ou None se sem expiração)
+ExportedEntry = tuple[str, str, int | None]
+
+Refresher = Callable[[], Awaitable[tuple[BaseModel, float]]]
+
+# Escrita pendente do write-behind: (schema_name, chave, valor, ttl)
+PendingWrite = tuple[str, str, str, int]
+
+
+def schema_key_pattern(schema_name: str | None = None) -> str:
+    """Retorna padrão SCAN para as chaves de um schema (ou de todos)."""
+    if schema_name is None:
+        return f"{KEY_PREFIX}:*"
+    escaped = _GLOB_SPECIAL.sub(r"\\\1", schema_name)
+    return f"{KEY_PREFIX}:{escaped}:*"
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    """
+    Valor armazenado no cache com metadados de expiração.
+
+    Serializado como ``<expires_at>;<delta>;<json>``. ``expires_at`` é a
+    expiração lógica (a chave vive mais no Redis quando stale-while-revalidate
+    está ativo) e ``delta`` o tempo gasto para computar o valor, usado no
+    refresh probabilístico antecipado (XFetch).
+    """
+
+    payload: str
+    expires_at: float
+    delta: float = 0.0
+
+    def encode(self) -> str:
+        """Serializa a entrada para o Redis."""
+        return f"{self.expires_at:.3f};{self.delta:.3f};{self.payload}"
+
+    @classmethod
+    def decode(cls, raw: str) -> "CacheEntry":
+        """Lê entrada do Redis (aceita o formato antigo, só JSON)."""
+        if raw.startswith("{"):
+            return cls(payload=raw, expires_at=math.inf)
+        expires_at, delta, payload = raw.split(";", 2)
+        return cls(payload=payload, expires_at=float(expires_at), delta=float(delta))
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Resultado da extração."""
+        return cast(dict[str, Any], json.loads(self.payload))
+
+    def is_expired(self, now: float) -> bool:
+        """Indica se a expiração lógica já passou."""
+        return now >= self.expires_at
+
+    def should_refresh_early(self, now: float, beta: float) -> bool:
+        """
+        Decide o refresh antecipado (XFetch).
+
+        A probabilidade cresce à medida que a expiração se aproxima e é
+        maior para valores caros de recomputar (``delta`` alto).
+        """
+        if beta <= 0 or self.delta <= 0 or math.isinf(self.expires_at):
+            return False
+        return now - self.delta * beta * math.log(random.random()) >= self.expires_at
+
+
+def _schema_from_key(key: str) -> str:
+    """Extrai o schema de uma chave ``extract:<schema>:<hash>[:sufixo]``."""
+    parts = key.split(":")
+    # Chaves no formato antigo (extract:<hash>) não carregam o schema
+    return parts[1] if len(parts) >= 3 else "_legacy"
+
+
+def _is_entry_key(key: str) -> bool:
+    """Indica se a chave guarda uma entrada do cache (não trava nem negativo)."""
+    return key.startswith(f"{KEY_PREFIX}:") and not key.endswith((":lock", ":neg"))
+
+
+def _distribution(values: list[int]) -> dict[str, float]:
+    """Resumo (min, p50, p90, max) de uma lista de valores."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        "min": ordered[0],
+        "p50": ordered[round(last * 0.5)],
+        "p90": ordered[round(last * 0.9)],
+        "max": ordered[-1],
+    }
+
 
 class CacheService:
-    """Serviço de cache com Redis."""
+    """
+    Serviço de cache com Redis.
+
+    Opcionalmente usa um cache local em disco (``local_cache_path``): no
+    modo ``fallback`` ele só é usado quando o Redis falha ou não está
+    configurado; no modo ``write_through`` toda escrita vai para os dois e
+    misses do Redis são consultados localmente.
+
+    Com ``cache_write_behind`` ativo, ``set`` só enfileira a escrita; um
+    writer em background envia os SETEX em pipeline e a fila é drenada em
+    ``disconnect``.
+
+    Com ``redis_shards`` as chaves são distribuídas entre vários primários
+    por hashing consistente e as leituras usam as réplicas de cada shard.
+
+    Com ``cache_bloom_filter`` ativo, um Bloom filter das chaves escritas
+    (reconstruído por SCAN no ``connect`` e atualizado via pub/sub entre
+    réplicas) evita GETs no Redis para chaves que nunca foram gravadas.
+    """
 
     def __init__(self, settings: Settings | None = None) -> None:
         """Inicializa conexão Redis."""
         self.settings = settings or get_settings()
         self._redis: redis.Redis[str] | None = None
+        self._local: LocalCache | None = None
+        self._breaker = CircuitBreaker(
+            "redis",
+            probe=self.health_check,
+            failure_threshold=self.settings.redis_breaker_failure_threshold,
+            cooldown=self.settings.redis_breaker_cooldown_seconds,
+        )
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        self._counters: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._writer: WriteBehindQueue[PendingWrite] | None = None
+        self._bloom: BloomFilter | None = None
+        self._bloom_ready = False
+        self._bloom_task: asyncio.Task[None] | None = None
 
     async def connect(self) -> None:
         """Conecta ao Redis."""
         if self.settings.cache_enabled:
-            self._redis = redis.from_url(
-                str(self.settings.redis_url),
-                encoding="utf-8",
-                decode_responses=True,
-            )
-            logger.info("redis_connected", url=str(self.settings.redis_url))
+            options: dict[str, Any] = {
+                "encoding": "utf-8",
+                "decode_responses": True,
+                "socket_timeout": self.settings.redis_socket_timeout,
+                "socket_connect_timeout": self.settings.redis_connect_timeout,
+            }
+            if self.settings.redis_shards:
+                # ShardedRedis expõe a mesma API usada aqui
+                self._redis = cast(
+                    "redis.Redis[str]",
+                    ShardedRedis.from_topology(self.settings.redis_shards, **options),
+                )
+                logger.info(
+                    "redis_connected",
+                    shards=[str(shard.url) for shard in self.settings.redis_shards],
+                )
+            else:
+                self._redis = redis.from_url(str(self.settings.redis_url), **options)
+                logger.info("redis_connected", url=str(self.settings.redis_url))
+
+            if self.settings.local_cache_path:
+                self._local = LocalCache(
+                    self.settings.local_cache_path,
+                    max_entries=self.settings.local_cache_max_entries,
+                )
+                await asyncio.to_thread(self._local.open)
+
+            if self.settings.cache_write_behind:
+                self._writer = WriteBehindQueue(
+                    self._flush_writes,
+                    maxsize=self.settings.cache_write_queue_size,
+                    batch_size=self.settings.cache_write_batch_size,
+                )
+                self._writer.start()
+
+            if self.settings.cache_bloom_filter:
+                self._bloom = BloomFilter(
+                    capacity=self.settings.cache_bloom_capacity,
+                    error_rate=self.settings.cache_bloom_error_rate,
+                )
+                self._bloom_task = asyncio.create_task(self._bloom_sync())
 
     async def disconnect(self) -> None:
         """Desconecta do Redis."""
+        for task in self._refreshing.values():
+            task.cancel()
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+        # Drena escritas pendentes antes de fechar as conexões
+        if self._writer:
+            await self._writer.close()
+            self._writer = None
+
+        if self._bloom_task:
+            self._bloom_task.cancel()
+            await asyncio.gather(self._bloom_task, return_exceptions=True)
+            self._bloom_task = None
+            self._bloom_ready = False
+
+        await self._breaker.close()
+
+        if self._local:
+            await asyncio.to_thread(self._local.close)
+            self._local = None
+
         if self._redis:
-            await self._redis.aclose()
+            await close_client(self._redis)
             logger.info("redis_disconnected")
 
     def _generate_key(self, text: str, schema_name: str) -> str:
-        """Gera chave de cache baseada no texto e schema."""
+        """
+        Gera chave de cache baseada no texto e schema.
+
+        O nome do schema faz parte da chave (``extract:<schema>:<hash>``)
+        para permitir purge seletivo via SCAN.
+        """
         content = f"{schema_name}:{text}"
-        return f"extract:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+        digest = hashlib.sha256(content.encode()).hexdigest()[:16]
+        return f"{KEY_PREFIX}:{schema_name}:{digest}"
 
-    async def get(self, text: str, schema_name: str) -> dict[str, Any] | None:
-        """Busca resultado em cache."""
-        if not self._redis or not self.settings.cache_enabled:
+    async def get(
+        self,
+        text: str,
+        schema_name: str,
+        refresh: Refresher | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Busca resultado em cache.
+
+        Args:
+            text: Texto da extração
+            schema_name: Nome do schema
+            refresh: Recomputa o valor; quando informado, entradas vencidas
+                (ou sorteadas pelo XFetch) dentro da janela de
+                stale-while-revalidate são servidas e atualizadas em
+                background, no máximo um refresh por chave.
+
+        Returns:
+            Dados em cache ou None (miss ou entrada a recomputar)
+        """
+        entry = await self._lookup(text, schema_name, refresh)
+        return entry.data if entry else None
+
+    async def get_raw(
+        self,
+        text: str,
+        schema_name: str,
+        refresh: Refresher | None = None,
+    ) -> str | None:
+        """
+        Como ``get``, mas retorna o JSON armazenado sem desserializar.
+
+        Permite repassar o valor em cache direto para a resposta HTTP.
+        """
+        entry = await self._lookup(text, schema_name, refresh)
+        return entry.payload if entry else None
+
+    async def _lookup(
+        self,
+        text: str,
+        schema_name: str,
+        refresh: Refresher | None,
+    ) -> CacheEntry | None:
+        """Busca a entrada e aplica expiração, XFetch e stale-while-revalidate."""
+        if not self._available:
             return None
 
         key = self._generate_key(text, schema_name)
+        counters = self._counters[schema_name]
+        cached = await self._read(key, counters)
 
-        try:
-            cached = await self._redis.get(key)
-            if cached:
-                logger.info("cache_hit", key=key)
-                return cast(dict[str, Any], json.loads(cached))
-        except redis.RedisError as e:
-            logger.warning("cache_get_error", error=str(e))
+        if not cached:
+            counters["misses"] += 1
+            return None
 
+        entry = CacheEntry.decode(cached)
+        now = time.time()
+        expired = entry.is_expired(now)
+
+        if not expired and not entry.should_refresh_early(
+            now, self.settings.cache_xfetch_beta
+        ):
+            counters["hits"] += 1
+            logger.info("cache_hit", key=key)
+            return entry
+
+        if refresh is not None and self.settings.cache_stale_while_revalidate:
+            self._schedule_refresh(key, text, schema_name, refresh)
+            counters["stale_hits"] += 1
+            logger.info("cache_hit_stale", key=key, expired=expired)
+            return entry
+
+        counters["misses"] += 1
+        if not expired:
+            # XFetch sem stale-while-revalidate: esta request recomputa
+            logger.info("cache_early_refresh", key=key)
         return None
 
+    @property
+    def _available(self) -> bool:
+        """Indica se há algum nível de cache utilizável."""
+        return self.settings.cache_enabled and (
+            self._redis is not None or self._local is not None
+        )
+
+    @property
+    def _redis_usable(self) -> bool:
+        """Redis configurado e com circuito fechado."""
+        return self._redis is not None and self._breaker.allow()
+
+    def _use_local(self, redis_ok: bool) -> bool:
+        """Decide se o cache local participa da operação."""
+        return self._local is not None and (
+            not redis_ok or self.settings.local_cache_mode == "write_through"
+        )
+
+    async def _read(self, key: str, counters: Counter[str]) -> str | None:
+        """Lê do Redis e, conforme o modo, do cache local."""
+        cached: str | None = None
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            try:
+                cached = await self._redis.get(key) if self._may_contain(key) else None
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                counters["errors"] += 1
+                logger.warning("cache_get_error", error=str(e))
+
+        if not cached and self._local and self._use_local(redis_ok):
+            cached = await self._local.get(key)
+            if cached:
+                counters["local_hits"] += 1
+
+        return cached
+
+    async def _write(
+        self, key: str, value: str, ttl: int, counters: Counter[str]
+    ) -> bool:
+        """Escreve no Redis e, conforme o modo, no cache local."""
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            try:
+                if self._bloom:
+                    pipe = self._redis.pipeline(transaction=False)
+                    pipe.setex(key, ttl, value)
+                    self._announce(pipe, [key])
+                    await pipe.execute()
+                else:
+                    await self._redis.setex(key, ttl, value)
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                counters["errors"] += 1
+                logger.warning("cache_set_error", error=str(e))
+
+        if self._local and self._use_local(redis_ok):
+            await self._local.set(key, value, ttl)
+            counters["local_sets"] += 1
+            return True
+
+        return redis_ok
+
+    def _may_contain(self, key: str) -> bool:
+        """
+        Consulta o Bloom filter antes de ir ao Redis.
+
+        Enquanto o filtro não terminou de ser reconstruído toda chave é
+        tratada como possível. Lookups evitados são contados em
+        ``bloom_skips``.
+        """
+        if self._bloom is None or not self._bloom_ready or key in self._bloom:
+            return True
+        self._counters[_schema_from_key(key)]["bloom_skips"] += 1
+        return False
+
+    def _announce(self, pipe: "redis.client.Pipeline[str]", keys: list[str]) -> None:
+        """Registra chaves escritas no filtro local e as publica às réplicas."""
+        if self._bloom is None or not keys:
+            return
+        for key in keys:
+            self._bloom.add(key)
+        pipe.publish(BLOOM_CHANNEL, "\n".join(keys))
+
+    async def _bloom_sync(self) -> None:
+        """
+        Reconstrói o Bloom filter e o mantém atualizado.
+
+        Assina o canal antes do SCAN para não perder escritas feitas durante
+        a varredura. Chaves que expiram pelo TTL nunca saem do filtro, então
+        ele é reconstruído a cada ``cache_ttl_seconds`` ou quando passa da
+        capacidade; o filtro novo é montado à parte e só então substitui o
+        atual, que segue em uso durante a varredura. Em qualquer erro o
+        filtro é desativado e reconstruído após ``_BLOOM_RETRY_SECONDS``.
+        """
+        assert self._redis is not None and self._bloom is not None
+
+        while True:
+            pubsub = self._redis.pubsub()
+            retry = True
+            try:
+                await pubsub.subscribe(BLOOM_CHANNEL)
+                fresh = BloomFilter(
+                    capacity=self._bloom.capacity, error_rate=self._bloom.error_rate
+                )
+                async for key in self._redis.scan_iter(
+                    match=schema_key_pattern(),
+                    count=self.settings.cache_clear_batch_size,
+                ):
+                    fresh.add(key)
+                self._bloom = fresh
+                self._bloom_ready = True
+                built_at, built_keys = time.monotonic(), fresh.count
+                logger.info("bloom_filter_ready", keys=fresh.count)
+                if fresh.count > fresh.capacity:
+                    logger.warning(
+                        "bloom_filter_over_capacity",
+                        keys=fresh.count,
+                        capacity=fresh.capacity,
+                    )
+
+                while not self._bloom_outdated(built_at, built_keys):
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message:
+                        for key in message["data"].split("\n"):
+                            self._bloom.add(key)
+                retry = False
+            except redis.RedisError as e:
+                self._bloom_ready = False
+                logger.warning("bloom_filter_sync_error", error=str(e))
+            except Exception as e:
+                # Mensagem malformada ou bug: sem isso a task morreria com o
+                # filtro marcado como pronto e parado de receber escritas
+                self._bloom_ready = False
+                logger.error(
+                    "bloom_filter_sync_failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            finally:
+                try:
+                    await close_client(pubsub)
+                except Exception as e:
+                    logger.warning("bloom_filter_unsubscribe_error", error=str(e))
+
+            if retry:
+                await asyncio.sleep(_BLOOM_RETRY_SECONDS)
+
+    def _bloom_outdated(self, built_at: float, built_keys: int) -> bool:
+        """
+        Indica se o filtro deve ser reconstruído para descartar chaves expiradas.
+
+        Vale após ``cache_ttl_seconds`` ou quando o filtro, montado dentro da
+        capacidade, passou dela (no máximo a cada
+        ``_BLOOM_MIN_REBUILD_SECONDS``).
+        """
+        assert self._bloom is not None
+        elapsed = time.monotonic() - built_at
+        if elapsed >= self.settings.cache_ttl_seconds:
+            return True
+        return (
+            built_keys <= self._bloom.capacity < self._bloom.count
+            and elapsed >= _BLOOM_MIN_REBUILD_SECONDS
+        )
+
+    def bloom_stats(self) -> dict[str, Any] | None:
+        """Estado do Bloom filter (None se desativado)."""
+        if self._bloom is None:
+            return None
+        return {
+            "ready": self._bloom_ready,
+            "capacity": self._bloom.capacity,
+            "keys": self._bloom.count,
+            "false_positive_rate": round(self._bloom.false_positive_rate, 6),
+        }
+
+    async def exists(self, text: str, schema_name: str) -> bool:
+        """
+        Verifica se há entrada em cache sem transferir o valor.
+
+        Com o Redis fora (ou em write-through), consulta também o cache local.
+        """
+        if not self._available:
+            return False
+
+        key = self._generate_key(text, schema_name)
+        found = False
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            try:
+                found = self._may_contain(key) and bool(await self._redis.exists(key))
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("cache_get_error", error=str(e))
+
+        if not found and self._local and self._use_local(redis_ok):
+            found = await self._local.get(key) is not None
+
+        return found
+
+    def _ttl(self) -> float:
+        """TTL lógico com jitter para não expirar lotes ao mesmo tempo."""
+        jitter = self.settings.cache_ttl_jitter
+        return self.settings.cache_ttl_seconds * random.uniform(1 - jitter, 1 + jitter)
+
     async def set(
         self,
         text: str,
         schema_name: str,
         result: BaseModel,
+        delta: float = 0.0,
+        *,
+        wait: bool = False,
     ) -> None:
-        """Armazena resultado em cache."""
-        if not self._redis or not self.settings.cache_enabled:
+        """
+        Armazena resultado em cache.
+
+        Args:
+            text: Texto da extração
+            schema_name: Nome do schema
+            result: Resultado validado
+            delta: Tempo gasto na extração (segundos), usado pelo XFetch
+            wait: Grava antes de retornar, mesmo com write-behind ativo
+        """
+        if not self._available:
             return
 
         key = self._generate_key(text, schema_name)
+        value, ttl = self._encode(result, delta)
+
+        counters = self._counters[schema_name]
+        if self._writer and not wait:
+            if not self._writer.submit((schema_name, key, value, ttl)):
+                counters["dropped_writes"] += 1
+                logger.warning("cache_write_dropped", key=key)
+            return
+
+        if await self._write(key, value, ttl, counters):
+            counters["sets"] += 1
+            logger.info("cache_set", key=key, ttl=ttl)
+
+    async def _flush_writes(self, rows: list[PendingWrite]) -> None:
+        """Grava um lote do write-behind com SETEX em pipeline."""
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            pipe = self._redis.pipeline(transaction=False)
+            for _, key, value, ttl in rows:
+                pipe.setex(key, ttl, value)
+            self._announce(pipe, [key for _, key, _, _ in rows])
+            try:
+                await pipe.execute()
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                for schema_name, *_ in rows:
+                    self._counters[schema_name]["errors"] += 1
+                logger.warning("cache_set_error", error=str(e), count=len(rows))
+
+        if self._local and self._use_local(redis_ok):
+            for schema_name, key, value, ttl in rows:
+                await self._local.set(key, value, ttl)
+                self._counters[schema_name]["local_sets"] += 1
+        elif not redis_ok:
+            return
+
+        for schema_name, *_ in rows:
+            self._counters[schema_name]["sets"] += 1
+        logger.info("cache_set_many", count=len(rows))
+
+    def _encode(self, result: BaseModel, delta: float = 0.0) -> tuple[str, int]:
+        """Serializa o resultado e calcula o TTL físico da chave."""
+        ttl = self._ttl()
+        entry = CacheEntry(
+            payload=result.model_dump_json(),
+            expires_at=time.time() + ttl,
+            delta=delta,
+        )
+
+        # A chave sobrevive à expiração lógica para ser servida como stale
+        if self.settings.cache_stale_while_revalidate:
+            ttl += self.settings.cache_stale_ttl_seconds
+
+        return entry.encode(), math.ceil(ttl)
+
+    async def get_many(
+        self, items: Sequence[tuple[str, str]]
+    ) -> list[dict[str, Any] | None]:
+        """
+        Busca vários resultados com um único MGET.
+
+        Args:
+            items: Pares ``(texto, schema_name)``
+
+        Returns:
+            Dados em cache (ou None) na mesma posição de cada item
+        """
+        if not self._available or not items:
+            return [None] * len(items)
+
+        keys = [self._generate_key(text, schema) for text, schema in items]
+        values = await self._read_many(keys)
+        now = time.time()
+
+        results: list[dict[str, Any] | None] = []
+        for (_, schema_name), raw in zip(items, values, strict=True):
+            counters = self._counters[schema_name]
+            entry = CacheEntry.decode(raw) if raw else None
+            if entry is None or entry.is_expired(now):
+                counters["misses"] += 1
+                results.append(None)
+            else:
+                counters["hits"] += 1
+                results.append(entry.data)
+
+        logger.info("cache_get_many", count=len(items))
+        return results
+
+    async def exists_many(self, items: Sequence[tuple[str, str]]) -> list[bool]:
+        """
+        Verifica quais pares ``(texto, schema_name)`` estão em cache.
+
+        Usa EXISTS em pipeline (uma ida ao Redis, sem transferir valores).
+        """
+        if not self._available or not items:
+            return [False] * len(items)
+
+        keys = [self._generate_key(text, schema) for text, schema in items]
+        found = [False] * len(keys)
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            candidates = [i for i, key in enumerate(keys) if self._may_contain(key)]
+            pipe = self._redis.pipeline(transaction=False)
+            for i in candidates:
+                pipe.exists(keys[i])
+            try:
+                results = await pipe.execute() if candidates else []
+                for i, n in zip(candidates, results, strict=True):
+                    found[i] = bool(n)
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("cache_get_error", error=str(e))
+
+        if self._local and self._use_local(redis_ok):
+            for i, key in enumerate(keys):
+                found[i] = found[i] or await self._local.get(key) is not None
+
+        return found
+
+    async def set_many(self, items: Sequence[tuple[str, str, BaseModel]]) -> None:
+        """
+        Armazena vários resultados com SET EX em pipeline.
+
+        Args:
+            items: Triplas ``(texto, schema_name, resultado)``
+        """
+        if not self._available or not items:
+            return
+
+        rows = []
+        for text, schema_name, result in items:
+            value, ttl = self._encode(result)
+            rows.append((self._generate_key(text, schema_name), value, ttl))
+
+        redis_ok = False
+        if self._redis and self._redis_usable:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, value, ttl in rows:
+                pipe.set(key, value, ex=ttl)
+            self._announce(pipe, [key for key, _, _ in rows])
+            try:
+                await pipe.execute()
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("cache_set_error", error=str(e))
+
+        if self._local and self._use_local(redis_ok):
+            for key, value, ttl in rows:
+                await self._local.set(key, value, ttl)
+        elif not redis_ok:
+            return
+
+        for _, schema_name, _ in items:
+            self._counters[schema_name]["sets"] += 1
+        logger.info("cache_set_many", count=len(items))
+
+    async def _read_many(self, keys: list[str]) -> list[str | None]:
+        """Lê várias chaves (MGET) com fallback para o cache local."""
+        values: list[str | None] = [None] * len(keys)
+        redis_ok = False
+
+        if self._redis and self._redis_usable:
+            candidates = [i for i, key in enumerate(keys) if self._may_contain(key)]
+            try:
+                found = await self._redis.mget([keys[i] for i in candidates])
+                for i, value in zip(candidates, found, strict=True):
+                    values[i] = value
+                redis_ok = True
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("cache_get_error", error=str(e))
+
+        if self._local and self._use_local(redis_ok):
+            for i, key in enumerate(keys):
+                if values[i] is None:
+                    values[i] = await self._local.get(key)
+
+        return values
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        text: str,
+        schema_name: str,
+        refresh: Refresher,
+    ) -> None:
+        """Dispara refresh em background se não houver outro para a chave."""
+        if key in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._refresh(key, text, schema_name, refresh))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: str,
+        text: str,
+        schema_name: str,
+        refresh: Refresher,
+    ) -> None:
+        """Recomputa a entrada, com trava no Redis entre réplicas."""
+        lock_key = f"{key}:lock"
 
         try:
-            await self._redis.setex(
-                key,
-                self.settings.cache_ttl_seconds,
-                result.model_dump_json(),
-            )
-            logger.info("cache_set", key=key, ttl=self.settings.cache_ttl_seconds)
+            if self._redis and not await self._redis.set(
+                lock_key, "1", nx=True, ex=_REFRESH_LOCK_TTL_SECONDS
+            ):
+                return
+
+            try:
+                result, delta = await refresh()
+                # Grava antes de soltar a trava: com write-behind, outra
+                # réplica veria a entrada ainda stale e recomputaria
+                await self.set(text, schema_name, result, delta=delta, wait=True)
+                logger.info("cache_refreshed", key=key, delta=round(delta, 3))
+            finally:
+                if self._redis:
+                    await self._redis.delete(lock_key)
         except redis.RedisError as e:
-            logger.warning("cache_set_error", error=str(e))
+            logger.warning("cache_refresh_error", key=key, error=str(e))
+        except Exception as e:
+            # Mantém a entrada stale; a próxima leitura tenta de novo
+            logger.warning("cache_refresh_failed", key=key, error=str(e))
+
+    def _negative_key(self, text: str, schema_name: str) -> str:
+        """Gera chave da entrada negativa (falha recente) do texto/schema."""
+        return f"{self._generate_key(text, schema_name)}:neg"
+
+    async def get_failure(self, text: str, schema_name: str) -> str | None:
+        """Retorna o motivo de uma falha recente em cache, se houver."""
+        if not self._available:
+            return None
+
+        key = self._negative_key(text, schema_name)
+        counters = self._counters[schema_name]
+        cached = await self._read(key, counters)
+
+        if cached:
+            counters["negative_hits"] += 1
+            logger.info("negative_cache_hit", key=key)
+            return str(json.loads(cached)["error"])
+
+        return None
+
+    async def set_failure(self, text: str, schema_name: str, reason: str) -> None:
+        """Armazena falha de extração com TTL curto (cache negativo)."""
+        ttl = self.settings.cache_negative_ttl_seconds
+        if not self._available or ttl <= 0:
+            return
+
+        key = self._negative_key(text, schema_name)
+        value = json.dumps({"error": reason})
+
+        if await self._write(key, value, ttl, self._counters[schema_name]):
+            logger.info("negative_cache_set", key=key, ttl=ttl)
 
     async def delete(self, text: str, schema_name: str) -> bool:
         """Remove item do cache."""
-        if not self._redis or not self.settings.cache_enabled:
+        if not self._available:
             return False
 
         key = self._generate_key(text, schema_name)
+        deleted = False
+
+        if self._redis and self._redis_usable:
+            try:
+                deleted = bool(await self._redis.delete(key))
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("cache_delete_error", error=str(e))
+
+        if self._local:
+            deleted = await self._local.delete(key) or deleted
+
+        if deleted:
+            logger.info("cache_deleted", key=key)
+        return deleted
+
+    async def clear_all(
+        self,
+        batch_size: int | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Limpa todo o cache de extração.
+
+        Returns:
+            Chaves removidas (Redis + cache local)
+        """
+        deleted = await self._purge(schema_key_pattern(), batch_size, on_progress)
+        return deleted + await self._purge_local(f"{KEY_PREFIX}:")
+
+    async def purge_schema(
+        self,
+        schema_name: str,
+        batch_size: int | None = None,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Remove apenas as entradas de um schema.
+
+        Returns:
+            Chaves removidas (Redis + cache local)
+        """
+        deleted = await self._purge(
+            schema_key_pattern(schema_name), batch_size, on_progress
+        )
+        return deleted + await self._purge_local(f"{KEY_PREFIX}:{schema_name}:")
+
+    async def _purge_local(self, prefix: str) -> int:
+        """Remove do cache local as chaves com o prefixo."""
+        if not self._local or not self.settings.cache_enabled:
+            return 0
+        return await self._local.purge_prefix(prefix)
+
+    async def _purge(
+        self,
+        pattern: str,
+        batch_size: int | None,
+        on_progress: Callable[[int], None] | None,
+    ) -> int:
+        """
+        Remove chaves que casam com o padrão sem bloquear o Redis.
+
+        As chaves são percorridas com SCAN e removidas em lotes com UNLINK
+        (liberação de memória em background no servidor), enviados em
+        pipeline. Nunca mantém mais que ``batch_size`` chaves em memória.
+
+        Returns:
+            Número de chaves removidas (parcial em caso de erro)
+        """
+        if not self._redis or not self.settings.cache_enabled:
+            return 0
+
+        batch_size = batch_size or self.settings.cache_clear_batch_size
+        deleted = 0
+        batch: list[str] = []
 
         try:
-            deleted = await self._redis.delete(key)
-            if deleted:
-                logger.info("cache_deleted", key=key)
-            return bool(deleted)
+            async for key in self._redis.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += await self._unlink(batch)
+                    batch = []
+                    logger.info("cache_clear_progress", pattern=pattern, count=deleted)
+                    if on_progress:
+                        on_progress(deleted)
+                    # Cede o event loop entre lotes
+                    await asyncio.sleep(0)
+
+            if batch:
+                deleted += await self._unlink(batch)
+                if on_progress:
+                    on_progress(deleted)
         except redis.RedisError as e:
-            logger.warning("cache_delete_error", error=str(e))
-            return False
+            logger.warning("cache_clear_error", error=str(e), count=deleted)
+            return deleted
+
+        logger.info("cache_cleared", pattern=pattern, count=deleted)
+        return deleted
+
+    async def _unlink(self, keys: list[str]) -> int:
+        """Remove um lote de chaves com UNLINK em pipeline."""
+        assert self._redis is not None
+        pipe = self._redis.pipeline(transaction=False)
+        for start in range(0, len(keys), _UNLINK_CHUNK_SIZE):
+            pipe.unlink(*keys[start : start + _UNLINK_CHUNK_SIZE])
+        results = await pipe.execute()
+        return sum(int(n) for n in results)
+
+    async def export_entries(
+        self, batch_size: int | None = None
+    ) -> AsyncIterator[ExportedEntry]:
+        """
+        Percorre as entradas do Redis com o TTL restante de cada uma.
+
+        As chaves vêm do SCAN em lotes de ``batch_size``; valor e PTTL de
+        cada lote são lidos em um único pipeline, então a memória usada não
+        depende do tamanho do cache. Travas de refresh e chaves que expiram
+        durante a varredura são ignoradas. Erros do Redis são propagados.
+        """
+        if not self._redis or not self.settings.cache_enabled:
+            return
+
+        batch_size = batch_size or self.settings.cache_clear_batch_size
+        batch: list[str] = []
+
+        async for key in self._redis.scan_iter(
+            match=schema_key_pattern(), count=batch_size
+        ):
+            if key.endswith(":lock"):
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                for entry in await self._fetch_with_ttl(batch):
+                    yield entry
+                batch = []
+
+        for entry in await self._fetch_with_ttl(batch):
+            yield entry
+
+    async def _fetch_with_ttl(self, keys: list[str]) -> list[ExportedEntry]:
+        """Lê valor e PTTL de um lote de chaves em pipeline."""
+        if not keys:
+            return []
+
+        assert self._redis is not None
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+            pipe.pttl(key)
+        results = await pipe.execute()
+
+        entries: list[ExportedEntry] = []
+        for i, key in enumerate(keys):
+            value, ttl_ms = results[2 * i], int(results[2 * i + 1])
+            # PTTL -2: a chave expirou entre o SCAN e a leitura
+            if value is None or ttl_ms == -2:
+                continue
+            entries.append((key, value, ttl_ms if ttl_ms >= 0 else None))
+        return entries
 
-    async def clear_all(self) -> int:
-        """Limpa todo o cache de extração."""
+    async def import_entries(
+        self,
+        entries: Iterable[ExportedEntry],
+        batch_size: int | None = None,
+        replace: bool = False,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Carrega entradas exportadas com SET PX em pipeline.
+
+        Args:
+            entries: Entradas ``(chave, valor, ttl_ms)``, consumidas em lotes
+            batch_size: Entradas por pipeline
+            replace: Sobrescreve chaves existentes (padrão: só grava ausentes)
+            on_progress: Recebe o total gravado após cada lote
+
+        Returns:
+            Número de chaves gravadas
+        """
         if not self._redis or not self.settings.cache_enabled:
             return 0
 
+        batch_size = batch_size or self.settings.cache_clear_batch_size
+        written = 0
+        batch: list[ExportedEntry] = []
+
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                written += await self._restore(batch, replace)
+                batch = []
+                if on_progress:
+                    on_progress(written)
+
+        if batch:
+            written += await self._restore(batch, replace)
+            if on_progress:
+                on_progress(written)
+
+        logger.info("cache_imported", count=written)
+        return written
+
+    async def _restore(self, batch: list[ExportedEntry], replace: bool) -> int:
+        """Grava um lote de entradas exportadas em pipeline."""
+        assert self._redis is not None
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value, ttl_ms in batch:
+            pipe.set(key, value, px=ttl_ms, nx=not replace)
+        self._announce(pipe, [key for key, _, _ in batch])
+        results = await pipe.execute()
+        return sum(1 for ok in results[: len(batch)] if ok)
+
+    def counters(self) -> dict[str, dict[str, int]]:
+        """
+        Contadores por schema desde o início do processo.
+
+        Os contadores são locais ao worker; com vários workers cada um
+        reporta apenas o próprio tráfego.
+        """
+        return {schema: dict(counts) for schema, counts in self._counters.items()}
+
+    async def sample_keys(self, sample_size: int = 1000) -> dict[str, Any]:
+        """
+        Amostra chaves do cache para estimar volume, memória e TTLs.
+
+        Percorre o keyspace com SCAN até reunir ``sample_size`` entradas e
+        consulta MEMORY USAGE e TTL em pipeline. Travas (``:lock``) e
+        marcadores negativos (``:neg``) ficam de fora. Se a varredura não
+        terminar, as contagens por schema são extrapoladas pela fração de
+        entradas entre as chaves visitadas, aplicada ao DBSIZE (que inclui
+        rate limit, idempotência e demais chaves do banco).
+
+        Returns:
+            ``{"exact": bool, "schemas": {schema: {...}}}``
+        """
+        if not self._redis or not self.settings.cache_enabled:
+            return {"exact": True, "schemas": {}}
+
+        keys: list[str] = []
+        scanned = 0
+        exact = True
         try:
-            keys = []
-            async for key in self._redis.scan_iter(match="extract:*"):
-                keys.append(key)
-
-            if keys:
-                deleted = await self._redis.delete(*keys)
-                logger.info("cache_cleared", count=deleted)
-                return int(deleted)
-            return 0
+            # Sem MATCH: as chaves visitadas de outros tipos entram no
+            # denominador da extrapolação. O teto evita varrer o banco
+            # inteiro quando as entradas do cache são minoria.
+            async for key in self._redis.scan_iter(count=min(sample_size, 1000)):
+                scanned += 1
+                if _is_entry_key(key):
+                    keys.append(key)
+                if len(keys) >= sample_size or scanned >= sample_size * 10:
+                    exact = False
+                    break
+
+            pipe = self._redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.memory_usage(key)
+                pipe.ttl(key)
+            results = await pipe.execute() if keys else []
+            scale = 1.0 if exact else await self._redis.dbsize() / scanned
         except redis.RedisError as e:
-            logger.warning("cache_clear_error", error=str(e))
-            return 0
+            logger.warning("cache_stats_error", error=str(e))
+            return {"exact": False, "schemas": {}}
+
+        sizes: defaultdict[str, list[int]] = defaultdict(list)
+        ttls: defaultdict[str, list[int]] = defaultdict(list)
+        for i, key in enumerate(keys):
+            schema = _schema_from_key(key)
+            sizes[schema].append(int(results[2 * i] or 0))
+            ttl = int(results[2 * i + 1])
+            if ttl >= 0:
+                ttls[schema].append(ttl)
+
+        schemas = {}
+        for schema, schema_sizes in sizes.items():
+            avg_bytes = sum(schema_sizes) / len(schema_sizes)
+            estimated_keys = round(len(schema_sizes) * scale)
+            schemas[schema] = {
+                "sampled_keys": len(schema_sizes),
+                "estimated_keys": estimated_keys,
+                "avg_bytes": round(avg_bytes, 1),
+                "estimated_bytes": round(avg_bytes * estimated_keys),
+                "ttl_seconds": _distribution(ttls[schema]),
+            }
+
+        return {"exact": exact, "schemas": schemas}
 
     async def health_check(self) -> bool:
         """Verifica se Redis está acessível."""
@@ -0,0 +1,90 @@
+"""Circuit breaker para dependências externas."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker com probe em background.
+
+    Após ``failure_threshold`` falhas consecutivas o circuito abre e
+    ``allow()`` passa a retornar False sem tocar na dependência. Depois de
+    ``cooldown`` segundos um único probe roda em background; se passar, o
+    circuito fecha, senão o cooldown recomeça. Requests nunca esperam pelo
+    probe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[bool]],
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+    ) -> None:
+        """Inicializa circuito fechado."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._probe = probe
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Indica se o circuito está aberto."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Indica se a dependência pode ser usada agora."""
+        if self._opened_at is None:
+            return True
+
+        if (
+            time.monotonic() - self._opened_at >= self.cooldown
+            and self._probe_task is None
+        ):
+            self._probe_task = asyncio.create_task(self._run_probe())
+
+        return False
+
+    def record_success(self) -> None:
+        """Registra chamada bem-sucedida."""
+        self._failures = 0
+        if self._opened_at is not None:
+            self._opened_at = None
+            logger.info("circuit_closed", name=self.name)
+
+    def record_failure(self) -> None:
+        """Registra falha; abre o circuito ao atingir o limite."""
+        self._failures += 1
+        if self._opened_at is None and self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            logger.warning("circuit_opened", name=self.name, failures=self._failures)
+
+    async def close(self) -> None:
+        """Cancela probe em andamento."""
+        if self._probe_task:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+
+    async def _run_probe(self) -> None:
+        """Testa a dependência e fecha ou reabre o circuito."""
+        try:
+            healthy = await self._probe()
+        except Exception:
+            healthy = False
+
+        if healthy:
+            self.record_success()
+        else:
+            self._opened_at = time.monotonic()
+            logger.info("circuit_probe_failed", name=self.name)
+        self._probe_task = None
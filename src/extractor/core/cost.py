@@ -0,0 +1,76 @@
+"""
+Estimativa do custo de uma extração em tokens.
+
+Usada pelo rate limiting por orçamento: o custo no LLM cresce com o texto
+enviado e com o tamanho da saída que o schema pede, não com o número de
+requests. A estimativa é grosseira de propósito (sem tokenizer): o que
+importa é a proporção entre extrações leves e pesadas.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+
+# Média de caracteres por token em português/inglês nos tokenizers BPE
+CHARS_PER_TOKEN = 4
+# Tokens de saída por campo escalar (nome da chave, valor, pontuação)
+TOKENS_PER_FIELD = 16
+# Itens presumidos em cada lista da saída
+ITEMS_PER_LIST = 4
+
+
+def _node_tokens(node: dict[str, Any], defs: dict[str, Any], depth: int) -> int:
+    """Tokens de saída de um nó do JSON Schema."""
+    if depth > 8:
+        return TOKENS_PER_FIELD
+    if "$ref" in node:
+        node = defs[node["$ref"].rsplit("/", 1)[-1]]
+
+    if variants := node.get("anyOf") or node.get("oneOf"):
+        tokens = max(_node_tokens(v, defs, depth + 1) for v in variants)
+    elif "properties" in node:
+        tokens = sum(
+            _node_tokens(prop, defs, depth + 1) for prop in node["properties"].values()
+        )
+    elif node.get("type") == "array":
+        tokens = ITEMS_PER_LIST * _node_tokens(node.get("items", {}), defs, depth + 1)
+    elif node.get("type") == "null":
+        tokens = 0
+    else:
+        tokens = TOKENS_PER_FIELD
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def schema_output_tokens(schema: type[BaseModel]) -> int:
+    """
+    Tokens de saída esperados para um schema.
+
+    Soma os campos escalares, expandindo modelos aninhados e contando
+    ``ITEMS_PER_LIST`` itens por lista. Calculado uma vez por schema.
+    """
+    json_schema = schema.model_json_schema()
+    return _node_tokens(json_schema, json_schema.get("$defs", {}), 0)
+
+
+def estimate_tokens(
+    text: str,
+    schema: type[BaseModel] | None = None,
+    system_prompt: str | None = None,
+) -> int:
+    """
+    Custo estimado de uma extração: tokens de entrada mais os de saída.
+
+    Args:
+        text: Texto a extrair
+        schema: Schema de saída (``None`` conta só a entrada)
+        system_prompt: Prompt de sistema customizado
+
+    Returns:
+        Tokens estimados (no mínimo 1)
+    """
+    chars = len(text) + len(system_prompt or "")
+    output = schema_output_tokens(schema) if schema is not None else 0
+    return max(1, math.ceil(chars / CHARS_PER_TOKEN) + output)
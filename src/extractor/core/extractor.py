@@ -1,11 +1,16 @@
 """Serviço principal de extração."""
 
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
+from extractor.core.admission import AdmissionController, DeadlineExceededError
 from extractor.core.cache import CacheService
 from extractor.core.instructor_client import InstructorClient
+from extractor.core.singleflight import SingleFlight
 from extractor.schemas.registry import SchemaRegistry
 from extractor.utils.logging import get_logger
 
@@ -16,6 +21,35 @@ class ExtractionError(Exception):
     """Erro durante extração."""
 
 
+class _PreflightError(Exception):
+    """Admissão ou orçamento de quem iniciou a chamada compartilhada recusados."""
+
+    def __init__(self, error: Exception) -> None:
+        """Guarda o erro original, relançado só para a request que o causou."""
+        super().__init__(str(error))
+        self.error = error
+
+
+def _is_validation_failure(error: BaseException) -> bool:
+    """
+    Indica se a falha veio da validação do output do LLM.
+
+    Erros de infraestrutura (conexão, timeout, provider) não são
+    determinísticos e não devem ir para o cache negativo.
+    """
+    current: BaseException | None = error
+    while current is not None:
+        if isinstance(current, ValidationError):
+            return True
+        current = current.__cause__ or current.__context__
+
+    attempts = getattr(error, "failed_attempts", None) or []
+    return any(
+        isinstance(getattr(attempt, "exception", None), ValidationError)
+        for attempt in attempts
+    )
+
+
 class ExtractorService:
     """Serviço principal de extração de dados."""
 
@@ -24,11 +58,15 @@ class ExtractorService:
         client: InstructorClient,
         cache: CacheService,
         registry: SchemaRegistry,
+        admission: AdmissionController | None = None,
+        flights: SingleFlight | None = None,
     ) -> None:
         """Inicializa o serviço."""
         self.client = client
         self.cache = cache
         self.registry = registry
+        self.admission = admission
+        self.flights = flights or SingleFlight()
 
     async def extract(
         self,
@@ -36,6 +74,10 @@ class ExtractorService:
         schema_name: str,
         system_prompt: str | None = None,
         use_cache: bool = True,
+        use_negative_cache: bool = True,
+        *,
+        deadline: float | None = None,
+        before_llm_call: Callable[[], Awaitable[None]] | None = None,
     ) -> dict[str, Any]:
         """
         Extrai dados estruturados do texto.
@@ -45,6 +87,13 @@ class ExtractorService:
             schema_name: Nome do schema registrado
             system_prompt: Prompt de sistema customizado
             use_cache: Se deve usar cache
+            use_negative_cache: Se deve falhar rápido quando o texto falhou
+                recentemente na validação do schema
+            deadline: Instante limite (``time.monotonic()``) para esperar a
+                extração; cache hits não são afetados
+            before_llm_call: Chamado só quando esta request inicia uma
+                chamada ao LLM (não em cache hits nem ao reaproveitar uma
+                chamada em andamento); pode levantar para impedi-la
 
         Returns:
             Dicionário com dados extraídos
@@ -52,8 +101,83 @@ class ExtractorService:
         Raises:
             ExtractionError: Se extração falhar
             KeyError: Se schema não existir
+            OverloadedError: Fila de admissão cheia
+            DeadlineExceededError: Deadline não pode ser cumprido
         """
-        # Buscar schema
+        schema_class = self._start(text, schema_name, use_cache)
+
+        # Verificar cache
+        if use_cache:
+            cached = await self.cache.get(
+                text,
+                schema_name,
+                refresh=partial(
+                    self._run_extraction, text, schema_class, system_prompt
+                ),
+            )
+            if cached:
+                return cached
+
+        result = await self._extract_fresh(
+            text,
+            schema_name,
+            schema_class,
+            system_prompt,
+            use_cache=use_cache,
+            use_negative_cache=use_negative_cache,
+            deadline=deadline,
+            before_llm_call=before_llm_call,
+        )
+        return result.model_dump()
+
+    async def extract_json(
+        self,
+        text: str,
+        schema_name: str,
+        system_prompt: str | None = None,
+        use_cache: bool = True,
+        use_negative_cache: bool = True,
+        *,
+        deadline: float | None = None,
+        before_llm_call: Callable[[], Awaitable[None]] | None = None,
+    ) -> str:
+        """
+        Extrai dados estruturados e retorna o JSON serializado.
+
+        Em cache hits o JSON armazenado é retornado como está, sem
+        desserializar nem revalidar, para ser repassado direto na resposta.
+        Argumentos e exceções iguais a ``extract``.
+
+        Returns:
+            JSON com os dados extraídos
+        """
+        schema_class = self._start(text, schema_name, use_cache)
+
+        if use_cache:
+            cached = await self.cache.get_raw(
+                text,
+                schema_name,
+                refresh=partial(
+                    self._run_extraction, text, schema_class, system_prompt
+                ),
+            )
+            if cached:
+                return cached
+
+        result = await self._extract_fresh(
+            text,
+            schema_name,
+            schema_class,
+            system_prompt,
+            use_cache=use_cache,
+            use_negative_cache=use_negative_cache,
+            deadline=deadline,
+            before_llm_call=before_llm_call,
+        )
+        return result.model_dump_json()
+
+    def _start(self, text: str, schema_name: str, use_cache: bool) -> type[BaseModel]:
+        """Resolve o schema e registra a request."""
         schema_class = self.registry.get(schema_name)
 
         logger.info(
@@ -62,33 +186,161 @@ class ExtractorService:
             text_length=len(text),
             use_cache=use_cache,
         )
+        return schema_class
 
-        # Verificar cache
-        if use_cache:
-            cached = await self.cache.get(text, schema_name)
-            if cached:
-                return cached
+    async def _extract_fresh(
+        self,
+        text: str,
+        schema_name: str,
+        schema_class: type[BaseModel],
+        system_prompt: str | None,
+        *,
+        use_cache: bool,
+        use_negative_cache: bool,
+        deadline: float | None = None,
+        before_llm_call: Callable[[], Awaitable[None]] | None = None,
+    ) -> BaseModel:
+        """Extrai via LLM após um cache miss, mantendo cache e cache negativo."""
+        if use_cache and use_negative_cache:
+            failure = await self.cache.get_failure(text, schema_name)
+            if failure is not None:
+                raise ExtractionError(
+                    f"Falha na extração (em cache negativo): {failure}"
+                )
+
+        if deadline is not None and deadline <= time.monotonic():
+            raise DeadlineExceededError("Deadline esgotado antes da chamada ao LLM")
+
+        # Extrair via LLM; requests idênticas simultâneas compartilham a
+        # chamada, que só é cancelada quando nenhuma delas a espera mais.
+        # O deadline limita só a espera de cada request: a chamada
+        # compartilhada não herda o de quem a iniciou
+        key = (schema_name, system_prompt, use_cache, text)
+        while True:
+            leader = key not in self.flights
+            try:
+                return await self.flights.run(
+                    key,
+                    partial(
+                        self._extract_and_store,
+                        text,
+                        schema_name,
+                        schema_class,
+                        system_prompt,
+                        use_cache=use_cache,
+                        deadline=deadline,
+                        before_llm_call=before_llm_call,
+                    ),
+                    None if deadline is None else deadline - time.monotonic(),
+                )
+            except _PreflightError as e:
+                if leader:
+                    raise e.error from None
+                # Recusa de quem iniciou a chamada não vale para quem se
+                # juntou a ela: tenta de novo com admissão e orçamento próprios
+                continue
+            except Exception as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning("extraction_deadline_exceeded", schema=schema_name)
+                    raise DeadlineExceededError(
+                        f"Deadline esgotado durante a extração: {e!r}"
+                    ) from e
+                logger.error(
+                    "extraction_failed",
+                    schema=schema_name,
+                    error=str(e),
+                )
+                raise ExtractionError(f"Falha na extração: {e}") from e
 
-        # Extrair via LLM
+    async def _extract_and_store(
+        self,
+        text: str,
+        schema_name: str,
+        schema_class: type[BaseModel],
+        system_prompt: str | None,
+        *,
+        use_cache: bool,
+        deadline: float | None,
+        before_llm_call: Callable[[], Awaitable[None]] | None,
+    ) -> BaseModel:
+        """
+        Chamada compartilhada: admite, extrai e grava o resultado (ou a falha).
+
+        A reserva na fila de admissão acontece antes do primeiro ``await`` da
+        task, e o orçamento (``before_llm_call``) só é debitado depois dela,
+        uma vez por chamada ao LLM: quem se junta à chamada não paga.
+        """
+        reserved = self.admission is not None
         try:
-            result = self.client.extract(
-                text=text,
-                response_model=schema_class,
-                system_prompt=system_prompt,
-            )
+            if self.admission is not None:
+                self.admission.reserve(deadline)
         except Exception as e:
-            logger.error(
-                "extraction_failed",
-                schema=schema_name,
-                error=str(e),
+            raise _PreflightError(e) from e
+        try:
+            if before_llm_call is not None:
+                await before_llm_call()
+        except BaseException as e:
+            if self.admission is not None:
+                self.admission.cancel_reservation()
+            if isinstance(e, Exception):
+                raise _PreflightError(e) from e
+            raise
+
+        try:
+            result, elapsed = await self._run_extraction(
+                text, schema_class, system_prompt, reserved=reserved
             )
-            raise ExtractionError(f"Falha na extração: {e}") from e
+        except Exception as e:
+            if use_cache and _is_validation_failure(e):
+                await self.cache.set_failure(text, schema_name, str(e))
+            raise
 
-        # Salvar em cache
         if use_cache:
-            await self.cache.set(text, schema_name, result)
+            await self.cache.set(text, schema_name, result, delta=elapsed)
+        return result
 
-        return result.model_dump()
+    async def _run_extraction(
+        self,
+        text: str,
+        response_model: type[BaseModel],
+        system_prompt: str | None,
+        *,
+        reserved: bool = False,
+    ) -> tuple[BaseModel, float]:
+        """
+        Executa o cliente LLM.
+
+        Com controle de admissão, a chamada espera uma vaga na fila
+        (``reserved``: já contada na fila por ``AdmissionController.reserve``).
+
+        Returns:
+            Resultado validado e tempo gasto em segundos
+        """
+        if self.admission is None:
+            return await self._call_llm(text, response_model, system_prompt)
+
+        async with self.admission.admit(reserved=reserved):
+            return await self._call_llm(text, response_model, system_prompt)
+
+    async def _call_llm(
+        self,
+        text: str,
+        response_model: type[BaseModel],
+        system_prompt: str | None,
+    ) -> tuple[BaseModel, float]:
+        """
+        Chama o cliente LLM, medindo o tempo gasto.
+
+        A chamada é assíncrona: cancelar a task (cliente desconectou)
+        interrompe a request HTTP ao provider e fecha a conexão.
+        """
+        start = time.perf_counter()
+        result = await self.client.extract(
+            text=text,
+            response_model=response_model,
+            system_prompt=system_prompt,
+        )
+        return result, time.perf_counter() - start
 
     def list_schemas(self) -> list[dict[str, Any]]:
         """Lista todos os schemas disponíveis."""
@@ -120,11 +372,7 @@ class ExtractorService:
         )
 
         try:
-            return self.client.extract(
-                text=text,
-                response_model=response_model,
-                system_prompt=system_prompt,
-            )
+            result, _ = await self._run_extraction(text, response_model, system_prompt)
         except Exception as e:
             logger.error(
                 "extraction_failed_direct",
@@ -132,3 +380,5 @@ class ExtractorService:
                 error=str(e),
             )
             raise ExtractionError(f"Falha na extração: {e}") from e
+
+        return result
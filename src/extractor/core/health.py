@@ -0,0 +1,184 @@
+"""
+Probes de dependências em background.
+
+``HealthMonitor`` testa as dependências (Redis, provider LLM, warmup) em
+intervalos fixos, uma de cada vez por probe e com timeout, e guarda o
+último resultado. Os endpoints de health só leem esse resultado: não
+tocam nas dependências, então respondem em O(1) e não somam carga nem
+latência quando uma delas está com problema.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from extractor.config import Settings
+from extractor.core.cache import CacheService
+from extractor.core.instructor_client import InstructorClient
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Probe: retorna detalhes (ou None) se a dependência está OK; falha levantando
+Probe = Callable[[], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """Último resultado de um probe."""
+
+    ok: bool
+    # Epoch do fim do probe (informativo para quem consulta)
+    checked_at: float
+    latency_ms: float
+    details: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+class HealthMonitor:
+    """
+    Executa probes periodicamente e guarda o último resultado de cada um.
+
+    Probes em ``critical`` definem a prontidão: sem resultado ou com falha
+    a instância não está pronta. Os demais só degradam o status (a API
+    continua funcionando sem eles, como o cache).
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Probe],
+        *,
+        critical: frozenset[str] = frozenset(),
+        interval: float = 15.0,
+        timeout: float = 2.0,
+    ) -> None:
+        """Inicializa o monitor sem resultados."""
+        self.probes = probes
+        self.critical = critical
+        self.interval = interval
+        self.timeout = timeout
+        self.results: dict[str, ProbeResult] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Roda a primeira rodada de probes e agenda as seguintes."""
+        await self.run_once()
+        self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        """Para os probes."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> None:
+        """Executa todos os probes em paralelo, cada um com timeout."""
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._run(name) for name in names))
+        for name, result in zip(names, results, strict=True):
+            previous = self.results.get(name)
+            if previous is None or previous.ok != result.ok:
+                log = logger.info if result.ok else logger.warning
+                log(
+                    "health_probe_changed", probe=name, ok=result.ok, error=result.error
+                )
+            self.results[name] = result
+
+    async def _run(self, name: str) -> ProbeResult:
+        """Executa um probe, convertendo timeout e exceções em falha."""
+        start = time.perf_counter()
+        details: dict[str, Any] | None = None
+        error: str | None = None
+        try:
+            async with asyncio.timeout(self.timeout):
+                details = await self.probes[name]()
+        except TimeoutError:
+            error = f"timeout após {self.timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        return ProbeResult(
+            ok=error is None,
+            checked_at=time.time(),
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            details=details or {},
+            error=error,
+        )
+
+    async def _loop(self) -> None:
+        """Repete os probes a cada ``interval`` segundos."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    @property
+    def ready(self) -> bool:
+        """Se já houve uma rodada e todos os probes críticos passaram nela."""
+        return bool(self.results) and all(
+            name in self.results and self.results[name].ok for name in self.critical
+        )
+
+    @property
+    def status(self) -> str:
+        """``ready``, ``degraded`` (probe não crítico falhando) ou ``not_ready``."""
+        if not self.ready:
+            return "not_ready"
+        if any(not result.ok for result in self.results.values()):
+            return "degraded"
+        return "ready"
+
+
+def build_health_monitor(
+    settings: Settings, cache: CacheService, client: InstructorClient
+) -> HealthMonitor:
+    """
+    Monta o monitor com os probes da aplicação.
+
+    Só o ``warmup`` é crítico, e apenas até passar a primeira vez: uma
+    réplica fria fica fora de rotação até carregar o modelo e o Bloom
+    filter. Depois disso falhas só marcam ``degraded``, porque provider
+    LLM e Redis são os mesmos para todas as réplicas, e tirá-las de
+    rotação juntas derrubaria também o que o cache ainda atende.
+
+    - ``llm``: provider acessível e modelo configurado existe.
+    - ``redis``: o cache falha aberto, então Redis fora só degrada.
+    - ``warmup``: modelo carregado em memória (Ollama) e Bloom filter do
+      cache carregado; enquanto isso as primeiras requests são mais lentas.
+    """
+    timeout = settings.health_probe_timeout_seconds
+    warmed = False
+
+    async def redis_probe() -> dict[str, Any]:
+        if not await cache.health_check():
+            raise ConnectionError("Redis inacessível")
+        return {}
+
+    async def llm_probe() -> dict[str, Any]:
+        return await client.check_model(timeout)
+
+    async def warmup_probe() -> dict[str, Any]:
+        nonlocal warmed
+        details: dict[str, Any] = {}
+        loaded = await client.model_loaded(timeout)
+        if loaded is not None:
+            details["model_loaded"] = loaded
+        bloom = cache.bloom_stats()
+        if bloom is not None:
+            details["bloom_filter_ready"] = bloom["ready"]
+        if not all(details.values()) and not warmed:
+            pending = ", ".join(name for name, ok in details.items() if not ok)
+            raise RuntimeError(f"Aquecendo: {pending}")
+        # Modelo descarregado (keep_alive) ou filtro reconstruindo depois do
+        # aquecimento aparecem nos detalhes, sem tirar a réplica de rotação
+        warmed = True
+        return details
+
+    return HealthMonitor(
+        {"redis": redis_probe, "llm": llm_probe, "warmup": warmup_probe},
+        critical=frozenset({"warmup"}),
+        interval=settings.health_probe_interval_seconds,
+        timeout=timeout,
+    )
@@ -0,0 +1,273 @@
+"""
+Idempotency keys para as extrações.
+
+A primeira request com uma ``Idempotency-Key`` grava no Redis um marcador
+"em andamento" (``SET NX``) e, ao terminar, a resposta. Repetições da
+mesma chave (retries após timeout, mensagens reentregues por filas)
+recebem a resposta gravada ou esperam a original terminar, sem chamar o
+LLM de novo. Independe do cache de extrações: vale também com
+``use_cache=false`` ou ``system_prompt`` customizado.
+
+Se o Redis falhar, as requests seguem sem garantia de idempotência
+(fail-open), com circuit breaker para não pagar o timeout a cada request.
+"""
+
+import asyncio
+import hashlib
+import json
+import secrets
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import redis.asyncio as redis
+
+from extractor.config import Settings
+from extractor.core.circuit_breaker import CircuitBreaker
+from extractor.core.sharding import close_client
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "idempotency"
+
+# Remove o marcador só se ainda for do mesmo dono (o lock pode ter expirado)
+_RELEASE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and cjson.decode(current)['token'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Status que não são gravados: a repetição deve tentar de novo
+_TRANSIENT_STATUS = frozenset({408, 409, 425, 429})
+
+
+class IdempotencyMismatchError(Exception):
+    """Chave reutilizada com outro corpo de request."""
+
+
+class IdempotencyInProgressError(Exception):
+    """A request original não terminou dentro do tempo de espera."""
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    """Resposta gravada para uma chave."""
+
+    status: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def replayable(self) -> bool:
+        """Se a resposta é definitiva (erros transitórios não são gravados)."""
+        return self.status < 500 and self.status not in _TRANSIENT_STATUS
+
+
+@dataclass(frozen=True, slots=True)
+class Claim:
+    """Resultado de reivindicar uma chave."""
+
+    key: str
+    fingerprint: str
+    # Dono do marcador "em andamento" (None: Redis indisponível)
+    token: str | None = None
+    # Resposta já gravada para a chave
+    replay: StoredResponse | None = None
+
+
+def fingerprint(payload: bytes | str) -> str:
+    """Hash do corpo da request, para detectar reuso da chave com outro corpo."""
+    data = payload.encode() if isinstance(payload, str) else payload
+    return hashlib.sha256(data).hexdigest()
+
+
+class IdempotencyStore:
+    """Marcadores e respostas de idempotency keys no Redis."""
+
+    def __init__(
+        self,
+        client: "redis.Redis[str]",
+        *,
+        ttl: float = 86_400,
+        lock_ttl: float = 300,
+        wait: float = 30,
+        poll_interval: float = 0.05,
+        failure_threshold: int = 5,
+        cooldown: float = 10.0,
+        prefix: str = KEY_PREFIX,
+    ) -> None:
+        """Inicializa o store sobre um cliente Redis."""
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._redis = client
+        self._release = client.register_script(_RELEASE_SCRIPT)
+        self._breaker = CircuitBreaker(
+            "idempotency_redis",
+            probe=self._ping,
+            failure_threshold=failure_threshold,
+            cooldown=cooldown,
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "IdempotencyStore":
+        """Cria store com conexão própria ao Redis."""
+        url = settings.idempotency_redis_url or settings.redis_url
+        client: redis.Redis[str] = redis.from_url(
+            str(url),
+            encoding="utf-8",
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_connect_timeout,
+        )
+        return cls(
+            client,
+            ttl=settings.idempotency_ttl_seconds,
+            lock_ttl=settings.idempotency_lock_seconds,
+            wait=settings.idempotency_wait_seconds,
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            cooldown=settings.redis_breaker_cooldown_seconds,
+        )
+
+    def _key(self, key: str) -> str:
+        """Chave no Redis (a chave do cliente entra só como hash)."""
+        return f"{self.prefix}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    @asynccontextmanager
+    async def claim(
+        self, key: str, fingerprint: str, timeout: float | None = None
+    ) -> AsyncIterator[Claim]:
+        """
+        Reivindica a chave ou obtém a resposta já gravada.
+
+        Sem ``replay``, o chamador é o dono e deve chamar ``save``; se sair
+        com exceção (inclusive cancelamento), o marcador é removido para
+        que uma repetição possa executar.
+
+        Args:
+            key: Idempotency key (já com o escopo do cliente)
+            fingerprint: Hash do corpo da request
+            timeout: Espera máxima pela request original (padrão: ``wait``)
+
+        Raises:
+            IdempotencyMismatchError: Chave usada antes com outro corpo
+            IdempotencyInProgressError: Original ainda em andamento
+        """
+        claim = await self._acquire(key, fingerprint, timeout)
+        try:
+            yield claim
+        except BaseException:
+            if claim.token is not None:
+                await self.release(claim)
+            raise
+
+    async def _acquire(
+        self, key: str, fingerprint: str, timeout: float | None
+    ) -> Claim:
+        """Tenta gravar o marcador; se já existir, espera a resposta."""
+        redis_key = self._key(key)
+        deadline = time.monotonic() + (self.wait if timeout is None else timeout)
+        interval = self.poll_interval
+
+        while True:
+            if not self._breaker.allow():
+                return Claim(key, fingerprint)
+
+            token = secrets.token_hex(8)
+            marker = json.dumps(
+                {"state": "pending", "fingerprint": fingerprint, "token": token}
+            )
+            try:
+                if await self._redis.set(
+                    redis_key, marker, nx=True, ex=int(self.lock_ttl)
+                ):
+                    self._breaker.record_success()
+                    return Claim(key, fingerprint, token=token)
+                raw = await self._redis.get(redis_key)
+                self._breaker.record_success()
+            except redis.RedisError as e:
+                self._breaker.record_failure()
+                logger.warning("idempotency_redis_error", error=str(e))
+                return Claim(key, fingerprint)
+
+            # Marcador removido entre o SET e o GET: tenta de novo
+            if raw is not None:
+                stored = json.loads(raw)
+                if stored["fingerprint"] != fingerprint:
+                    raise IdempotencyMismatchError(
+                        "Idempotency-Key já usada com outro corpo de request"
+                    )
+                if stored["state"] == "done":
+                    logger.info("idempotency_replay", status=stored["status"])
+                    return Claim(
+                        key,
+                        fingerprint,
+                        replay=StoredResponse(
+                            status=stored["status"],
+                            body=stored["body"].encode(),
+                            headers=stored["headers"],
+                        ),
+                    )
+
+                if time.monotonic() + interval > deadline:
+                    raise IdempotencyInProgressError(
+                        "Request com esta Idempotency-Key ainda em andamento"
+                    )
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, 1.0)
+
+    async def save(self, claim: Claim, response: StoredResponse) -> None:
+        """
+        Grava a resposta da chave (dono) por ``ttl`` segundos.
+
+        Respostas transitórias (5xx, 429, ...) não são gravadas: o marcador
+        é removido e a repetição executa de novo.
+        """
+        if claim.token is None:
+            return
+        if not response.replayable:
+            await self.release(claim)
+            return
+
+        stored = json.dumps(
+            {
+                "state": "done",
+                "fingerprint": claim.fingerprint,
+                "status": response.status,
+                "body": response.body.decode(),
+                "headers": response.headers,
+            }
+        )
+        try:
+            await self._redis.set(self._key(claim.key), stored, ex=int(self.ttl))
+        except redis.RedisError as e:
+            self._breaker.record_failure()
+            logger.warning("idempotency_redis_error", error=str(e))
+
+    async def release(self, claim: Claim) -> None:
+        """Remove o marcador "em andamento" do dono."""
+        if claim.token is None:
+            return
+        try:
+            await self._release(keys=[self._key(claim.key)], args=[claim.token])
+        except redis.RedisError as e:
+            self._breaker.record_failure()
+            logger.warning("idempotency_redis_error", error=str(e))
+
+    async def _ping(self) -> bool:
+        """Probe do circuit breaker."""
+        try:
+            return bool(await self._redis.ping())
+        except redis.RedisError:
+            return False
+
+    async def close(self) -> None:
+        """Fecha a conexão."""
+        await self._breaker.close()
+        await close_client(self._redis)
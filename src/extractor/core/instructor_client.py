@@ -1,9 +1,10 @@
 """Cliente LLM configurado com Instructor - Suporte Ollama/OpenAI/Anthropic."""
 
-from typing import TypeVar
+from typing import Any, TypeVar
 
+import httpx
 import instructor
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
 from extractor.config import Settings, get_settings
@@ -19,6 +20,8 @@ class InstructorClient:
     def __init__(self, settings: Settings | None = None) -> None:
         """Inicializa o cliente."""
         self.settings = settings or get_settings()
+        # Cliente do provider (OpenAI/Anthropic), usado também pelos probes
+        self._provider: Any = None
         self._client = self._create_client()
         logger.info(
             "instructor_client_initialized",
@@ -26,29 +29,81 @@ class InstructorClient:
             model=self.settings.active_model,
         )
 
-    def _create_client(self) -> instructor.Instructor:
-        """Cria cliente baseado no provider configurado."""
+    def _create_client(self) -> instructor.AsyncInstructor:
+        """
+        Cria cliente assíncrono baseado no provider configurado.
+
+        Com o cliente assíncrono, cancelar a extração (cliente da API
+        desconectou) aborta a request HTTP ao provider e fecha a conexão,
+        em vez de deixar a geração e os retries rodando numa thread.
+        """
         if self.settings.llm_provider == "ollama":
             # Ollama usa API compatível com OpenAI
-            base_client = OpenAI(
+            base_client = AsyncOpenAI(
                 base_url=f"{self.settings.ollama_base_url}/v1",
                 api_key="ollama",
                 timeout=self.settings.ollama_timeout,
             )
+            self._provider = base_client
             return instructor.from_openai(
                 base_client,
                 mode=instructor.Mode.JSON,
             )
 
         elif self.settings.llm_provider == "openai":
-            return instructor.from_openai(OpenAI(api_key=self.settings.openai_api_key))
+            openai_client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+            self._provider = openai_client
+            return instructor.from_openai(openai_client)
 
         else:
-            from anthropic import Anthropic
+            from anthropic import AsyncAnthropic
 
-            return instructor.from_anthropic(
-                Anthropic(api_key=self.settings.anthropic_api_key)
-            )
+            anthropic_client = AsyncAnthropic(api_key=self.settings.anthropic_api_key)
+            self._provider = anthropic_client
+            return instructor.from_anthropic(anthropic_client)
+
+    async def check_model(self, timeout: float) -> dict[str, Any]:
+        """
+        Verifica se o provider responde e conhece o modelo configurado.
+
+        Consulta só os metadados do modelo (``GET /models/{id}``), sem
+        gerar tokens e sem retries.
+
+        Raises:
+            Exception: Provider inacessível ou modelo inexistente
+        """
+        details: dict[str, Any] = {
+            "provider": self.settings.llm_provider,
+            "model": self.settings.active_model,
+        }
+        provider = self._provider.with_options(timeout=timeout, max_retries=0)
+        models = getattr(provider, "models", None)
+        if models is None:
+            # SDK sem a API de modelos (anthropic < 0.40): não há consulta
+            # que não gere tokens, então o modelo não é verificado
+            return {**details, "verified": False}
+
+        await models.retrieve(self.settings.active_model)
+        return {**details, "verified": True}
+
+    async def model_loaded(self, timeout: float) -> bool | None:
+        """
+        Indica se o modelo já está carregado em memória.
+
+        Só o Ollama carrega o modelo sob demanda (``GET /api/ps``); nos
+        providers de nuvem retorna None.
+        """
+        if self.settings.llm_provider != "ollama":
+            return None
+
+        async with httpx.AsyncClient(timeout=timeout) as http:
+            response = await http.get(f"{self.settings.ollama_base_url}/api/ps")
+            response.raise_for_status()
+        model = self.settings.active_model
+        return any(
+            entry.get("name") in (model, f"{model}:latest")
+            for entry in response.json().get("models", [])
+        )
 
     def _get_system_prompt(self, custom_prompt: str | None = None) -> str:
         """Retorna system prompt otimizado para extração."""
@@ -69,7 +124,7 @@ Seja preciso e objetivo."""
             return f"{default_prompt}\n\nInstruções adicionais:\n{custom_prompt}"
         return default_prompt
 
-    def extract(
+    async def extract(
         self,
         text: str,
         response_model: type[T],
@@ -109,7 +164,7 @@ Seja preciso e objetivo."""
         )
 
         try:
-            result: T = self._client.chat.completions.create(
+            result: T = await self._client.chat.completions.create(
                 model=self.settings.active_model,
                 messages=messages,  # type: ignore[arg-type]
                 response_model=response_model,
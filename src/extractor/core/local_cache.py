@@ -0,0 +1,140 @@
+"""Cache local persistente em SQLite, usado junto ou no lugar do Redis."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Máximo de escritas entre avaliações de limpeza de expirados/excedentes
+_EVICTION_CHECK_INTERVAL = 500
+
+# Fração do limite mantida após uma eviction (evita evictar a cada escrita)
+_EVICTION_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+"""
+
+
+class LocalCache:
+    """
+    Cache chave/valor em disco (SQLite em modo WAL, memory-mapped).
+
+    Mantém o hit rate de um nó único durante quedas e reinícios do Redis.
+    O tamanho é limitado a ``max_entries``: quando excedido, as entradas
+    mais próximas de expirar são removidas primeiro. As operações rodam em
+    thread para não bloquear o event loop.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000) -> None:
+        """Inicializa o cache (a conexão é aberta em ``open``)."""
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._check_interval = max(1, min(_EVICTION_CHECK_INTERVAL, max_entries // 10))
+
+    def open(self) -> None:
+        """Abre (ou cria) o banco."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        logger.info("local_cache_opened", path=str(self.path))
+
+    def close(self) -> None:
+        """Fecha o banco."""
+        if self._conn:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+            logger.info("local_cache_closed")
+
+    async def get(self, key: str) -> str | None:
+        """Busca valor não expirado."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Armazena valor com TTL em segundos."""
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        """Remove uma chave."""
+        return await asyncio.to_thread(self._delete, key)
+
+    async def purge_prefix(self, prefix: str) -> int:
+        """Remove todas as chaves que começam com o prefixo."""
+        return await asyncio.to_thread(self._purge_prefix, prefix)
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            if not self._conn:
+                return None
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            if not self._conn:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self._check_interval == 0:
+                self._evict()
+
+    def _delete(self, key: str) -> bool:
+        with self._lock:
+            if not self._conn:
+                return False
+            cursor = self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _purge_prefix(self, prefix: str) -> int:
+        with self._lock:
+            if not self._conn:
+                return 0
+            # Intervalo na chave primária: usa o índice e dispensa escapar LIKE
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE key >= ? AND key < ?",
+                (prefix, prefix + "\uffff"),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _evict(self) -> None:
+        """Remove expirados e, se preciso, as entradas mais próximas de expirar."""
+        assert self._conn is not None
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - int(self.max_entries * _EVICTION_TARGET_RATIO)
+        if count > self.max_entries and excess > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY expires_at LIMIT ?)",
+                (excess,),
+            )
+            logger.info("local_cache_evicted", count=excess)
+        self._conn.commit()
@@ -0,0 +1,294 @@
+"""Rate limiting por cliente."""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+import redis.asyncio as redis
+
+from extractor.config import Settings
+from extractor.core.circuit_breaker import CircuitBreaker
+from extractor.core.sharding import close_client
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "ratelimit"
+TOKENS_KEY_PREFIX = f"{KEY_PREFIX}:tokens"
+
+# GCRA atômico. TAT (theoretical arrival time) em ms, relógio do Redis.
+# KEYS[1]: chave do cliente
+# ARGV: intervalo de emissão (ms por unidade), tolerância de rajada (ms), custo
+# Retorna {permitido, restante, retry_after_ms}
+_GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission * cost
+local diff = now - (new_tat - tolerance)
+
+if diff < 0 then
+    local remaining = math.floor((now - (tat - tolerance)) / emission)
+    return {0, math.max(remaining, 0), math.ceil(-diff)}
+end
+
+-- Custo 0 só consulta o saldo
+if new_tat > now then
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+end
+return {1, math.floor(diff / emission), 0}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """Resultado da consulta ao limitador."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """``retry_after`` arredondado para cima (header ``Retry-After``)."""
+        return max(1, math.ceil(round(self.retry_after, 3)))
+
+
+class RateLimiter(Protocol):
+    """Interface comum dos limitadores usados pelo middleware."""
+
+    limit: int
+
+    async def check(self, client: str, cost: float = 1.0) -> RateLimitDecision:
+        """Consome ``cost`` unidades da cota do cliente, se houver saldo."""
+        ...
+
+    async def close(self) -> None:
+        """Libera recursos (conexões, tasks)."""
+        ...
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Estado de um cliente: tokens disponíveis e instante da última conta."""
+
+    tokens: float
+    updated: float
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket em memória com estado fixo por cliente.
+
+    Cada cliente tem até ``limit`` tokens, repostos continuamente à taxa
+    ``limit / window`` por segundo. O custo de cada consulta é O(1) e o
+    estado por cliente são dois floats.
+
+    Buckets parados há mais de ``window`` segundos estão cheios, ou seja,
+    iguais a um bucket novo; são removidos a cada ``evict_interval``
+    segundos sem alterar o comportamento.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        evict_interval: float = 60.0,
+    ) -> None:
+        """Inicializa limitador vazio."""
+        self.limit = limit
+        self.window = window
+        self.rate = limit / window
+        self.evict_interval = evict_interval
+        self._buckets: dict[str, _Bucket] = {}
+        self._next_eviction: float | None = None
+
+    def __len__(self) -> int:
+        """Clientes com estado em memória."""
+        return len(self._buckets)
+
+    def acquire(
+        self, client: str, cost: float = 1.0, now: float | None = None
+    ) -> RateLimitDecision:
+        """Consome ``cost`` tokens do cliente, se houver saldo."""
+        now = time.monotonic() if now is None else now
+        if self._next_eviction is None:
+            self._next_eviction = now + self.evict_interval
+        elif now >= self._next_eviction:
+            self.evict_idle(now)
+
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = _Bucket(float(self.limit), now)
+        else:
+            bucket.tokens = min(
+                self.limit, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+
+        if bucket.tokens < cost:
+            return RateLimitDecision(
+                allowed=False,
+                limit=self.limit,
+                remaining=int(bucket.tokens),
+                retry_after=(cost - bucket.tokens) / self.rate,
+            )
+
+        bucket.tokens -= cost
+        return RateLimitDecision(
+            allowed=True, limit=self.limit, remaining=int(bucket.tokens)
+        )
+
+    async def check(self, client: str, cost: float = 1.0) -> RateLimitDecision:
+        """Versão assíncrona de ``acquire`` (interface ``RateLimiter``)."""
+        return self.acquire(client, cost)
+
+    async def close(self) -> None:
+        """Nada a liberar."""
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """
+        Remove clientes cujo bucket já encheu de novo.
+
+        Returns:
+            Número de clientes removidos
+        """
+        now = time.monotonic() if now is None else now
+        idle = [
+            client
+            for client, bucket in self._buckets.items()
+            if now - bucket.updated >= self.window
+        ]
+        for client in idle:
+            del self._buckets[client]
+        self._next_eviction = now + self.evict_interval
+        return len(idle)
+
+
+class RedisRateLimiter:
+    """
+    Rate limiting compartilhado entre workers e réplicas (GCRA no Redis).
+
+    Equivalente a um token bucket de ``limit`` unidades reposto ao longo de
+    ``window`` segundos, calculado por um script Lua atômico com o relógio
+    do Redis. Cada cliente ocupa uma chave com TTL igual ao tempo até o
+    bucket encher de novo.
+
+    Se o Redis falhar, usa um ``TokenBucketLimiter`` local (limite por
+    processo) e um circuit breaker evita pagar o timeout a cada request.
+    """
+
+    def __init__(
+        self,
+        client: "redis.Redis[str]",
+        limit: int,
+        window: float,
+        *,
+        failure_threshold: int = 5,
+        cooldown: float = 10.0,
+        prefix: str = KEY_PREFIX,
+    ) -> None:
+        """Inicializa o limitador sobre um cliente Redis."""
+        self.limit = limit
+        self.window = window
+        self.prefix = prefix
+        self._redis = client
+        self._script = client.register_script(_GCRA_SCRIPT)
+        self._emission_ms = window * 1000 / limit
+        self._fallback = TokenBucketLimiter(limit, window)
+        self._breaker = CircuitBreaker(
+            "rate_limit_redis",
+            probe=self._ping,
+            failure_threshold=failure_threshold,
+            cooldown=cooldown,
+        )
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        limit: int | None = None,
+        prefix: str = KEY_PREFIX,
+    ) -> "RedisRateLimiter":
+        """Cria limitador com conexão própria ao Redis."""
+        url = settings.rate_limit_redis_url or settings.redis_url
+        client: redis.Redis[str] = redis.from_url(
+            str(url),
+            encoding="utf-8",
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_connect_timeout,
+        )
+        return cls(
+            client,
+            limit or settings.rate_limit_requests,
+            settings.rate_limit_window_seconds,
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            cooldown=settings.redis_breaker_cooldown_seconds,
+            prefix=prefix,
+        )
+
+    async def check(self, client: str, cost: float = 1.0) -> RateLimitDecision:
+        """Consome ``cost`` unidades da cota compartilhada do cliente."""
+        if not self._breaker.allow():
+            return self._fallback.acquire(client, cost)
+
+        try:
+            allowed, remaining, retry_after_ms = await self._script(
+                keys=[f"{self.prefix}:{client}"],
+                args=[self._emission_ms, self.window * 1000, cost],
+            )
+            self._breaker.record_success()
+        except redis.RedisError as e:
+            self._breaker.record_failure()
+            logger.warning("rate_limit_redis_error", error=str(e))
+            return self._fallback.acquire(client, cost)
+
+        return RateLimitDecision(
+            allowed=bool(allowed),
+            limit=self.limit,
+            remaining=int(remaining),
+            retry_after=int(retry_after_ms) / 1000,
+        )
+
+    async def _ping(self) -> bool:
+        """Probe do circuit breaker."""
+        try:
+            return bool(await self._redis.ping())
+        except redis.RedisError:
+            return False
+
+    async def close(self) -> None:
+        """Fecha a conexão."""
+        await self._breaker.close()
+        await close_client(self._redis)
+
+
+def build_rate_limiter(
+    settings: Settings,
+    limit: int | None = None,
+    prefix: str = KEY_PREFIX,
+) -> RateLimiter:
+    """
+    Cria o limitador configurado em ``rate_limit_backend``.
+
+    Args:
+        settings: Configurações
+        limit: Cota por janela (padrão: ``rate_limit_requests``)
+        prefix: Prefixo das chaves no Redis, distinto para cada cota
+    """
+    limit = limit or settings.rate_limit_requests
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimiter.from_settings(settings, limit, prefix)
+    return TokenBucketLimiter(limit, settings.rate_limit_window_seconds)
@@ -0,0 +1,346 @@
+"""Distribuição do cache entre vários Redis (sharding e réplicas de leitura)."""
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from typing import Any, cast
+
+import redis.asyncio as redis
+
+from extractor.config import RedisShard
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Pontos por shard no anel: suaviza a distribuição das chaves
+_VIRTUAL_NODES = 160
+
+
+def _hash(value: str) -> int:
+    """Hash estável de 64 bits (não depende de PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
+
+
+async def close_client(client: "redis.Redis[Any] | redis.client.PubSub") -> None:
+    """
+    Fecha um cliente (ou PubSub) do ``redis.asyncio`` com ``aclose()``.
+
+    ``close()`` está depreciado desde o redis 5, mas os stubs do
+    ``types-redis`` ainda não declaram ``aclose()``.
+    """
+    await cast("Any", client).aclose()
+
+
+class HashRing:
+    """
+    Anel de hashing consistente.
+
+    Cada nó ocupa ``vnodes`` posições derivadas do seu nome; uma chave
+    pertence ao primeiro nó no sentido horário. Adicionar ou remover um nó
+    move apenas ~1/N das chaves.
+    """
+
+    def __init__(self, nodes: Sequence[str], vnodes: int = _VIRTUAL_NODES) -> None:
+        """Monta o anel."""
+        if not nodes:
+            raise ValueError("HashRing precisa de ao menos um nó")
+        points = sorted(
+            (_hash(f"{node}#{i}"), index)
+            for index, node in enumerate(nodes)
+            for i in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [index for _, index in points]
+
+    def node_for(self, key: str) -> int:
+        """Índice do nó responsável pela chave."""
+        pos = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[pos]
+
+
+class Shard:
+    """Primário de um shard e suas réplicas de leitura (round-robin)."""
+
+    def __init__(
+        self, primary: "redis.Redis[str]", replicas: Sequence["redis.Redis[str]"] = ()
+    ) -> None:
+        """Inicializa o shard."""
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._next_replica = itertools.cycle(self.replicas)
+
+    def reader(self) -> "redis.Redis[str]":
+        """Cliente para leitura: próxima réplica, ou o primário."""
+        return next(self._next_replica) if self.replicas else self.primary
+
+    def clients(self) -> list["redis.Redis[str]"]:
+        """Todos os clientes do shard."""
+        return [self.primary, *self.replicas]
+
+
+class ShardedRedis:
+    """
+    Cliente que distribui as chaves entre vários Redis primários.
+
+    Expõe o subconjunto da API de ``redis.asyncio.Redis`` usado pelo
+    ``CacheService``. Leituras (GET, MGET, EXISTS) vão para as réplicas do
+    shard quando houver, com fallback para o primário em erro; escritas,
+    SCAN e pipelines vão para os primários. Pub/sub usa o primeiro shard.
+    """
+
+    def __init__(self, shards: Sequence[Shard], names: Sequence[str]) -> None:
+        """Inicializa com shards já conectados (``names`` define o anel)."""
+        self.shards = list(shards)
+        self._ring = HashRing(names)
+
+    @classmethod
+    def from_topology(
+        cls, topology: Sequence[RedisShard], **kwargs: Any
+    ) -> "ShardedRedis":
+        """Cria os clientes a partir da topologia configurada."""
+        shards = [
+            Shard(
+                redis.from_url(str(shard.url), **kwargs),
+                [redis.from_url(str(url), **kwargs) for url in shard.replicas],
+            )
+            for shard in topology
+        ]
+        return cls(shards, [str(shard.url) for shard in topology])
+
+    def shard_index(self, key: str) -> int:
+        """Índice do shard da chave."""
+        return self._ring.node_for(key)
+
+    def group(self, keys: Iterable[str]) -> dict[int, list[str]]:
+        """Agrupa chaves por shard."""
+        groups: defaultdict[int, list[str]] = defaultdict(list)
+        for key in keys:
+            groups[self.shard_index(key)].append(key)
+        return groups
+
+    async def _read(self, key: str, command: str) -> Any:
+        """Executa leitura na réplica, caindo para o primário em erro."""
+        shard = self.shards[self.shard_index(key)]
+        if shard.replicas:
+            try:
+                return await getattr(shard.reader(), command)(key)
+            except redis.RedisError as e:
+                logger.warning("redis_replica_error", command=command, error=str(e))
+        return await getattr(shard.primary, command)(key)
+
+    async def get(self, key: str) -> str | None:
+        """GET no shard da chave."""
+        result: str | None = await self._read(key, "get")
+        return result
+
+    async def exists(self, key: str) -> int:
+        """EXISTS no shard da chave."""
+        return int(await self._read(key, "exists"))
+
+    async def mget(self, keys: Sequence[str]) -> list[str | None]:
+        """MGET dividido por shard, na ordem das chaves."""
+        groups = self.group(keys)
+
+        async def read(index: int, shard_keys: list[str]) -> list[str | None]:
+            shard = self.shards[index]
+            if shard.replicas:
+                try:
+                    return list(await shard.reader().mget(shard_keys))
+                except redis.RedisError as e:
+                    logger.warning("redis_replica_error", command="mget", error=str(e))
+            return list(await shard.primary.mget(shard_keys))
+
+        results = await asyncio.gather(
+            *(read(index, shard_keys) for index, shard_keys in groups.items())
+        )
+        found: dict[str, str | None] = {}
+        for shard_keys, values in zip(groups.values(), results, strict=True):
+            found.update(zip(shard_keys, values, strict=True))
+        return [found[key] for key in keys]
+
+    async def set(self, key: str, value: str, **kwargs: Any) -> Any:
+        """SET no primário do shard."""
+        return await self.shards[self.shard_index(key)].primary.set(
+            key, value, **kwargs
+        )
+
+    async def setex(self, key: str, ttl: int, value: str) -> Any:
+        """SETEX no primário do shard."""
+        return await self.shards[self.shard_index(key)].primary.setex(key, ttl, value)
+
+    async def delete(self, *keys: str) -> int:
+        """DEL agrupado por shard."""
+        return await self._fan_out_keys("delete", keys)
+
+    async def unlink(self, *keys: str) -> int:
+        """UNLINK agrupado por shard."""
+        return await self._fan_out_keys("unlink", keys)
+
+    async def _fan_out_keys(self, command: str, keys: Sequence[str]) -> int:
+        """Executa comando multi-chave em cada shard e soma os resultados."""
+        results = await asyncio.gather(
+            *(
+                getattr(self.shards[index].primary, command)(*shard_keys)
+                for index, shard_keys in self.group(keys).items()
+            )
+        )
+        return sum(int(n) for n in results)
+
+    async def scan_iter(
+        self, match: str | None = None, count: int | None = None
+    ) -> AsyncIterator[str]:
+        """SCAN em cada primário, um após o outro."""
+        for shard in self.shards:
+            async for key in shard.primary.scan_iter(match=match, count=count):
+                yield key
+
+    async def dbsize(self) -> int:
+        """Soma de DBSIZE dos primários."""
+        sizes = await asyncio.gather(*(s.primary.dbsize() for s in self.shards))
+        return sum(sizes)
+
+    async def ping(self) -> bool:
+        """PING em todos os primários (erro se algum estiver fora)."""
+        results = await asyncio.gather(*(s.primary.ping() for s in self.shards))
+        return all(results)
+
+    async def publish(self, channel: str, message: str) -> int:
+        """PUBLISH no primeiro shard."""
+        return int(await self.shards[0].primary.publish(channel, message))
+
+    def pubsub(self) -> Any:
+        """Pub/sub do primeiro shard."""
+        return self.shards[0].primary.pubsub()
+
+    def pipeline(self, transaction: bool = False) -> "ShardedPipeline":
+        """Pipeline que envia um pipeline por shard."""
+        if transaction:
+            raise ValueError("ShardedRedis não suporta transações entre shards")
+        return ShardedPipeline(self)
+
+    async def aclose(self) -> None:
+        """Fecha todos os clientes."""
+        await asyncio.gather(
+            *(
+                close_client(client)
+                for shard in self.shards
+                for client in shard.clients()
+            )
+        )
+
+
+# Parte de um comando enfileirado: (shard, comando, args, kwargs)
+_Part = tuple[int, str, tuple[Any, ...], dict[str, Any]]
+
+
+class ShardedPipeline:
+    """
+    Pipeline sobre vários shards.
+
+    Cada comando vira uma ou mais partes (comandos multi-chave são divididos
+    por shard); ``execute`` roda um pipeline por shard em paralelo e devolve
+    os resultados na ordem em que os comandos foram enfileirados.
+    """
+
+    def __init__(self, sharded: ShardedRedis) -> None:
+        """Inicializa pipeline vazio."""
+        self._sharded = sharded
+        self._commands: list[tuple[list[_Part], Callable[[list[Any]], Any]]] = []
+
+    def _keyed(self, command: str, key: str, *args: Any, **kwargs: Any) -> None:
+        """Enfileira comando de uma chave no shard dela."""
+        index = self._sharded.shard_index(key)
+        self._commands.append(
+            ([(index, command, (key, *args), kwargs)], lambda results: results[0])
+        )
+
+    def _multi(self, command: str, keys: Sequence[str]) -> None:
+        """Enfileira comando multi-chave dividido por shard (resultado somado)."""
+        parts: list[_Part] = [
+            (index, command, tuple(shard_keys), {})
+            for index, shard_keys in self._sharded.group(keys).items()
+        ]
+        self._commands.append((parts, lambda results: sum(int(n) for n in results)))
+
+    def get(self, key: str) -> "ShardedPipeline":
+        """GET."""
+        self._keyed("get", key)
+        return self
+
+    def set(self, key: str, value: str, **kwargs: Any) -> "ShardedPipeline":
+        """SET."""
+        self._keyed("set", key, value, **kwargs)
+        return self
+
+    def setex(self, key: str, ttl: int, value: str) -> "ShardedPipeline":
+        """SETEX."""
+        self._keyed("setex", key, ttl, value)
+        return self
+
+    def exists(self, key: str) -> "ShardedPipeline":
+        """EXISTS."""
+        self._keyed("exists", key)
+        return self
+
+    def ttl(self, key: str) -> "ShardedPipeline":
+        """TTL."""
+        self._keyed("ttl", key)
+        return self
+
+    def pttl(self, key: str) -> "ShardedPipeline":
+        """PTTL."""
+        self._keyed("pttl", key)
+        return self
+
+    def memory_usage(self, key: str) -> "ShardedPipeline":
+        """MEMORY USAGE."""
+        self._keyed("memory_usage", key)
+        return self
+
+    def delete(self, *keys: str) -> "ShardedPipeline":
+        """DEL."""
+        self._multi("delete", keys)
+        return self
+
+    def unlink(self, *keys: str) -> "ShardedPipeline":
+        """UNLINK."""
+        self._multi("unlink", keys)
+        return self
+
+    def publish(self, channel: str, message: str) -> "ShardedPipeline":
+        """PUBLISH (no primeiro shard, como ``ShardedRedis.publish``)."""
+        self._commands.append(
+            ([(0, "publish", (channel, message), {})], lambda results: results[0])
+        )
+        return self
+
+    async def execute(self) -> list[Any]:
+        """Executa os pipelines dos shards e remonta os resultados."""
+        pipes: dict[int, Any] = {}
+        slots: list[list[tuple[int, int]]] = []
+        sizes: defaultdict[int, int] = defaultdict(int)
+
+        for parts, _ in self._commands:
+            command_slots = []
+            for index, command, args, kwargs in parts:
+                if index not in pipes:
+                    pipes[index] = self._sharded.shards[index].primary.pipeline(
+                        transaction=False
+                    )
+                getattr(pipes[index], command)(*args, **kwargs)
+                command_slots.append((index, sizes[index]))
+                sizes[index] += 1
+            slots.append(command_slots)
+
+        outputs = await asyncio.gather(*(pipe.execute() for pipe in pipes.values()))
+        by_shard = dict(zip(pipes.keys(), outputs, strict=True))
+
+        results = [
+            merge([by_shard[index][pos] for index, pos in command_slots])
+            for (_, merge), command_slots in zip(self._commands, slots, strict=True)
+        ]
+        self._commands = []
+        return results
@@ -0,0 +1,112 @@
+"""
+Coalescência de chamadas idênticas ao LLM (single-flight).
+
+Extrações simultâneas do mesmo texto/schema compartilham uma única chamada
+ao provider. Cada request apenas espera o resultado; a chamada só é
+cancelada quando a última request interessada desiste (cliente
+desconectou ou deadline venceu), e o tempo de geração descartado é
+contabilizado.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from extractor.utils.logging import get_logger
+
+R = TypeVar("R")
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Flight:
+    """Chamada em andamento e quantas requests a esperam."""
+
+    task: asyncio.Task[Any]
+    started: float = field(default_factory=time.monotonic)
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Registro das chamadas ao LLM em andamento no processo."""
+
+    def __init__(self) -> None:
+        """Inicializa sem chamadas em andamento."""
+        self._flights: dict[Hashable, _Flight] = {}
+        # Requests que reaproveitaram uma chamada já em andamento
+        self.shared = 0
+        # Chamadas canceladas por falta de interessados e o tempo de
+        # geração já gasto nelas
+        self.cancelled = 0
+        self.wasted_seconds = 0.0
+
+    def __len__(self) -> int:
+        """Número de chamadas em andamento."""
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Se há chamada em andamento para ``key``."""
+        flight = self._flights.get(key)
+        return flight is not None and not flight.task.done()
+
+    async def run(
+        self,
+        key: Hashable,
+        func: Callable[[], Coroutine[Any, Any, R]],
+        timeout: float | None = None,
+    ) -> R:
+        """
+        Executa ``func`` ou se junta à execução em andamento para ``key``.
+
+        Args:
+            key: Identifica chamadas equivalentes
+            func: Fábrica da chamada (só usada se não houver outra em curso)
+            timeout: Quanto esta request aceita esperar (segundos)
+
+        Raises:
+            TimeoutError: ``timeout`` venceu (a chamada segue se houver
+                outros interessados)
+        """
+        flight = self._flights.get(key)
+        # Chamada concluída cujo callback de remoção ainda não rodou
+        if flight is None or flight.task.done():
+            flight = _Flight(asyncio.create_task(func()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            if timeout is None:
+                return await asyncio.shield(flight.task)
+            return await asyncio.wait_for(asyncio.shield(flight.task), timeout)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                self._abandon(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        """Remove a chamada do registro (se ainda for a atual da chave)."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _abandon(self, key: Hashable, flight: _Flight) -> None:
+        """Cancela uma chamada que ninguém mais espera."""
+        self._forget(key, flight)
+        flight.task.cancel()
+        elapsed = time.monotonic() - flight.started
+        self.cancelled += 1
+        self.wasted_seconds += elapsed
+        logger.info("llm_call_cancelled", elapsed_ms=round(elapsed * 1000, 1))
+
+    def counters(self) -> dict[str, float]:
+        """Contadores de coalescência e cancelamento."""
+        return {
+            "in_flight": len(self._flights),
+            "shared": self.shared,
+            "cancelled": self.cancelled,
+            "wasted_seconds": round(self.wasted_seconds, 3),
+        }
@@ -0,0 +1,96 @@
+"""
+Snapshot do cache em arquivo, para aquecer ambientes novos.
+
+Formato: JSON Lines comprimido com gzip. A primeira linha é o cabeçalho
+(``format``, ``version``, ``exported_at``); as demais são entradas
+``{"key", "value", "ttl_ms"}`` com o TTL restante no momento da exportação.
+Escrita e leitura são incrementais (uma linha por vez).
+"""
+
+import gzip
+import json
+import time
+from collections.abc import AsyncIterable, Callable, Iterator
+from pathlib import Path
+
+from extractor.core.cache import ExportedEntry
+
+SNAPSHOT_FORMAT = "extractor-cache"
+SNAPSHOT_VERSION = 1
+
+# Frequência (em entradas) das chamadas de progresso da exportação
+_PROGRESS_EVERY = 1000
+
+
+async def write_snapshot(
+    path: Path,
+    entries: AsyncIterable[ExportedEntry],
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Grava as entradas no arquivo à medida que chegam.
+
+    Returns:
+        Número de entradas gravadas
+    """
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        header = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "exported_at": time.time(),
+        }
+        f.write(json.dumps(header) + "\n")
+
+        async for key, value, ttl_ms in entries:
+            line = {"key": key, "value": value, "ttl_ms": ttl_ms}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+            if on_progress and count % _PROGRESS_EVERY == 0:
+                on_progress(count)
+
+    if on_progress:
+        on_progress(count)
+    return count
+
+
+class SnapshotReader:
+    """
+    Lê um snapshot entrada a entrada.
+
+    O TTL de cada entrada é descontado do tempo decorrido desde a
+    exportação; entradas já vencidas são puladas e contadas em ``expired``.
+    """
+
+    def __init__(self, path: Path, now: float | None = None) -> None:
+        """Valida o cabeçalho do arquivo."""
+        self.path = path
+        self.expired = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} não é um snapshot do cache")
+        if header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Versão de snapshot não suportada: {header.get('version')}"
+            )
+
+        now = time.time() if now is None else now
+        self.elapsed_ms = max(0, round((now - header["exported_at"]) * 1000))
+
+    def __iter__(self) -> Iterator[ExportedEntry]:
+        """Entradas ainda válidas, com o TTL ajustado."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                ttl_ms = data["ttl_ms"]
+                if ttl_ms is not None:
+                    ttl_ms -= self.elapsed_ms
+                    if ttl_ms <= 0:
+                        self.expired += 1
+                        continue
+                yield data["key"], data["value"], ttl_ms
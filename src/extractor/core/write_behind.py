@@ -0,0 +1,90 @@
+"""Escrita em background (write-behind) com fila limitada."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from extractor.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class WriteBehindQueue(Generic[T]):
+    """
+    Fila limitada consumida por um writer em background.
+
+    ``submit`` nunca espera: com a fila cheia o item é descartado e
+    contabilizado em ``dropped``. O writer agrupa até ``batch_size`` itens
+    por chamada de ``flush``. ``close`` drena o que já foi enfileirado.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[None]],
+        maxsize: int = 10_000,
+        batch_size: int = 100,
+    ) -> None:
+        """Inicializa a fila (o writer só roda após ``start``)."""
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._flush = flush
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=maxsize)
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Itens aguardando escrita."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Inicia o writer em background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, item: T) -> bool:
+        """
+        Enfileira um item sem bloquear.
+
+        Returns:
+            False se a fila estava cheia e o item foi descartado
+        """
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Drena a fila (até ``timeout`` segundos) e para o writer."""
+        if self._task is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning("write_behind_drain_timeout", pending=self.pending)
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        """Consome a fila em lotes."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                # O writer não pode morrer: o lote é perdido, a fila segue
+                logger.warning(
+                    "write_behind_flush_failed", size=len(batch), error=str(e)
+                )
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
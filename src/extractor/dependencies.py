@@ -1,12 +1,14 @@
 """Dependency injection para FastAPI."""
 
-from collections.abc import AsyncGenerator
 from functools import lru_cache
 
-from extractor.config import Settings, get_settings
+from extractor.config import get_settings
+from extractor.core.admission import AdmissionController
 from extractor.core.cache import CacheService
 from extractor.core.extractor import ExtractorService
+from extractor.core.health import HealthMonitor, build_health_monitor
 from extractor.core.instructor_client import InstructorClient
+from extractor.core.singleflight import SingleFlight
 from extractor.schemas.registry import schema_registry
 
 
@@ -16,32 +18,63 @@ def get_instructor_client() -> InstructorClient:
     return InstructorClient()
 
 
-async def get_cache_service(
-    settings: Settings | None = None,
-) -> AsyncGenerator[CacheService, None]:
-    """Retorna serviço de cache com conexão gerenciada."""
-    settings = settings or get_settings()
-    cache = CacheService(settings)
-    await cache.connect()
+@lru_cache
+def get_cache_service() -> CacheService:
+    """
+    Retorna serviço de cache (singleton).
 
-    try:
-        yield cache
-    finally:
-        await cache.disconnect()
+    A conexão é aberta e fechada no lifespan da aplicação; o serviço é
+    compartilhado entre requests para que tarefas em background (refresh
+    de entradas stale) sobrevivam à request que as disparou.
+    """
+    return CacheService()
 
 
-async def get_extractor() -> AsyncGenerator[ExtractorService, None]:
-    """Retorna serviço de extração completo."""
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """
+    Retorna o controle de admissão das chamadas ao LLM (singleton).
+
+    A fila e a estimativa de latência são do processo inteiro, não de uma
+    request.
+    """
     settings = get_settings()
-    client = get_instructor_client()
-    cache = CacheService(settings)
-    await cache.connect()
-
-    try:
-        yield ExtractorService(
-            client=client,
-            cache=cache,
-            registry=schema_registry,
-        )
-    finally:
-        await cache.disconnect()
+    return AdmissionController(
+        max_concurrency=settings.admission_max_concurrency,
+        max_queue=settings.admission_max_queue,
+    )
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight:
+    """
+    Retorna o registro de chamadas ao LLM em andamento (singleton).
+
+    Compartilhado para que requests idênticas simultâneas reaproveitem a
+    mesma chamada.
+    """
+    return SingleFlight()
+
+
+@lru_cache
+def get_health_monitor() -> HealthMonitor:
+    """
+    Retorna o monitor de dependências (singleton).
+
+    Os probes rodam em background a partir do lifespan; os endpoints de
+    health só leem o último resultado.
+    """
+    return build_health_monitor(
+        get_settings(), get_cache_service(), get_instructor_client()
+    )
+
+
+def get_extractor() -> ExtractorService:
+    """Retorna serviço de extração completo."""
+    return ExtractorService(
+        client=get_instructor_client(),
+        cache=get_cache_service(),
+        registry=schema_registry,
+        admission=get_admission_controller(),
+        flights=get_single_flight(),
+    )
@@ -6,9 +6,17 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from extractor.api.endpoints import extract, health, schemas
-from extractor.api.middleware import RateLimitMiddleware, RequestLoggingMiddleware
+from extractor.api.compression import CompressionMiddleware
+from extractor.api.endpoints import cache, extract, health, schemas
+from extractor.api.middleware import (
+    DisconnectMiddleware,
+    RateLimitMiddleware,
+    RequestLoggingMiddleware,
+)
 from extractor.config import get_settings
+from extractor.core.idempotency import IdempotencyStore
+from extractor.core.rate_limit import TOKENS_KEY_PREFIX, build_rate_limiter
+from extractor.dependencies import get_cache_service, get_health_monitor
 from extractor.schemas.domains import (  # noqa: F401
     contact,
     ecommerce,
@@ -16,13 +24,14 @@ from extractor.schemas.domains import (  # noqa: F401
     legal,
     medical,
 )
+from extractor.schemas.registry import schema_registry
 from extractor.utils.logging import get_logger, setup_logging
 
 logger = get_logger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Gerencia lifecycle da aplicação."""
     settings = get_settings()
     setup_logging(debug=settings.debug)
@@ -33,8 +42,25 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
         model=settings.active_model,
     )
 
+    cache = get_cache_service()
+    await cache.connect()
+
+    # Serializa o catálogo antes da primeira request
+    schema_registry.catalog()
+
+    # Primeira rodada de probes antes de aceitar tráfego; depois em background
+    health_monitor = get_health_monitor()
+    await health_monitor.start()
+
     yield
 
+    await health_monitor.close()
+    await cache.disconnect()
+    await app.state.rate_limiter.close()
+    if app.state.token_limiter is not None:
+        await app.state.token_limiter.close()
+    if app.state.idempotency is not None:
+        await app.state.idempotency.close()
     logger.info("application_shutdown")
 
 
@@ -76,16 +102,43 @@ não estruturados usando LLMs com validação Pydantic.
     )
 
     # Custom middlewares
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        max_request_size=settings.compression_max_request_bytes,
+        # Lotes NDJSON: corpo descomprimido aos poucos, sem limite total
+        streaming_paths=("/api/v1/extract/ndjson",),
+    )
     app.add_middleware(RequestLoggingMiddleware)
+    # Por fora do logging: uma request cancelada não chega a "request_completed"
+    app.add_middleware(DisconnectMiddleware, path_prefixes=("/api/v1/extract",))
+    app.state.rate_limiter = build_rate_limiter(settings)
     app.add_middleware(
         RateLimitMiddleware,
         requests=settings.rate_limit_requests,
         window=settings.rate_limit_window_seconds,
+        limiter=app.state.rate_limiter,
+        key_by=settings.rate_limit_key,
+        api_keys=frozenset(settings.rate_limit_api_keys),
+        exempt_paths=("/livez", "/readyz"),
+    )
+    # Orçamento de tokens, debitado no endpoint de extração
+    app.state.token_limiter = (
+        build_rate_limiter(settings, settings.rate_limit_tokens, TOKENS_KEY_PREFIX)
+        if settings.rate_limit_tokens
+        else None
+    )
+    # Idempotency-Key nos endpoints de extração
+    app.state.idempotency = (
+        IdempotencyStore.from_settings(settings)
+        if settings.idempotency_enabled
+        else None
     )
 
     # Routers
     app.include_router(extract.router, prefix="/api/v1")
     app.include_router(schemas.router, prefix="/api/v1")
+    app.include_router(cache.router, prefix="/api/v1")
     app.include_router(health.router)
 
     return app
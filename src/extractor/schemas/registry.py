@@ -1,19 +1,48 @@
 """Registry centralizado de schemas."""
 
+import hashlib
+import json
+from dataclasses import dataclass
 from typing import Any
 
 from extractor.schemas.base import BaseSchema, SchemaInfo
+from extractor.schemas.requests import SchemaListResponse
 from extractor.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class CachedDocument:
+    """Documento JSON já serializado, com seu ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedDocument":
+        """
+        Calcula o ETag a partir do conteúdo.
+
+        É fraco (``W/``): a mesma versão também é servida em msgpack.
+        """
+        return cls(body, f'W/"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
 class SchemaRegistry:
-    """Registry para schemas de extração."""
+    """
+    Registry para schemas de extração.
+
+    O catálogo e os JSON Schemas são serializados uma vez, no primeiro
+    acesso, e descartados quando um schema é registrado.
+    """
 
     def __init__(self) -> None:
         """Inicializa registry vazio."""
         self._schemas: dict[str, type[BaseSchema]] = {}
+        self._infos: list[SchemaInfo] | None = None
+        self._catalog: CachedDocument | None = None
+        self._json_schemas: dict[str, CachedDocument] = {}
 
     def register(self, schema: type[BaseSchema]) -> type[BaseSchema]:
         """
@@ -26,6 +55,7 @@ class SchemaRegistry:
         """
         name = schema.__schema_name__ or schema.__name__
         self._schemas[name] = schema
+        self._invalidate()
         logger.info("schema_registered", name=name)
         return schema
 
@@ -36,21 +66,62 @@ class SchemaRegistry:
             raise KeyError(f"Schema '{name}' não encontrado. Disponíveis: {available}")
         return self._schemas[name]
 
+    def _invalidate(self) -> None:
+        """Descarta o catálogo e os JSON Schemas serializados."""
+        self._infos = None
+        self._catalog = None
+        self._json_schemas.clear()
+
+    def _schema_infos(self) -> list[SchemaInfo]:
+        """Metadados dos schemas (calculados uma vez por versão do registry)."""
+        if self._infos is None:
+            self._infos = [
+                SchemaInfo(
+                    name=name,
+                    description=schema.__schema_description__,
+                    version=schema.__schema_version__,
+                    fields={
+                        field_name: str(field.annotation)
+                        for field_name, field in schema.model_fields.items()
+                    },
+                )
+                for name, schema in self._schemas.items()
+            ]
+        return self._infos
+
     def list_schemas(self) -> list[dict[str, Any]]:
         """Lista todos os schemas registrados com metadados."""
-        result = []
-        for name, schema in self._schemas.items():
-            info = SchemaInfo(
-                name=name,
-                description=schema.__schema_description__,
-                version=schema.__schema_version__,
-                fields={
-                    field_name: str(field.annotation)
-                    for field_name, field in schema.model_fields.items()
-                },
+        return [info.model_dump() for info in self._schema_infos()]
+
+    def catalog(self) -> CachedDocument:
+        """Catálogo (``SchemaListResponse``) serializado, com ETag."""
+        if self._catalog is None:
+            schemas = self.list_schemas()
+            response = SchemaListResponse(schemas=schemas, total=len(schemas))
+            self._catalog = CachedDocument.from_body(
+                response.model_dump_json().encode()
+            )
+        return self._catalog
+
+    def json_schema(self, name: str) -> CachedDocument:
+        """
+        JSON Schema de um schema registrado, serializado, com ETag.
+
+        Raises:
+            KeyError: Se schema não existir
+        """
+        document = self._json_schemas.get(name)
+        if document is None:
+            schema = self.get(name)
+            document = CachedDocument.from_body(
+                json.dumps(
+                    schema.model_json_schema(),
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode()
             )
-            result.append(info.model_dump())
-        return result
+            self._json_schemas[name] = document
+        return document
 
     def has(self, name: str) -> bool:
         """Verifica se schema existe."""
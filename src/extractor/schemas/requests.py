@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class ExtractionRequest(BaseModel):
@@ -27,6 +27,22 @@ class ExtractionRequest(BaseModel):
         default=True,
         description="Se deve usar cache de resultados",
     )
+    use_negative_cache: bool = Field(
+        default=True,
+        description=(
+            "Se deve falhar imediatamente quando o texto falhou recentemente "
+            "na validação do schema"
+        ),
+    )
+
+
+class BulkExtractionItem(ExtractionRequest):
+    """Linha do corpo NDJSON de ``/extract/ndjson``."""
+
+    id: str | int = Field(
+        description="Identificador do documento, repetido na linha de resultado",
+        examples=["doc-000042"],
+    )
 
 
 class ExtractionResponse(BaseModel):
@@ -45,6 +61,16 @@ class ErrorResponse(BaseModel):
     detail: str | None = None
 
 
+class BulkExtractionError(ErrorResponse):
+    """Linha de erro na resposta NDJSON de ``/extract/ndjson``."""
+
+    id: str | int | None = Field(
+        default=None, description="Identificador do documento, se legível"
+    )
+    line: int = Field(description="Número da linha no corpo enviado")
+    status: int = Field(description="Status HTTP equivalente (400, 413, 422...)")
+
+
 class SchemaListResponse(BaseModel):
     """Response com lista de schemas."""
 
@@ -60,3 +86,141 @@ class HealthResponse(BaseModel):
     redis_connected: bool
     llm_provider: str
     llm_model: str
+
+
+class LivenessResponse(BaseModel):
+    """Response do liveness probe."""
+
+    status: str = "alive"
+
+
+class ProbeStatus(BaseModel):
+    """Último resultado de um probe de dependência."""
+
+    ok: bool
+    critical: bool
+    checked_at: float
+    latency_ms: float
+    details: dict[str, Any] = Field(default_factory=dict)
+    error: str | None = None
+
+
+class ReadinessResponse(BaseModel):
+    """Response do readiness probe."""
+
+    status: str
+    ready: bool
+    probes: dict[str, ProbeStatus]
+
+
+class CacheClearResponse(BaseModel):
+    """Response da limpeza de cache (executada em background)."""
+
+    status: str = "accepted"
+    schema_name: str | None = None
+
+
+class CacheCounters(BaseModel):
+    """Contadores de uso do cache."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    sets: int = 0
+    errors: int = 0
+    dropped_writes: int = 0
+    bloom_skips: int = 0
+    # Leituras e escritas no cache local (SQLite); local_hits também
+    # entram em hits/stale_hits
+    local_hits: int = 0
+    local_sets: int = 0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def hit_ratio(self) -> float:
+        """Fração de leituras servidas pelo cache."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+
+
+class CacheKeySample(BaseModel):
+    """Estimativas de volume, memória e TTL a partir de amostra de chaves."""
+
+    sampled_keys: int
+    estimated_keys: int
+    avg_bytes: float
+    estimated_bytes: int
+    ttl_seconds: dict[str, float]
+
+
+class SchemaCacheStats(BaseModel):
+    """Estatísticas de cache de um schema."""
+
+    counters: CacheCounters
+    keys: CacheKeySample | None = None
+
+
+class BloomFilterStats(BaseModel):
+    """Estado do Bloom filter de chaves escritas."""
+
+    ready: bool = Field(description="Filtro reconstruído e em uso")
+    capacity: int
+    keys: int = Field(description="Chaves distintas adicionadas (aproximado)")
+    false_positive_rate: float = Field(description="Taxa estimada de falso positivo")
+
+
+class AdmissionStats(BaseModel):
+    """Ocupação e recusas do controle de admissão (deste worker)."""
+
+    in_flight: int = Field(description="Chamadas ao LLM em andamento")
+    waiting: int = Field(description="Extrações na fila")
+    rejected: int = Field(description="Recusadas com fila cheia (503)")
+    expired: int = Field(description="Descartadas por deadline (504)")
+    service_ms: float = Field(description="Tempo médio de serviço (EWMA)")
+
+
+class LLMCallStats(BaseModel):
+    """Chamadas ao LLM compartilhadas e canceladas (deste worker)."""
+
+    in_flight: int = Field(description="Chamadas em andamento")
+    shared: int = Field(description="Requests que reaproveitaram uma chamada")
+    cancelled: int = Field(description="Chamadas canceladas sem interessados")
+    wasted_seconds: float = Field(description="Geração descartada nos cancelamentos")
+
+
+class CacheStatsResponse(BaseModel):
+    """Response das estatísticas do cache."""
+
+    redis_connected: bool
+    sample_exact: bool
+    total: CacheCounters
+    schemas: dict[str, SchemaCacheStats]
+    bloom: BloomFilterStats | None = None
+    admission: AdmissionStats | None = None
+    llm_calls: LLMCallStats | None = None
+
+
+class CacheLookupItem(BaseModel):
+    """Par texto/schema consultado no cache."""
+
+    text: str = Field(description="Texto da extração")
+    schema_name: str = Field(description="Nome do schema de extração")
+
+
+class CacheLookupRequest(BaseModel):
+    """Request de consulta em lote ao cache."""
+
+    items: list[CacheLookupItem] = Field(
+        description="Pares a verificar",
+        min_length=1,
+        max_length=1000,
+    )
+
+
+class CacheLookupResponse(BaseModel):
+    """Response da consulta em lote, na mesma ordem dos itens."""
+
+    cached: list[bool]
+    hits: int
+    total: int
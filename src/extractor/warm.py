@@ -0,0 +1,281 @@
+"""
+Pré-aquecimento do cache a partir de um corpus.
+
+Uso:
+    python -m extractor.warm corpus.jsonl --concurrency 4 --rate 2
+
+O corpus é JSONL (``{"text": ..., "schema_name": ...}`` por linha) ou CSV
+com colunas ``text`` e ``schema_name``. As extrações passam pelo
+``ExtractorService`` e ``CacheService`` de produção, então as chaves são
+exatamente as mesmas usadas pela API.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+from extractor.config import get_settings
+from extractor.core.cache import CacheService
+from extractor.core.extractor import ExtractorService
+from extractor.core.instructor_client import InstructorClient
+from extractor.schemas.domains import (  # noqa: F401
+    contact,
+    ecommerce,
+    financial,
+    legal,
+    medical,
+)
+from extractor.schemas.registry import schema_registry
+from extractor.utils.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusRow:
+    """Linha do corpus."""
+
+    index: int
+    text: str
+    schema_name: str
+
+
+@dataclass(slots=True)
+class WarmStats:
+    """Contadores do aquecimento."""
+
+    extracted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        """Total de linhas tratadas."""
+        return self.extracted + self.skipped + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Linhas por segundo."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+def read_corpus(path: Path) -> Iterator[CorpusRow]:
+    """Lê o corpus (JSONL ou CSV) de forma incremental."""
+    with path.open(encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for index, row in enumerate(csv.DictReader(f)):
+                yield CorpusRow(index, row["text"], row["schema_name"])
+        else:
+            for index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                yield CorpusRow(index, data["text"], data["schema_name"])
+
+
+class Checkpoint:
+    """Registro append-only das linhas concluídas, para retomar execuções."""
+
+    def __init__(self, path: Path) -> None:
+        """Carrega linhas já concluídas."""
+        self.path = path
+        self.done: set[int] = set()
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                self.done = {int(line) for line in f if line.strip()}
+        self._file: TextIO = path.open("a", encoding="utf-8")
+
+    def mark(self, index: int) -> None:
+        """Marca linha como concluída."""
+        self.done.add(index)
+        self._file.write(f"{index}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Fecha o arquivo."""
+        self._file.close()
+
+
+class RateLimiter:
+    """Espaça o início das extrações para respeitar o limite do provider."""
+
+    def __init__(self, rate: float | None) -> None:
+        """Inicializa limitador (``None`` = sem limite)."""
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Aguarda a próxima janela livre."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def warm_cache(
+    rows: Iterator[CorpusRow],
+    extractor: ExtractorService,
+    checkpoint: Checkpoint,
+    *,
+    concurrency: int = 4,
+    rate: float | None = None,
+    report_every: float = 10.0,
+) -> WarmStats:
+    """
+    Executa as extrações do corpus que ainda não estão em cache.
+
+    Args:
+        rows: Linhas do corpus
+        extractor: Serviço de extração (com cache conectado)
+        checkpoint: Linhas já concluídas (puladas sem consultar o Redis)
+        concurrency: Extrações simultâneas
+        rate: Máximo de extrações iniciadas por segundo
+        report_every: Intervalo entre logs de progresso (segundos)
+
+    Returns:
+        Estatísticas da execução
+    """
+    stats = WarmStats()
+    limiter = RateLimiter(rate)
+    queue: asyncio.Queue[CorpusRow | None] = asyncio.Queue(maxsize=concurrency * 2)
+    start = time.perf_counter()
+    last_report = start
+
+    async def process(row: CorpusRow) -> None:
+        if await extractor.cache.exists(row.text, row.schema_name):
+            checkpoint.mark(row.index)
+            stats.skipped += 1
+            return
+        await limiter.acquire()
+        await extractor.extract(row.text, row.schema_name)
+        checkpoint.mark(row.index)
+        stats.extracted += 1
+
+    def report() -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            last_report = now
+            stats.elapsed = now - start
+            logger.info(
+                "warm_progress",
+                processed=stats.processed,
+                extracted=stats.extracted,
+                skipped=stats.skipped,
+                failed=stats.failed,
+                rows_per_second=round(stats.throughput, 2),
+            )
+
+    async def worker() -> None:
+        # Qualquer erro da linha (cache, extração, checkpoint) conta como
+        # falha: um worker que morresse deixaria o produtor preso na fila
+        while (row := await queue.get()) is not None:
+            try:
+                await process(row)
+            except Exception as e:
+                stats.failed += 1
+                logger.warning("warm_row_failed", row=row.index, error=str(e))
+            report()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    for row in rows:
+        if row.index not in checkpoint.done:
+            await queue.put(row)
+    for _ in workers:
+        await queue.put(None)
+
+    await asyncio.gather(*workers)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Monta os serviços de produção e aquece o cache."""
+    settings = get_settings()
+    cache = CacheService(settings)
+    await cache.connect()
+
+    extractor = ExtractorService(
+        client=InstructorClient(settings),
+        cache=cache,
+        registry=schema_registry,
+    )
+    checkpoint = Checkpoint(
+        args.checkpoint or args.corpus.with_name(f"{args.corpus.name}.checkpoint")
+    )
+
+    try:
+        stats = await warm_cache(
+            read_corpus(args.corpus),
+            extractor,
+            checkpoint,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            report_every=args.report_every,
+        )
+    finally:
+        checkpoint.close()
+        await cache.disconnect()
+
+    print(
+        f"{stats.extracted} extraídos, {stats.skipped} já em cache, "
+        f"{stats.failed} falhas em {stats.elapsed:.1f}s "
+        f"({stats.throughput:.2f} linhas/s)"
+    )
+    return 1 if stats.failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o parser de argumentos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m extractor.warm",
+        description="Pré-aquece o cache de extração a partir de um corpus.",
+    )
+    parser.add_argument("corpus", type=Path, help="Arquivo JSONL ou CSV")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Extrações simultâneas"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Máximo de extrações por segundo (limite do provider)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Arquivo de progresso (padrão: <corpus>.checkpoint)",
+    )
+    parser.add_argument(
+        "--report-every",
+        type=float,
+        default=10.0,
+        help="Intervalo entre relatórios de progresso (segundos)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point do aquecimento."""
+    args = build_parser().parse_args(argv)
+    setup_logging(debug=get_settings().debug)
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
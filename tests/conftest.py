@@ -1,11 +1,14 @@
 """Fixtures compartilhadas para testes."""
 
+import json
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from extractor.config import Settings
 from extractor.core.cache import CacheService
+from extractor.core.idempotency import IdempotencyStore
 from extractor.core.instructor_client import InstructorClient
 from extractor.schemas.base import BaseSchema
 from extractor.schemas.registry import SchemaRegistry
@@ -45,6 +48,54 @@ def cache_service(settings: Settings, mock_redis: AsyncMock) -> CacheService:
     return service
 
 
+class FakeRedis:
+    """Redis em memória com o subconjunto usado pelo IdempotencyStore."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int | None] = {}
+
+    async def set(
+        self, key: str, value: str, nx: bool = False, ex: int | None = None
+    ) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        pass
+
+    def register_script(self, _script: str) -> Any:
+        """Script de release: remove a chave se o token for o do dono."""
+
+        async def release(keys: list[str], args: list[str]) -> int:
+            current = self.data.get(keys[0])
+            if current is not None and json.loads(current).get("token") == args[0]:
+                del self.data[keys[0]]
+                return 1
+            return 0
+
+        return release
+
+
+@pytest.fixture
+def idempotency_store() -> IdempotencyStore:
+    """IdempotencyStore sobre um Redis em memória."""
+    return IdempotencyStore(
+        FakeRedis(),  # type: ignore[arg-type]
+        wait=1,
+        poll_interval=0.01,
+    )
+
+
 @pytest.fixture
 def mock_instructor_client() -> MagicMock:
     """Mock do cliente Instructor."""
@@ -0,0 +1,60 @@
+"""Fixtures dos testes de integração."""
+
+import shutil
+import socket
+import subprocess
+import time
+from collections.abc import Callable, Iterator
+
+import pytest
+
+REDIS_SERVER = shutil.which("redis-server")
+
+
+def _free_port() -> int:
+    """Porta TCP livre em localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.fixture(scope="session")
+def redis_server() -> Iterator[Callable[..., str]]:
+    """
+    Sobe redis-servers efêmeros sob demanda e retorna a URL de cada um.
+
+    Os processos são encerrados no fim da sessão de testes.
+    """
+    processes: list[subprocess.Popen[bytes]] = []
+
+    def start(*args: str) -> str:
+        assert REDIS_SERVER is not None
+        port = _free_port()
+        process = subprocess.Popen(
+            [
+                REDIS_SERVER,
+                "--port",
+                str(port),
+                "--save",
+                "",
+                "--appendonly",
+                "no",
+                *args,
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        processes.append(process)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                return f"redis://127.0.0.1:{port}/0"
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("redis-server não subiu")
+
+    yield start
+
+    for process in processes:
+        process.terminate()
+        process.wait()
@@ -1,13 +1,46 @@
 """Testes de integração da API."""
 
+import gzip
+import json
+from collections.abc import Awaitable, Callable
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import msgpack
 import pytest
 from fastapi.testclient import TestClient
 
+from extractor.config import Settings, get_settings
+from extractor.core.admission import DeadlineExceededError, OverloadedError
+from extractor.core.extractor import ExtractionError
+from extractor.core.health import HealthMonitor, ProbeResult, build_health_monitor
+from extractor.core.rate_limit import TokenBucketLimiter
+from extractor.core.singleflight import SingleFlight
+from extractor.dependencies import (
+    get_cache_service,
+    get_extractor,
+    get_health_monitor,
+    get_single_flight,
+)
 from extractor.main import create_app
 
 
+def _llm_extractor() -> MagicMock:
+    """Extractor mockado em cache miss: passa pelo débito antes do LLM."""
+
+    async def extract_json(
+        *_args: object,
+        before_llm_call: Callable[[], Awaitable[None]] | None = None,
+        **_kwargs: object,
+    ) -> str:
+        if before_llm_call is not None:
+            await before_llm_call()
+        return '{"nome":"x"}'
+
+    mock_extractor = MagicMock()
+    mock_extractor.extract_json = AsyncMock(side_effect=extract_json)
+    return mock_extractor
+
+
 @pytest.fixture
 def app():
     """Cria instância da aplicação para testes."""
@@ -20,47 +53,101 @@ def client(app):
     return TestClient(app)
 
 
-class TestHealthEndpoint:
-    """Testes para endpoint /health."""
+def _probe_result(ok: bool, error: str | None = None) -> ProbeResult:
+    """Resultado de probe fixo para os testes."""
+    return ProbeResult(ok=ok, checked_at=0.0, latency_ms=1.0, error=error)
 
-    def test_health_check_returns_200(self, client: TestClient) -> None:
-        """Health check retorna status 200."""
-        with patch(
-            "extractor.api.endpoints.health.get_cache_service"
-        ) as mock_cache_dep:
-            mock_cache = AsyncMock()
-            mock_cache.health_check = AsyncMock(return_value=True)
 
-            async def mock_gen():
-                yield mock_cache
+@pytest.fixture
+def health_monitor(app) -> HealthMonitor:
+    """Monitor sem probes reais, com resultados definidos pelo teste."""
+    monitor = HealthMonitor({}, critical=frozenset({"warmup"}))
+    monitor.results = {
+        "redis": _probe_result(True),
+        "llm": _probe_result(True),
+        "warmup": _probe_result(True),
+    }
+    app.dependency_overrides[get_health_monitor] = lambda: monitor
+    return monitor
 
-            mock_cache_dep.return_value = mock_gen()
 
-            response = client.get("/health")
+class TestHealthEndpoint:
+    """Testes para endpoints /health, /livez e /readyz."""
+
+    @pytest.mark.usefixtures("health_monitor")
+    def test_health_check_returns_200(self, client: TestClient) -> None:
+        """Health check retorna status 200."""
+        response = client.get("/health")
 
         assert response.status_code == 200
+        assert response.json()["redis_connected"] is True
 
-    def test_health_check_contains_required_fields(self, client: TestClient) -> None:
+    def test_health_check_contains_required_fields(
+        self, client: TestClient, health_monitor: HealthMonitor
+    ) -> None:
         """Health check contém campos obrigatórios."""
-        with patch(
-            "extractor.api.endpoints.health.get_cache_service"
-        ) as mock_cache_dep:
-            mock_cache = AsyncMock()
-            mock_cache.health_check = AsyncMock(return_value=False)
+        health_monitor.results["redis"] = _probe_result(False, "Redis inacessível")
 
-            async def mock_gen():
-                yield mock_cache
-
-            mock_cache_dep.return_value = mock_gen()
-
-            response = client.get("/health")
+        response = client.get("/health")
 
         data = response.json()
         assert "status" in data
         assert "version" in data
         assert "llm_provider" in data
         assert "llm_model" in data
-        assert "redis_connected" in data
+        assert data["redis_connected"] is False
+
+    def test_livez_does_not_depend_on_probes(
+        self, client: TestClient, health_monitor: HealthMonitor
+    ) -> None:
+        """/livez responde 200 mesmo com dependências fora."""
+        health_monitor.results["llm"] = _probe_result(False, "timeout")
+
+        response = client.get("/livez")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readyz_reports_cached_probes(
+        self, client: TestClient, health_monitor: HealthMonitor
+    ) -> None:
+        """/readyz lê o último resultado; Redis fora só degrada."""
+        health_monitor.results["redis"] = _probe_result(False, "Redis inacessível")
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "degraded"
+        assert data["ready"] is True
+        assert data["probes"]["redis"]["error"] == "Redis inacessível"
+        assert data["probes"]["redis"]["critical"] is False
+        assert data["probes"]["warmup"]["critical"] is True
+
+    async def test_readyz_returns_503_until_warmup(self, app) -> None:
+        """Réplica fria (modelo e Bloom filter carregando) fica fora de rotação."""
+        cache = MagicMock()
+        cache.health_check = AsyncMock(return_value=True)
+        cache.bloom_stats.return_value = {"ready": False}
+        llm_client = MagicMock()
+        llm_client.check_model = AsyncMock(return_value={"model": "llama3.1:8b"})
+        llm_client.model_loaded = AsyncMock(return_value=False)
+        monitor = build_health_monitor(Settings(), cache, llm_client)
+        app.dependency_overrides[get_health_monitor] = lambda: monitor
+
+        await monitor.run_once()
+        cold = TestClient(app).get("/readyz")
+        llm_client.model_loaded.return_value = True
+        cache.bloom_stats.return_value = {"ready": True}
+        await monitor.run_once()
+        warm = TestClient(app).get("/readyz")
+
+        assert cold.status_code == 503
+        assert cold.json()["probes"]["warmup"]["error"] == (
+            "Aquecendo: model_loaded, bloom_filter_ready"
+        )
+        assert warm.status_code == 200
+        assert warm.json()["status"] == "ready"
 
 
 class TestSchemasEndpoint:
@@ -98,6 +185,33 @@ class TestSchemasEndpoint:
             assert "description" in schema
             assert "version" in schema
 
+    def test_catalog_is_served_with_etag(self, client: TestClient) -> None:
+        """O catálogo tem ETag/Cache-Control e If-None-Match devolve 304."""
+        first = client.get("/api/v1/schemas")
+        etag = first.headers["ETag"]
+
+        cached = client.get("/api/v1/schemas", headers={"If-None-Match": etag})
+        other = client.get("/api/v1/schemas", headers={"If-None-Match": '"antigo"'})
+
+        assert "max-age=" in first.headers["Cache-Control"]
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+        assert other.status_code == 200
+
+    def test_json_schema_endpoint(self, client: TestClient) -> None:
+        """JSON Schema por schema, com ETag; schema desconhecido retorna 404."""
+        response = client.get("/api/v1/schemas/Pessoa")
+        cached = client.get(
+            "/api/v1/schemas/Pessoa",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+
+        assert response.status_code == 200
+        assert "properties" in response.json()
+        assert cached.status_code == 304
+        assert client.get("/api/v1/schemas/Inexistente").status_code == 404
+
 
 class TestExtractEndpoint:
     """Testes para endpoint /api/v1/extract."""
@@ -152,6 +266,164 @@ class TestExtractEndpoint:
 
         assert response.status_code == 400
 
+    def test_extract_passes_cached_json_through(self, app) -> None:
+        """JSON retornado pelo extractor é repassado no envelope."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(
+            return_value='{"valor_total":"1500.00","data_emissao":"2024-01-15"}'
+        )
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+
+        response = TestClient(app).post(
+            "/api/v1/extract",
+            json={"text": "Fatura de teste com valor", "schema_name": "Fatura"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "success": True,
+            "schema_name": "Fatura",
+            "data": {"valor_total": "1500.00", "data_emissao": "2024-01-15"},
+        }
+
+    def test_extract_negotiates_msgpack(self, app) -> None:
+        """Corpo e resposta em msgpack quando o cliente pede."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(
+            return_value='{"valor_total":"1500.00","data_emissao":"2024-01-15"}'
+        )
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+
+        response = TestClient(app).post(
+            "/api/v1/extract",
+            content=msgpack.packb(
+                {"text": "Fatura de teste com valor", "schema_name": "Fatura"}
+            ),
+            headers={
+                "Content-Type": "application/msgpack",
+                "Accept": "application/msgpack",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert "X-TokenBudget-Remaining" in response.headers
+        assert msgpack.unpackb(response.content) == {
+            "success": True,
+            "schema_name": "Fatura",
+            "data": {"valor_total": "1500.00", "data_emissao": "2024-01-15"},
+        }
+
+    def test_extract_accepts_gzip_body(self, app) -> None:
+        """Corpo gzip é descomprimido antes da validação."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(return_value='{"nome":"Ana"}')
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        body = json.dumps({"text": "Ana Souza, 41 anos", "schema_name": "Pessoa"})
+
+        response = TestClient(app).post(
+            "/api/v1/extract",
+            content=gzip.compress(body.encode()),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {"nome": "Ana"}
+        mock_extractor.extract_json.assert_awaited_once()
+
+    def test_extract_charges_token_budget(self, app) -> None:
+        """Extrações debitam o custo estimado e informam o saldo."""
+        mock_extractor = _llm_extractor()
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        app.state.token_limiter = TokenBucketLimiter(limit=1000, window=60)
+        client = TestClient(app)
+
+        light = client.post(
+            "/api/v1/extract",
+            json={"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"},
+        )
+        heavy = client.post(
+            "/api/v1/extract",
+            json={"text": "Cláusula " * 2000, "schema_name": "Contrato"},
+        )
+
+        assert light.status_code == 200
+        assert light.headers["X-TokenBudget-Limit"] == "1000"
+        light_cost = int(light.headers["X-TokenBudget-Cost"])
+        assert int(light.headers["X-TokenBudget-Remaining"]) == 1000 - light_cost
+        # Custo maior que o orçamento inteiro é limitado a ele: não cabe mais
+        assert heavy.status_code == 429
+        assert heavy.headers["X-TokenBudget-Cost"] == "1000"
+        assert int(heavy.headers["Retry-After"]) >= 1
+
+    def test_cache_hit_does_not_charge_token_budget(self, app) -> None:
+        """Só chamadas ao LLM debitam o orçamento; cache hits não."""
+        app.state.token_limiter = TokenBucketLimiter(limit=1000, window=3600)
+        body = {"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"}
+        client = TestClient(app)
+
+        app.dependency_overrides[get_extractor] = _llm_extractor
+        miss = client.post("/api/v1/extract", json=body)
+        hit_extractor = MagicMock()
+        hit_extractor.extract_json = AsyncMock(return_value='{"nome":"x"}')
+        app.dependency_overrides[get_extractor] = lambda: hit_extractor
+        hit = client.post("/api/v1/extract", json=body)
+
+        assert int(miss.headers["X-TokenBudget-Cost"]) > 0
+        assert hit.status_code == 200
+        assert hit.headers["X-TokenBudget-Cost"] == "0"
+        assert (
+            hit.headers["X-TokenBudget-Remaining"]
+            == miss.headers["X-TokenBudget-Remaining"]
+        )
+
+    def test_extract_sheds_load_with_503(self, app) -> None:
+        """Fila de admissão cheia responde 503 com Retry-After."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(side_effect=OverloadedError(2.5))
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/extract",
+            json={"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+
+    def test_extract_propagates_request_timeout(self, app) -> None:
+        """X-Request-Timeout vira deadline; deadline estourado responde 504."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(
+            side_effect=DeadlineExceededError("fila")
+        )
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/extract",
+            json={"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"},
+            headers={"X-Request-Timeout": "1.5"},
+        )
+
+        assert response.status_code == 504
+        assert mock_extractor.extract_json.call_args.kwargs["deadline"] is not None
+
+    def test_extract_rejects_invalid_request_timeout(self, app) -> None:
+        """X-Request-Timeout precisa ser um número positivo."""
+        app.dependency_overrides[get_extractor] = MagicMock
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/extract",
+            json={"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"},
+            headers={"X-Request-Timeout": "0"},
+        )
+
+        assert response.status_code == 422
+
     def test_extract_validates_text_min_length(self, client: TestClient) -> None:
         """Texto muito curto retorna 422."""
         response = client.post(
@@ -176,40 +448,355 @@ class TestExtractEndpoint:
         assert response.status_code == 422
 
 
+class TestExtractNdjsonEndpoint:
+    """Testes para /api/v1/extract/ndjson."""
+
+    def test_streams_one_result_per_line(self, app) -> None:
+        """Cada linha gera um resultado com o id; erros não param o lote."""
+
+        async def extract_json(text: str, schema_name: str, **_kwargs) -> str:
+            if schema_name == "Inexistente":
+                raise KeyError("Schema 'Inexistente' não encontrado")
+            return json.dumps({"nome": text.split(",", maxsplit=1)[0]})
+
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = extract_json
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        body = "\n".join(
+            [
+                json.dumps(
+                    {"id": 1, "text": "Ana Souza, 41 anos", "schema_name": "Pessoa"}
+                ),
+                "{nao e json",
+                json.dumps({"id": "b", "text": "curto", "schema_name": "Pessoa"}),
+                json.dumps(
+                    {
+                        "id": "c",
+                        "text": "Texto qualquer aqui",
+                        "schema_name": "Inexistente",
+                    }
+                ),
+                json.dumps(
+                    {"id": 5, "text": "Bruno Lima, 30 anos", "schema_name": "Pessoa"}
+                ),
+            ]
+        )
+
+        response = TestClient(app).post(
+            "/api/v1/extract/ndjson",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        results = {
+            (r["id"], r.get("line")): r
+            for r in map(json.loads, response.text.splitlines())
+        }
+        assert results[(1, None)] == {
+            "id": 1,
+            "success": True,
+            "schema_name": "Pessoa",
+            "data": {"nome": "Ana Souza"},
+        }
+        assert results[(5, None)]["data"] == {"nome": "Bruno Lima"}
+        assert results[(None, 2)]["status"] == 422
+        assert results[(None, 3)]["status"] == 422
+        assert results[("c", 4)]["status"] == 400
+        assert results[("c", 4)]["success"] is False
+
+    def test_each_document_is_charged(self, app) -> None:
+        """O orçamento de tokens vale por documento."""
+        app.dependency_overrides[get_extractor] = _llm_extractor
+        app.state.token_limiter = TokenBucketLimiter(limit=150, window=60)
+        line = {"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"}
+        body = "\n".join(json.dumps({"id": i, **line}) for i in range(3))
+
+        response = TestClient(app).post("/api/v1/extract/ndjson", content=body)
+
+        statuses = sorted(
+            json.loads(r).get("status", 200) for r in response.text.splitlines()
+        )
+        assert statuses == [200, 429, 429]
+
+    def test_unexpected_error_becomes_error_line(self, app) -> None:
+        """Exceção não mapeada vira linha 500 sem interromper o lote."""
+
+        async def extract_json(text: str, **_kwargs) -> str:
+            if text.startswith("Falha"):
+                raise RuntimeError("Redis fora")
+            return '{"nome":"x"}'
+
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = extract_json
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        texts = ["Maria Silva, 30 anos", "Falha no documento", "João Lima, 40 anos"]
+        body = "\n".join(
+            json.dumps({"id": i, "text": text, "schema_name": "Pessoa"})
+            for i, text in enumerate(texts)
+        )
+
+        response = TestClient(app).post("/api/v1/extract/ndjson", content=body)
+
+        results = {r["id"]: r for r in map(json.loads, response.text.splitlines())}
+        assert results[0]["success"] is results[2]["success"] is True
+        assert results[1]["status"] == 500
+        assert results[1]["line"] == 2
+        assert "Redis fora" in results[1]["detail"]
+
+    def test_corrupted_body_keeps_processed_lines(self, app) -> None:
+        """Gzip truncado no meio do lote: linhas lidas seguem, o resto vira 400."""
+        app.dependency_overrides[get_extractor] = _llm_extractor
+        line = {"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"}
+        body = "".join(json.dumps({"id": i, **line}) + "\n" for i in range(2))
+        compressed = gzip.compress(body.encode())[:-8]
+
+        response = TestClient(app).post(
+            "/api/v1/extract/ndjson",
+            content=compressed,
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        results = [json.loads(r) for r in response.text.splitlines()]
+        assert response.status_code == 200
+        assert sorted(r["id"] for r in results if r["success"]) == [0, 1]
+        assert results[-1]["status"] == 400
+        assert results[-1]["line"] == 3
+
+
+_IDEMPOTENT_BODY = {
+    "text": "Maria Silva, 30 anos",
+    "schema_name": "Pessoa",
+    "use_cache": False,
+}
+
+
+class TestIdempotencyKey:
+    """Testes do header Idempotency-Key."""
+
+    def test_repeat_returns_stored_response(self, app, idempotency_store) -> None:
+        """A repetição não chama o LLM de novo, mesmo com use_cache=false."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(return_value='{"nome":"Maria"}')
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        app.state.idempotency = idempotency_store
+        client = TestClient(app)
+        headers = {"Idempotency-Key": "pedido-42"}
+
+        first = client.post("/api/v1/extract", json=_IDEMPOTENT_BODY, headers=headers)
+        repeat = client.post("/api/v1/extract", json=_IDEMPOTENT_BODY, headers=headers)
+
+        assert first.status_code == repeat.status_code == 200
+        assert repeat.json() == first.json()
+        assert repeat.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        mock_extractor.extract_json.assert_awaited_once()
+
+    def test_reuse_with_other_body_returns_422(self, app, idempotency_store) -> None:
+        """A mesma chave com outro corpo é recusada."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(return_value='{"nome":"Maria"}')
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        app.state.idempotency = idempotency_store
+        client = TestClient(app)
+        headers = {"Idempotency-Key": "pedido-42"}
+
+        client.post("/api/v1/extract", json=_IDEMPOTENT_BODY, headers=headers)
+        other = client.post(
+            "/api/v1/extract",
+            json={**_IDEMPOTENT_BODY, "text": "Outro texto qualquer"},
+            headers=headers,
+        )
+
+        assert other.status_code == 422
+        mock_extractor.extract_json.assert_awaited_once()
+
+    def test_extraction_errors_are_retried(self, app, idempotency_store) -> None:
+        """Erro 500 não é gravado: a repetição extrai de novo."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(
+            side_effect=[ExtractionError("provider"), '{"nome":"Maria"}']
+        )
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        app.state.idempotency = idempotency_store
+        client = TestClient(app)
+        headers = {"Idempotency-Key": "pedido-42"}
+
+        first = client.post("/api/v1/extract", json=_IDEMPOTENT_BODY, headers=headers)
+        retry = client.post("/api/v1/extract", json=_IDEMPOTENT_BODY, headers=headers)
+
+        assert first.status_code == 500
+        assert retry.status_code == 200
+        assert "Idempotent-Replayed" not in retry.headers
+
+    def test_bulk_documents_are_idempotent_by_id(self, app, idempotency_store) -> None:
+        """Reenviar o lote só extrai os documentos novos."""
+        mock_extractor = MagicMock()
+        mock_extractor.extract_json = AsyncMock(return_value='{"nome":"x"}')
+        app.dependency_overrides[get_extractor] = lambda: mock_extractor
+        app.state.idempotency = idempotency_store
+        client = TestClient(app)
+        line = {"text": "Maria Silva, 30 anos", "schema_name": "Pessoa"}
+        headers = {"Idempotency-Key": "lote-7"}
+
+        client.post(
+            "/api/v1/extract/ndjson",
+            content="\n".join(json.dumps({"id": i, **line}) for i in range(2)),
+            headers=headers,
+        )
+        again = client.post(
+            "/api/v1/extract/ndjson",
+            content="\n".join(json.dumps({"id": i, **line}) for i in range(3)),
+            headers=headers,
+        )
+
+        assert sorted(json.loads(r)["id"] for r in again.text.splitlines()) == [0, 1, 2]
+        assert mock_extractor.extract_json.await_count == 3
+
+
+class TestCacheEndpoint:
+    """Testes para endpoint /api/v1/cache."""
+
+    def test_clear_all(self, app) -> None:
+        """DELETE sem schema agenda a limpeza de todo o cache."""
+        mock_cache = MagicMock()
+        mock_cache.clear_all = AsyncMock(return_value=3)
+        app.dependency_overrides[get_cache_service] = lambda: mock_cache
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            admin_api_key="segredo"
+        )
+
+        response = TestClient(app).delete(
+            "/api/v1/cache", headers={"X-Admin-Key": "segredo"}
+        )
+
+        assert response.status_code == 202
+        assert response.json() == {"status": "accepted", "schema_name": None}
+        mock_cache.clear_all.assert_awaited_once()
+
+    def test_purge_schema(self, app) -> None:
+        """DELETE com schema_name remove só aquele schema."""
+        mock_cache = MagicMock()
+        mock_cache.purge_schema = AsyncMock(return_value=2)
+        app.dependency_overrides[get_cache_service] = lambda: mock_cache
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            admin_api_key="segredo"
+        )
+
+        response = TestClient(app).delete(
+            "/api/v1/cache?schema_name=Fatura", headers={"X-Admin-Key": "segredo"}
+        )
+
+        assert response.json() == {"status": "accepted", "schema_name": "Fatura"}
+        mock_cache.purge_schema.assert_awaited_once_with("Fatura")
+
+    @pytest.mark.parametrize(
+        ("admin_api_key", "header", "expected"),
+        [("", "segredo", 403), ("segredo", None, 401), ("segredo", "outra", 401)],
+    )
+    def test_clear_requires_admin_key(
+        self, app, admin_api_key: str, header: str | None, expected: int
+    ) -> None:
+        """Sem a chave administrativa o cache não é tocado."""
+        mock_cache = MagicMock()
+        mock_cache.clear_all = AsyncMock(return_value=3)
+        app.dependency_overrides[get_cache_service] = lambda: mock_cache
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            admin_api_key=admin_api_key
+        )
+        headers = {"X-Admin-Key": header} if header else {}
+
+        response = TestClient(app).delete("/api/v1/cache", headers=headers)
+
+        assert response.status_code == expected
+        mock_cache.clear_all.assert_not_called()
+
+    def test_stats(self, app) -> None:
+        """GET /stats combina contadores e amostra de chaves."""
+        mock_cache = MagicMock()
+        mock_cache.counters.return_value = {
+            "Fatura": {"hits": 3, "misses": 1, "sets": 1, "local_hits": 2},
+            "Pessoa": {"local_sets": 1},
+        }
+        mock_cache.sample_keys = AsyncMock(
+            return_value={
+                "exact": True,
+                "schemas": {
+                    "Pessoa": {
+                        "sampled_keys": 1,
+                        "estimated_keys": 1,
+                        "avg_bytes": 64.0,
+                        "estimated_bytes": 64,
+                        "ttl_seconds": {"min": 1, "p50": 1, "p90": 1, "max": 1},
+                    }
+                },
+            }
+        )
+        mock_cache.health_check = AsyncMock(return_value=True)
+        mock_cache.bloom_stats.return_value = {
+            "ready": True,
+            "capacity": 1000,
+            "keys": 10,
+            "false_positive_rate": 0.0001,
+        }
+        app.dependency_overrides[get_cache_service] = lambda: mock_cache
+        flights = SingleFlight()
+        flights.cancelled, flights.wasted_seconds = 2, 1.5
+        app.dependency_overrides[get_single_flight] = lambda: flights
+
+        response = TestClient(app).get("/api/v1/cache/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"]["hit_ratio"] == 0.75
+        assert data["total"]["local_hits"] == 2
+        assert data["schemas"]["Pessoa"]["counters"]["local_sets"] == 1
+        assert data["schemas"]["Fatura"]["keys"] is None
+        assert data["schemas"]["Pessoa"]["keys"]["estimated_bytes"] == 64
+        assert data["sample_exact"] is True
+        assert data["bloom"]["false_positive_rate"] == 0.0001
+        assert data["admission"]["rejected"] == 0
+        assert data["llm_calls"]["cancelled"] == 2
+        assert data["llm_calls"]["wasted_seconds"] == 1.5
+
+    def test_lookup(self, app) -> None:
+        """POST /lookup informa quais pares estão em cache."""
+        mock_cache = MagicMock()
+        mock_cache.exists_many = AsyncMock(return_value=[True, False])
+        app.dependency_overrides[get_cache_service] = lambda: mock_cache
+
+        response = TestClient(app).post(
+            "/api/v1/cache/lookup",
+            json={
+                "items": [
+                    {"text": "texto um", "schema_name": "Pessoa"},
+                    {"text": "texto dois", "schema_name": "Fatura"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"cached": [True, False], "hits": 1, "total": 2}
+        mock_cache.exists_many.assert_awaited_once_with(
+            [("texto um", "Pessoa"), ("texto dois", "Fatura")]
+        )
+
+
 class TestRateLimitHeaders:
     """Testes para headers de rate limiting."""
 
+    @pytest.mark.usefixtures("health_monitor")
     def test_response_contains_rate_limit_headers(self, client: TestClient) -> None:
         """Resposta contém headers de rate limit."""
-        with patch(
-            "extractor.api.endpoints.health.get_cache_service"
-        ) as mock_cache_dep:
-            mock_cache = AsyncMock()
-            mock_cache.health_check = AsyncMock(return_value=True)
-
-            async def mock_gen():
-                yield mock_cache
-
-            mock_cache_dep.return_value = mock_gen()
-
-            response = client.get("/health")
+        response = client.get("/health")
 
         assert "X-RateLimit-Limit" in response.headers
         assert "X-RateLimit-Remaining" in response.headers
 
+    @pytest.mark.usefixtures("health_monitor")
     def test_response_contains_process_time_header(self, client: TestClient) -> None:
         """Resposta contém header X-Process-Time."""
-        with patch(
-            "extractor.api.endpoints.health.get_cache_service"
-        ) as mock_cache_dep:
-            mock_cache = AsyncMock()
-            mock_cache.health_check = AsyncMock(return_value=True)
-
-            async def mock_gen():
-                yield mock_cache
-
-            mock_cache_dep.return_value = mock_gen()
-
-            response = client.get("/health")
+        response = client.get("/health")
 
         assert "X-Process-Time" in response.headers
@@ -0,0 +1,86 @@
+"""Testes de integração das idempotency keys no Redis."""
+
+import asyncio
+import shutil
+from collections.abc import AsyncIterator, Callable
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.config import Settings
+from extractor.core.idempotency import (
+    Claim,
+    IdempotencyInProgressError,
+    IdempotencyStore,
+    StoredResponse,
+)
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("redis-server") is None, reason="redis-server não encontrado no PATH"
+)
+
+
+@pytest.fixture(scope="module")
+def redis_url(redis_server: Callable[..., str]) -> str:
+    """Um redis-server para o módulo."""
+    return redis_server()
+
+
+@pytest.fixture
+async def workers(redis_url: str) -> AsyncIterator[list[IdempotencyStore]]:
+    """Dois stores independentes (como dois workers) no mesmo Redis."""
+    settings = Settings(
+        idempotency_redis_url=redis_url,  # type: ignore[arg-type]
+        idempotency_wait_seconds=5,
+    )
+    stores = [IdempotencyStore.from_settings(settings) for _ in range(2)]
+    client: redis.Redis[str] = redis.from_url(redis_url)
+    await client.flushdb()
+    await client.aclose()
+    yield stores
+    for store in stores:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_duplicates_across_workers_run_once(
+    workers: list[IdempotencyStore],
+) -> None:
+    """Repetições em outro worker esperam a original e recebem a resposta."""
+    runs = 0
+
+    async def handle(store: IdempotencyStore) -> StoredResponse:
+        nonlocal runs
+        async with store.claim("pedido-1", "fp") as claim:
+            if claim.replay is not None:
+                return claim.replay
+            runs += 1
+            await asyncio.sleep(0.2)
+            response = StoredResponse(200, b'{"ok":true}')
+            await store.save(claim, response)
+            return response
+
+    results = await asyncio.gather(*(handle(workers[i % 2]) for i in range(6)))
+
+    assert runs == 1
+    assert {result.body for result in results} == {b'{"ok":true}'}
+
+
+@pytest.mark.asyncio
+async def test_release_script_only_removes_own_marker(
+    workers: list[IdempotencyStore],
+) -> None:
+    """O script de release compara o token do dono."""
+    first, second = workers
+
+    with pytest.raises(RuntimeError):
+        async with first.claim("pedido-2", "fp"):
+            raise RuntimeError("LLM")
+
+    async with second.claim("pedido-2", "fp") as claim:
+        assert claim.token is not None
+        # Token de outro dono: o marcador continua lá
+        await first.release(Claim(claim.key, claim.fingerprint, token="x"))
+        with pytest.raises(IdempotencyInProgressError):
+            async with first.claim("pedido-2", "fp", timeout=0.05):
+                pass
@@ -0,0 +1,71 @@
+"""Testes de integração do rate limiting distribuído (script GCRA no Redis)."""
+
+import asyncio
+import shutil
+from collections.abc import AsyncIterator, Callable
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.config import Settings
+from extractor.core.rate_limit import RedisRateLimiter
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("redis-server") is None, reason="redis-server não encontrado no PATH"
+)
+
+
+@pytest.fixture(scope="module")
+def redis_url(redis_server: Callable[..., str]) -> str:
+    """Um redis-server para o módulo."""
+    return redis_server()
+
+
+@pytest.fixture
+async def workers(redis_url: str) -> AsyncIterator[list[RedisRateLimiter]]:
+    """Dois limitadores independentes (como dois workers) no mesmo Redis."""
+    settings = Settings(
+        rate_limit_redis_url=redis_url,  # type: ignore[arg-type]
+        rate_limit_requests=5,
+        rate_limit_window_seconds=60,
+    )
+    limiters = [RedisRateLimiter.from_settings(settings) for _ in range(2)]
+    client: redis.Redis[str] = redis.from_url(redis_url)
+    await client.flushdb()
+    await client.aclose()
+    yield limiters
+    for limiter in limiters:
+        await limiter.close()
+
+
+class TestRedisRateLimiter:
+    """GCRA compartilhado entre processos."""
+
+    async def test_limit_is_shared_between_workers(
+        self, workers: list[RedisRateLimiter]
+    ) -> None:
+        """A cota é global: requests em workers diferentes somam."""
+        decisions = [await workers[i % 2].check("ip:1.2.3.4") for i in range(6)]
+
+        assert [d.allowed for d in decisions] == [True] * 5 + [False]
+        assert [d.remaining for d in decisions[:5]] == [4, 3, 2, 1, 0]
+        # Uma unidade é reposta a cada 60 / 5 = 12 s
+        assert 11 < decisions[-1].retry_after <= 12
+
+    async def test_clients_are_isolated(self, workers: list[RedisRateLimiter]) -> None:
+        """Cada cliente tem sua própria cota."""
+        for _ in range(5):
+            await workers[0].check("ip:a")
+
+        assert not (await workers[1].check("ip:a")).allowed
+        assert (await workers[1].check("ip:b")).allowed
+
+    async def test_concurrent_checks_never_exceed_limit(
+        self, workers: list[RedisRateLimiter]
+    ) -> None:
+        """O script é atômico: rajadas concorrentes não furam o limite."""
+        decisions = await asyncio.gather(
+            *(workers[i % 2].check("ip:burst") for i in range(50))
+        )
+
+        assert sum(d.allowed for d in decisions) == 5
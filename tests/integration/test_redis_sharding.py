@@ -0,0 +1,133 @@
+"""Testes de integração do cache distribuído com processos redis-server locais."""
+
+import asyncio
+import shutil
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+import pytest
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from extractor.config import RedisShard, Settings
+from extractor.core.cache import CacheService
+from extractor.core.snapshot import SnapshotReader, write_snapshot
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("redis-server") is None, reason="redis-server não encontrado no PATH"
+)
+
+
+class Pessoa(BaseModel):
+    """Modelo simples para os testes."""
+
+    nome: str
+
+
+@pytest.fixture(scope="module")
+def topology(redis_server: Callable[..., str]) -> list[RedisShard]:
+    """Dois primários; o primeiro com uma réplica."""
+    first_url = redis_server()
+    second_url = redis_server()
+    replica_url = redis_server(
+        "--replicaof", "127.0.0.1", first_url.split(":")[2].split("/")[0]
+    )
+    return [
+        RedisShard(url=first_url, replicas=[replica_url]),  # type: ignore[arg-type,list-item]
+        RedisShard(url=second_url),  # type: ignore[arg-type]
+    ]
+
+
+@pytest.fixture
+async def cache(topology: list[RedisShard]) -> AsyncIterator[CacheService]:
+    """CacheService conectado aos shards, começando vazio."""
+    service = CacheService(
+        Settings(
+            cache_enabled=True,
+            redis_shards=topology,
+            cache_write_behind=False,
+            redis_socket_timeout=1.0,
+        )
+    )
+    await service.connect()
+    await service.clear_all()
+    yield service
+    await service.disconnect()
+
+
+async def _dbsize(url: str) -> int:
+    """DBSIZE direto em um servidor."""
+    client: redis.Redis[str] = redis.from_url(url)
+    try:
+        return int(await client.dbsize())
+    finally:
+        await client.aclose()
+
+
+class TestShardedCache:
+    """CacheService sobre vários primários."""
+
+    async def test_keys_are_spread_and_readable(
+        self, cache: CacheService, topology: list[RedisShard]
+    ) -> None:
+        """Escritas se dividem entre os primários e voltam por get_many."""
+        items = [(f"texto {i}", "Pessoa", Pessoa(nome=f"n{i}")) for i in range(40)]
+        await cache.set_many(items)
+
+        results = await cache.get_many([(text, schema) for text, schema, _ in items])
+
+        assert [r["nome"] if r else None for r in results] == [
+            f"n{i}" for i in range(40)
+        ]
+        sizes = [await _dbsize(str(shard.url)) for shard in topology]
+        assert sum(sizes) == 40
+        assert all(sizes)
+
+    async def test_clear_all_purges_every_shard(
+        self, cache: CacheService, topology: list[RedisShard]
+    ) -> None:
+        """SCAN + UNLINK percorre todos os primários."""
+        await cache.set_many(
+            [(f"texto {i}", "Pessoa", Pessoa(nome="x")) for i in range(20)]
+        )
+
+        assert await cache.clear_all() == 20
+        assert [await _dbsize(str(shard.url)) for shard in topology] == [0, 0]
+
+    async def test_get_reads_from_replica(
+        self, cache: CacheService, topology: list[RedisShard]
+    ) -> None:
+        """Chaves do shard com réplica são lidas dela após a replicação."""
+        replica_url = str(topology[0].replicas[0])
+        await cache.set_many(
+            [(f"texto {i}", "Pessoa", Pessoa(nome="x")) for i in range(20)]
+        )
+        for _ in range(50):
+            if await _dbsize(replica_url) == await _dbsize(str(topology[0].url)):
+                break
+            await asyncio.sleep(0.05)
+
+        assert all(await cache.get_many([(f"texto {i}", "Pessoa") for i in range(20)]))
+
+        client: redis.Redis[str] = redis.from_url(replica_url)
+        try:
+            stats = await client.info("commandstats")
+        finally:
+            await client.aclose()
+        assert stats["cmdstat_mget"]["calls"] >= 1
+
+    async def test_export_import_roundtrip(
+        self, cache: CacheService, tmp_path: Path
+    ) -> None:
+        """Snapshot exportado repõe as chaves com TTL após limpar o cache."""
+        path = tmp_path / "cache.jsonl.gz"
+        await cache.set_many(
+            [(f"texto {i}", "Pessoa", Pessoa(nome=f"n{i}")) for i in range(30)]
+        )
+
+        assert await write_snapshot(path, cache.export_entries(batch_size=7)) == 30
+        await cache.clear_all()
+
+        assert await cache.import_entries(SnapshotReader(path), batch_size=7) == 30
+        result = await cache.get("texto 3", "Pessoa")
+        assert result == {"nome": "n3"}
@@ -0,0 +1,108 @@
+"""Testes unitários para admission.py."""
+
+import asyncio
+import time
+
+import pytest
+
+from extractor.core.admission import (
+    AdmissionController,
+    DeadlineExceededError,
+    OverloadedError,
+)
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    """Ocupa uma vaga até ``release``."""
+    async with controller.admit():
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Testes para AdmissionController."""
+
+    async def test_admits_while_slots_are_free(self) -> None:
+        """Com vaga livre, a chamada é admitida e entra na média de latência."""
+        controller = AdmissionController(max_concurrency=2, max_queue=2)
+
+        async with controller.admit():
+            assert controller.in_flight == 1
+
+        assert controller.in_flight == 0
+        assert controller.service_time > 0
+
+    async def test_rejects_when_queue_is_full(self) -> None:
+        """Fila cheia recusa na hora, com sugestão de nova tentativa."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        waiter = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+
+        with pytest.raises(OverloadedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert controller.rejected == 1
+        assert exc_info.value.retry_after_seconds >= 1
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert controller.in_flight == controller.waiting == 0
+        assert controller.counters()["rejected"] == 1
+
+    async def test_reserve_counts_before_any_await(self) -> None:
+        """Reservas no mesmo passo do event loop já respeitam o limite da fila."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+
+        controller.reserve()
+        with pytest.raises(OverloadedError):
+            controller.reserve()
+        controller.cancel_reservation()
+
+        assert controller.waiting == 0
+        release.set()
+        await holder
+
+    async def test_zero_queue_admits_while_slots_are_free(self) -> None:
+        """Sem fila, só recusa quando não há vaga livre."""
+        controller = AdmissionController(max_concurrency=1, max_queue=0)
+
+        async with controller.admit():
+            with pytest.raises(OverloadedError):
+                async with controller.admit():
+                    pass
+
+        async with controller.admit():
+            pass
+        assert controller.rejected == 1
+
+    async def test_drops_request_whose_deadline_cannot_be_met(self) -> None:
+        """Espera estimada + serviço maior que o deadline descarta antes do LLM."""
+        controller = AdmissionController(max_concurrency=1, max_queue=4)
+        controller.service_time = 1.0
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(DeadlineExceededError):
+            controller.check(time.monotonic() + 1.5)
+
+        assert controller.expired == 1
+        assert controller.waiting == 0
+        release.set()
+        await holder
+
+    async def test_failed_calls_do_not_update_service_time(self) -> None:
+        """Só chamadas concluídas entram na média de latência."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+
+        with pytest.raises(RuntimeError):
+            async with controller.admit():
+                raise RuntimeError("provider")
+
+        assert controller.service_time == 0.0
+        assert controller.in_flight == 0
@@ -0,0 +1,45 @@
+"""Testes unitários para bloom.py."""
+
+from extractor.core.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Testes para BloomFilter."""
+
+    def test_no_false_negatives(self) -> None:
+        """Toda chave adicionada é encontrada."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f"extract:Pessoa:{i:016x}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate_close_to_target(self) -> None:
+        """Na capacidade, a taxa observada fica perto da configurada."""
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"in:{i}")
+
+        false_positives = sum(f"out:{i}" in bloom for i in range(20000))
+
+        assert false_positives / 20000 < 0.02
+        assert 0.005 < bloom.false_positive_rate < 0.02
+
+    def test_count_ignores_duplicates(self) -> None:
+        """Chave repetida não conta duas vezes."""
+        bloom = BloomFilter(capacity=100)
+        bloom.add("a")
+        bloom.add("a")
+
+        assert bloom.count == 1
+
+    def test_clear(self) -> None:
+        """clear esvazia o filtro."""
+        bloom = BloomFilter(capacity=100)
+        bloom.add("a")
+        bloom.clear()
+
+        assert "a" not in bloom
+        assert bloom.count == 0
+        assert bloom.false_positive_rate == 0
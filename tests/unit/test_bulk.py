@@ -0,0 +1,161 @@
+"""Testes unitários para bulk.py."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from extractor.core.bulk import RawLine, map_unordered, ndjson_lines
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Corpo em streaming."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(lines: AsyncIterator[RawLine]) -> list[RawLine]:
+    """Consome o iterador."""
+    return [line async for line in lines]
+
+
+class TestNdjsonLines:
+    """Testes para ndjson_lines."""
+
+    async def test_lines_split_across_chunks(self) -> None:
+        """Linhas quebradas entre chunks são remontadas; vazias são puladas."""
+        lines = await _collect(
+            ndjson_lines(_chunks(b'{"a":', b'1}\n\n{"b":2}\n{"c"', b":3}"), 100)
+        )
+
+        assert lines == [
+            RawLine(1, b'{"a":1}'),
+            RawLine(3, b'{"b":2}'),
+            RawLine(4, b'{"c":3}'),
+        ]
+
+    async def test_long_line_is_flagged_and_skipped(self) -> None:
+        """Linha grande demais é sinalizada sem perder as seguintes."""
+        lines = await _collect(
+            ndjson_lines(_chunks(b"x" * 30, b"x" * 30 + b"\nok\n"), 40)
+        )
+
+        assert [(line.number, line.too_long) for line in lines] == [
+            (1, True),
+            (2, False),
+        ]
+        assert lines[1].data == b"ok"
+
+    async def test_long_line_inside_single_chunk(self) -> None:
+        """Também vale quando a linha inteira vem em um só chunk."""
+        lines = await _collect(ndjson_lines(_chunks(b"y" * 50 + b"\nok"), 40))
+
+        assert [line.too_long for line in lines] == [True, False]
+
+    async def test_long_last_line(self) -> None:
+        """Última linha sem quebra e grande demais também é sinalizada."""
+        lines = await _collect(ndjson_lines(_chunks(b"ok\n", b"z" * 50), 40))
+
+        assert [(line.number, line.too_long) for line in lines] == [
+            (1, False),
+            (2, True),
+        ]
+
+
+class TestMapUnordered:
+    """Testes para map_unordered."""
+
+    async def test_results_in_completion_order(self) -> None:
+        """Quem termina primeiro sai primeiro."""
+
+        async def work(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return delay
+
+        async def items() -> AsyncIterator[float]:
+            for delay in (0.03, 0.01, 0.02):
+                yield delay
+
+        results = [r async for r in map_unordered(items(), work, concurrency=3)]
+
+        assert results == [0.01, 0.02, 0.03]
+
+    async def test_concurrency_is_bounded(self) -> None:
+        """Nunca há mais que ``concurrency`` itens em andamento nem lidos."""
+        active = peak = read = 0
+
+        async def items() -> AsyncIterator[int]:
+            nonlocal read
+            for i in range(20):
+                read += 1
+                assert read - done <= 3
+                yield i
+
+        done = 0
+
+        async def work(item: int) -> int:
+            nonlocal active, peak, done
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            done += 1
+            return item
+
+        results = [r async for r in map_unordered(items(), work, concurrency=3)]
+
+        assert sorted(results) == list(range(20))
+        assert peak == 3
+
+    async def test_results_flow_while_input_stalls(self) -> None:
+        """Resultados prontos saem mesmo com a leitura parada."""
+        release = asyncio.Event()
+
+        async def items() -> AsyncIterator[int]:
+            yield 1
+            await release.wait()
+            yield 2
+
+        async def work(item: int) -> int:
+            return item
+
+        results = map_unordered(items(), work, concurrency=4)
+
+        assert await asyncio.wait_for(anext(results), timeout=1) == 1
+        release.set()
+        assert [r async for r in results] == [2]
+
+    async def test_closing_cancels_running_tasks(self) -> None:
+        """Abandonar o iterador (cliente desconectou) cancela o trabalho."""
+        cancelled = 0
+
+        async def items() -> AsyncIterator[float]:
+            for delay in (10, 10, 0.0):
+                yield delay
+
+        async def work(delay: float) -> float:
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return delay
+
+        results = map_unordered(items(), work, concurrency=3)
+        assert await anext(results) == 0.0
+        await results.aclose()
+
+        assert cancelled == 2
+
+    async def test_errors_propagate(self) -> None:
+        """Exceções não tratadas em ``func`` chegam ao consumidor."""
+
+        async def items() -> AsyncIterator[int]:
+            yield 1
+
+        async def work(_item: int) -> int:
+            raise RuntimeError("falhou")
+
+        with pytest.raises(RuntimeError, match="falhou"):
+            [r async for r in map_unordered(items(), work, concurrency=2)]
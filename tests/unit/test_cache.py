@@ -1,12 +1,83 @@
 """Testes unitários para cache.py."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock
+import time
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import redis.asyncio as redis
 
 from extractor.config import Settings
-from extractor.core.cache import CacheService
+from extractor.core.bloom import BloomFilter
+from extractor.core.cache import (
+    BLOOM_CHANNEL,
+    CacheEntry,
+    CacheService,
+    schema_key_pattern,
+)
+from extractor.core.local_cache import LocalCache
+from extractor.core.write_behind import WriteBehindQueue
+
+
+def _scan_results(keys: list[str]) -> MagicMock:
+    """Simula scan_iter retornando as chaves informadas."""
+
+    async def scan_iter(**_kwargs: object) -> AsyncIterator[str]:
+        for key in keys:
+            yield key
+
+    return MagicMock(side_effect=scan_iter)
+
+
+def _pipeline(mock_redis: AsyncMock) -> MagicMock:
+    """Configura pipeline cujo UNLINK remove todas as chaves enviadas."""
+    pipe = MagicMock()
+    calls: list[int] = []
+    pipe.unlink.side_effect = lambda *keys: calls.append(len(keys))
+
+    async def execute() -> list[int]:
+        result = list(calls)
+        calls.clear()
+        return result
+
+    pipe.execute = AsyncMock(side_effect=execute)
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
+class TestCacheEntry:
+    """Testes para CacheEntry."""
+
+    def test_encode_decode_roundtrip(self) -> None:
+        """Entrada serializada volta igual."""
+        entry = CacheEntry(payload='{"a": "x;y"}', expires_at=123.5, delta=2.25)
+
+        assert CacheEntry.decode(entry.encode()) == entry
+
+    def test_decode_legacy_json(self) -> None:
+        """Valores antigos (só JSON) nunca expiram logicamente."""
+        entry = CacheEntry.decode('{"nome": "João"}')
+
+        assert entry.data == {"nome": "João"}
+        assert not entry.is_expired(time.time())
+        assert not entry.should_refresh_early(time.time(), beta=1.0)
+
+    def test_xfetch_refreshes_close_to_expiry(self) -> None:
+        """Valor caro perto da expiração é sempre recomputado cedo."""
+        now = time.time()
+        entry = CacheEntry(payload="{}", expires_at=now + 0.001, delta=1000.0)
+
+        assert entry.should_refresh_early(now, beta=1.0)
+
+    def test_xfetch_disabled_with_zero_beta(self) -> None:
+        """beta=0 desativa o refresh antecipado."""
+        now = time.time()
+        entry = CacheEntry(payload="{}", expires_at=now + 0.001, delta=1000.0)
+
+        assert not entry.should_refresh_early(now, beta=0)
 
 
 class TestCacheService:
@@ -43,6 +114,20 @@ class TestCacheService:
 
         assert key1 != key2
 
+    def test_generate_key_includes_schema(self) -> None:
+        """Chave carrega o nome do schema para purge seletivo."""
+        service = CacheService(Settings(cache_enabled=True))
+
+        key = service._generate_key("texto", "Fatura")
+
+        assert key.startswith("extract:Fatura:")
+
+    def test_schema_key_pattern_escapes_glob(self) -> None:
+        """Caracteres especiais de glob no nome do schema são escapados."""
+        assert schema_key_pattern() == "extract:*"
+        assert schema_key_pattern("Fatura") == "extract:Fatura:*"
+        assert schema_key_pattern("A*[b]") == "extract:A\\*\\[b\\]:*"
+
     @pytest.mark.asyncio
     async def test_get_returns_none_when_disabled(self) -> None:
         """get() retorna None quando cache desabilitado."""
@@ -76,6 +161,18 @@ class TestCacheService:
 
         assert result == cached_data
 
+    @pytest.mark.asyncio
+    async def test_get_raw_returns_stored_json(
+        self, cache_service: CacheService
+    ) -> None:
+        """get_raw() retorna o JSON armazenado sem desserializar."""
+        entry = CacheEntry(payload='{"nome":"João"}', expires_at=time.time() + 60)
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            return_value=entry.encode()
+        )
+
+        assert await cache_service.get_raw("texto", "Schema") == '{"nome":"João"}'
+
     @pytest.mark.asyncio
     async def test_get_returns_none_on_miss(self, cache_service: CacheService) -> None:
         """get() retorna None quando não encontrado."""
@@ -107,6 +204,42 @@ class TestCacheService:
 
         cache_service._redis.setex.assert_called_once()  # type: ignore[union-attr]
 
+    @pytest.mark.asyncio
+    async def test_set_failure_uses_negative_ttl(
+        self, cache_service: CacheService
+    ) -> None:
+        """set_failure() grava motivo com TTL curto em chave própria."""
+        cache_service.settings.cache_negative_ttl_seconds = 60
+
+        await cache_service.set_failure("texto", "Fatura", "sem fatura")
+
+        key, ttl, value = cache_service._redis.setex.call_args.args  # type: ignore[union-attr]
+        assert key == cache_service._generate_key("texto", "Fatura") + ":neg"
+        assert ttl == 60
+        assert json.loads(value) == {"error": "sem fatura"}
+
+    @pytest.mark.asyncio
+    async def test_set_failure_disabled_with_zero_ttl(
+        self, cache_service: CacheService
+    ) -> None:
+        """TTL negativo 0 desativa o cache negativo."""
+        cache_service.settings.cache_negative_ttl_seconds = 0
+
+        await cache_service.set_failure("texto", "Fatura", "erro")
+
+        cache_service._redis.setex.assert_not_called()  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_get_failure_returns_reason(
+        self, cache_service: CacheService
+    ) -> None:
+        """get_failure() retorna o motivo armazenado."""
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            return_value=json.dumps({"error": "sem fatura"})
+        )
+
+        assert await cache_service.get_failure("texto", "Fatura") == "sem fatura"
+
     @pytest.mark.asyncio
     async def test_delete_returns_false_when_disabled(self) -> None:
         """delete() retorna False quando cache desabilitado."""
@@ -127,6 +260,41 @@ class TestCacheService:
         assert result is True
         cache_service._redis.delete.assert_called_once()  # type: ignore[union-attr]
 
+    @pytest.mark.asyncio
+    async def test_connect_sets_socket_timeouts(self) -> None:
+        """Conexão usa timeouts curtos configuráveis."""
+        settings = Settings(
+            cache_enabled=True,
+            redis_socket_timeout=0.1,
+            redis_connect_timeout=0.2,
+            cache_write_behind=False,
+        )
+        service = CacheService(settings)
+
+        with patch("extractor.core.cache.redis.from_url") as from_url:
+            await service.connect()
+
+        kwargs = from_url.call_args.kwargs
+        assert kwargs["socket_timeout"] == 0.1
+        assert kwargs["socket_connect_timeout"] == 0.2
+
+    @pytest.mark.asyncio
+    async def test_breaker_skips_redis_after_failures(
+        self, cache_service: CacheService
+    ) -> None:
+        """Com o circuito aberto o Redis não é chamado."""
+        cache_service._breaker.failure_threshold = 2
+        cache_service._breaker.cooldown = 3600
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            side_effect=redis.TimeoutError("timeout")
+        )
+
+        for _ in range(5):
+            assert await cache_service.get("texto", "Schema") is None
+
+        assert cache_service._redis.get.await_count == 2  # type: ignore[union-attr]
+        assert cache_service._breaker.is_open
+
     @pytest.mark.asyncio
     async def test_health_check_returns_false_when_no_redis(self) -> None:
         """health_check() retorna False quando não conectado."""
@@ -146,3 +314,733 @@ class TestCacheService:
         result = await cache_service.health_check()
 
         assert result is True
+
+    @pytest.mark.asyncio
+    async def test_clear_all_unlinks_in_batches(
+        self, cache_service: CacheService
+    ) -> None:
+        """clear_all() remove chaves em lotes via UNLINK com progresso."""
+        redis_mock = cache_service._redis
+        redis_mock.scan_iter = _scan_results(  # type: ignore[union-attr]
+            [f"extract:S:{i}" for i in range(5)]
+        )
+        pipe = _pipeline(redis_mock)  # type: ignore[arg-type]
+        progress: list[int] = []
+
+        deleted = await cache_service.clear_all(
+            batch_size=2, on_progress=progress.append
+        )
+
+        assert deleted == 5
+        assert progress == [2, 4, 5]
+        assert pipe.execute.await_count == 3
+        redis_mock.delete.assert_not_called()  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_purge_schema_scans_schema_pattern(
+        self, cache_service: CacheService
+    ) -> None:
+        """purge_schema() só percorre as chaves do schema."""
+        redis_mock = cache_service._redis
+        redis_mock.scan_iter = _scan_results(  # type: ignore[union-attr]
+            ["extract:Fatura:abc"]
+        )
+        _pipeline(redis_mock)  # type: ignore[arg-type]
+
+        deleted = await cache_service.purge_schema("Fatura")
+
+        assert deleted == 1
+        redis_mock.scan_iter.assert_called_once_with(  # type: ignore[union-attr]
+            match="extract:Fatura:*",
+            count=cache_service.settings.cache_clear_batch_size,
+        )
+
+    @pytest.mark.asyncio
+    async def test_clear_all_returns_partial_count_on_error(
+        self, cache_service: CacheService
+    ) -> None:
+        """Erro no meio da limpeza retorna o que já foi removido."""
+        redis_mock = cache_service._redis
+
+        async def scan_iter(**_kwargs: object) -> AsyncIterator[str]:
+            yield "extract:S:1"
+            yield "extract:S:2"
+            raise redis.RedisError("boom")
+
+        redis_mock.scan_iter = MagicMock(side_effect=scan_iter)  # type: ignore[union-attr]
+        _pipeline(redis_mock)  # type: ignore[arg-type]
+
+        deleted = await cache_service.clear_all(batch_size=2)
+
+        assert deleted == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_all_returns_zero_when_disabled(self) -> None:
+        """clear_all() retorna 0 quando cache desabilitado."""
+        service = CacheService(Settings(cache_enabled=False))
+
+        assert await service.clear_all() == 0
+
+    @pytest.mark.asyncio
+    async def test_set_applies_ttl_jitter(self, cache_service: CacheService) -> None:
+        """TTL varia dentro da faixa de jitter."""
+        cache_service.settings.cache_ttl_seconds = 1000
+        cache_service.settings.cache_ttl_jitter = 0.1
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        ttls = set()
+        for _ in range(20):
+            await cache_service.set("texto", "Schema", mock_model)
+            ttls.add(cache_service._redis.setex.call_args.args[1])  # type: ignore[union-attr]
+
+        assert all(900 <= ttl <= 1100 for ttl in ttls)
+        assert len(ttls) > 1
+
+    @pytest.mark.asyncio
+    async def test_set_extends_ttl_for_stale_window(
+        self, cache_service: CacheService
+    ) -> None:
+        """Com stale-while-revalidate a chave vive além da expiração lógica."""
+        cache_service.settings.cache_ttl_seconds = 100
+        cache_service.settings.cache_ttl_jitter = 0
+        cache_service.settings.cache_stale_while_revalidate = True
+        cache_service.settings.cache_stale_ttl_seconds = 50
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        await cache_service.set("texto", "Schema", mock_model, delta=1.5)
+
+        _, ttl, value = cache_service._redis.setex.call_args.args  # type: ignore[union-attr]
+        entry = CacheEntry.decode(value)
+        assert ttl == 150
+        assert entry.delta == 1.5
+        assert entry.expires_at == pytest.approx(time.time() + 100, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_get_expired_entry_is_miss(self, cache_service: CacheService) -> None:
+        """Entrada vencida sem stale-while-revalidate é miss."""
+        entry = CacheEntry(payload="{}", expires_at=time.time() - 1)
+        cache_service._redis.get = AsyncMock(return_value=entry.encode())  # type: ignore[union-attr]
+
+        assert await cache_service.get("texto", "Schema") is None
+
+    @pytest.mark.asyncio
+    async def test_get_serves_stale_and_refreshes_once(
+        self, cache_service: CacheService
+    ) -> None:
+        """Entrada vencida é servida e atualizada uma única vez em background."""
+        cache_service.settings.cache_stale_while_revalidate = True
+        entry = CacheEntry(payload='{"v": 1}', expires_at=time.time() - 1)
+        cache_service._redis.get = AsyncMock(return_value=entry.encode())  # type: ignore[union-attr]
+        cache_service._redis.set = AsyncMock(return_value=True)  # type: ignore[union-attr]
+
+        fresh = MagicMock()
+        fresh.model_dump_json.return_value = '{"v": 2}'
+        release = asyncio.Event()
+
+        async def refresh() -> tuple[MagicMock, float]:
+            await release.wait()
+            return fresh, 0.5
+
+        refresher = AsyncMock(side_effect=refresh)
+
+        first = await cache_service.get("texto", "Schema", refresh=refresher)
+        second = await cache_service.get("texto", "Schema", refresh=refresher)
+        release.set()
+        await asyncio.gather(*cache_service._refreshing.values())
+
+        assert first == second == {"v": 1}
+        refresher.assert_awaited_once()
+        value = cache_service._redis.setex.call_args.args[2]  # type: ignore[union-attr]
+        assert CacheEntry.decode(value).data == {"v": 2}
+        assert cache_service._refreshing == {}
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_when_other_replica_holds_lock(
+        self, cache_service: CacheService
+    ) -> None:
+        """Sem a trava no Redis o refresh não roda."""
+        cache_service.settings.cache_stale_while_revalidate = True
+        entry = CacheEntry(payload="{}", expires_at=time.time() - 1)
+        cache_service._redis.get = AsyncMock(return_value=entry.encode())  # type: ignore[union-attr]
+        cache_service._redis.set = AsyncMock(return_value=None)  # type: ignore[union-attr]
+        refresher = AsyncMock()
+
+        await cache_service.get("texto", "Schema", refresh=refresher)
+        await asyncio.gather(*cache_service._refreshing.values())
+
+        refresher.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_counters_track_hits_misses_and_sets(
+        self, cache_service: CacheService
+    ) -> None:
+        """Contadores são separados por schema."""
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            side_effect=[None, json.dumps({"a": 1})]
+        )
+
+        await cache_service.get("texto", "Fatura")
+        await cache_service.set("texto", "Fatura", mock_model)
+        await cache_service.get("texto", "Fatura")
+
+        assert cache_service.counters() == {
+            "Fatura": {"misses": 1, "sets": 1, "hits": 1}
+        }
+
+    @pytest.mark.asyncio
+    async def test_counters_track_errors(self, cache_service: CacheService) -> None:
+        """Erros do Redis são contados."""
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            side_effect=redis.RedisError("down")
+        )
+
+        await cache_service.get("texto", "Pessoa")
+
+        # Lookup com erro também conta como miss (a request vai ao LLM)
+        assert cache_service.counters() == {"Pessoa": {"errors": 1, "misses": 1}}
+
+    @pytest.mark.asyncio
+    async def test_sample_keys_groups_by_schema(
+        self, cache_service: CacheService
+    ) -> None:
+        """Amostra agrupa memória e TTL por schema."""
+        redis_mock = cache_service._redis
+        redis_mock.scan_iter = _scan_results(  # type: ignore[union-attr]
+            ["extract:Fatura:a", "extract:Fatura:b", "extract:Pessoa:c"]
+        )
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[100, 10, 300, 30, 50, -1])
+        redis_mock.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+
+        sample = await cache_service.sample_keys(sample_size=10)
+
+        assert sample["exact"] is True
+        fatura = sample["schemas"]["Fatura"]
+        assert fatura["sampled_keys"] == fatura["estimated_keys"] == 2
+        assert fatura["avg_bytes"] == 200
+        assert fatura["ttl_seconds"] == {"min": 10, "p50": 10, "p90": 30, "max": 30}
+        assert sample["schemas"]["Pessoa"]["ttl_seconds"] == {}
+
+    @pytest.mark.asyncio
+    async def test_sample_keys_extrapolates_partial_scan(
+        self, cache_service: CacheService
+    ) -> None:
+        """Varredura incompleta extrapola contagens pelo DBSIZE."""
+        redis_mock = cache_service._redis
+        redis_mock.scan_iter = _scan_results(  # type: ignore[union-attr]
+            ["extract:Fatura:a", "extract:Fatura:b", "extract:Fatura:c"]
+        )
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[10, 5, 10, 5])
+        redis_mock.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        redis_mock.dbsize = AsyncMock(return_value=100)  # type: ignore[union-attr]
+
+        sample = await cache_service.sample_keys(sample_size=2)
+
+        assert sample["exact"] is False
+        assert sample["schemas"]["Fatura"]["estimated_keys"] == 100
+        assert sample["schemas"]["Fatura"]["estimated_bytes"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_sample_keys_scales_by_entry_ratio(
+        self, cache_service: CacheService
+    ) -> None:
+        """Travas, negativos e chaves de outros domínios não inflam a estimativa."""
+        redis_mock = cache_service._redis
+        redis_mock.scan_iter = _scan_results(  # type: ignore[union-attr]
+            [
+                "ratelimit:ip:10.0.0.1",
+                "extract:Fatura:a",
+                "extract:Fatura:a:lock",
+                "idempotency:k",
+                "extract:Fatura:b:neg",
+                "extract:Fatura:c",
+                "extract:Fatura:d",
+            ]
+        )
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[10, 5, 10, 5])
+        redis_mock.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        redis_mock.dbsize = AsyncMock(return_value=60)  # type: ignore[union-attr]
+
+        sample = await cache_service.sample_keys(sample_size=2)
+
+        assert sample["exact"] is False
+        # 2 entradas em 6 chaves visitadas: 1/3 do DBSIZE
+        assert sample["schemas"]["Fatura"]["estimated_keys"] == 20
+        assert sample["schemas"]["Fatura"]["sampled_keys"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_many_returns_by_position(
+        self, cache_service: CacheService
+    ) -> None:
+        """get_many() usa um MGET e mantém a ordem dos itens."""
+        fresh = CacheEntry(payload='{"v": 1}', expires_at=time.time() + 60)
+        expired = CacheEntry(payload='{"v": 2}', expires_at=time.time() - 1)
+        cache_service._redis.mget = AsyncMock(  # type: ignore[union-attr]
+            return_value=[None, fresh.encode(), expired.encode()]
+        )
+
+        results = await cache_service.get_many(
+            [("a", "Pessoa"), ("b", "Pessoa"), ("c", "Fatura")]
+        )
+
+        assert results == [None, {"v": 1}, None]
+        cache_service._redis.mget.assert_awaited_once()  # type: ignore[union-attr]
+        assert cache_service.counters()["Pessoa"] == {"misses": 1, "hits": 1}
+
+    @pytest.mark.asyncio
+    async def test_set_many_pipelines_set_ex(self, cache_service: CacheService) -> None:
+        """set_many() envia SET EX em um único pipeline."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        model = MagicMock()
+        model.model_dump_json.return_value = "{}"
+
+        await cache_service.set_many([("a", "Pessoa", model), ("b", "Fatura", model)])
+
+        assert pipe.set.call_count == 2
+        assert pipe.set.call_args.kwargs["ex"] > 0
+        pipe.execute.assert_awaited_once()
+        assert cache_service.counters()["Fatura"] == {"sets": 1}
+
+    @pytest.mark.asyncio
+    async def test_exists_many_returns_flags(self, cache_service: CacheService) -> None:
+        """exists_many() retorna um booleano por item."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1, 0])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+
+        found = await cache_service.exists_many([("a", "Pessoa"), ("b", "Pessoa")])
+
+        assert found == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_bulk_operations_when_disabled(self) -> None:
+        """Operações em lote são no-op com cache desabilitado."""
+        service = CacheService(Settings(cache_enabled=False))
+
+        assert await service.get_many([("a", "S")]) == [None]
+        assert await service.exists_many([("a", "S")]) == [False]
+
+
+class TestExportImport:
+    """Testes de exportação/importação de entradas."""
+
+    @pytest.mark.asyncio
+    async def test_export_streams_values_with_ttl(
+        self, cache_service: CacheService
+    ) -> None:
+        """GET + PTTL em pipeline por lote; travas e chaves vencidas ficam fora."""
+        cache_service._redis.scan_iter = _scan_results(  # type: ignore[union-attr]
+            ["extract:S:a", "extract:S:a:lock", "extract:S:b", "extract:S:c"]
+        )
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(
+            side_effect=[["va", 5000, None, -2], ["vc", -1]],
+        )
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+
+        entries = [e async for e in cache_service.export_entries(batch_size=2)]
+
+        assert entries == [("extract:S:a", "va", 5000), ("extract:S:c", "vc", None)]
+        assert pipe.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_import_pipelines_set_px(self, cache_service: CacheService) -> None:
+        """Importação grava em lotes com SET PX NX e conta só o que gravou."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=[[True, None], [True]])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        progress: list[int] = []
+
+        written = await cache_service.import_entries(
+            iter([("k1", "v1", 1000), ("k2", "v2", 2000), ("k3", "v3", None)]),
+            batch_size=2,
+            on_progress=progress.append,
+        )
+
+        assert written == 2
+        assert progress == [1, 2]
+        pipe.set.assert_any_call("k1", "v1", px=1000, nx=True)
+        pipe.set.assert_any_call("k3", "v3", px=None, nx=True)
+
+    @pytest.mark.asyncio
+    async def test_import_replace_overwrites(self, cache_service: CacheService) -> None:
+        """Com replace=True as chaves existentes são sobrescritas."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+
+        await cache_service.import_entries([("k1", "v1", 1000)], replace=True)
+
+        pipe.set.assert_called_once_with("k1", "v1", px=1000, nx=False)
+
+
+class TestWriteBehind:
+    """Testes da escrita em background."""
+
+    @pytest.fixture
+    def pipe(self, cache_service: CacheService) -> MagicMock:
+        """Pipeline mockado e writer ativo."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        cache_service._writer = WriteBehindQueue(cache_service._flush_writes)
+        return pipe
+
+    @pytest.mark.asyncio
+    async def test_set_enqueues_without_touching_redis(
+        self, cache_service: CacheService, pipe: MagicMock
+    ) -> None:
+        """set retorna sem ida ao Redis; o writer grava depois."""
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = '{"nome": "João"}'
+
+        await cache_service.set("texto", "Pessoa", mock_model)
+
+        cache_service._redis.setex.assert_not_called()  # type: ignore[union-attr]
+        pipe.setex.assert_not_called()
+        assert cache_service._writer is not None
+        assert cache_service._writer.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_writer_pipelines_setex_and_drains(
+        self, cache_service: CacheService, pipe: MagicMock
+    ) -> None:
+        """Escritas pendentes viram SETEX em pipeline e são drenadas no close."""
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+        assert cache_service._writer is not None
+        cache_service._writer.start()
+
+        await cache_service.set("a", "Pessoa", mock_model)
+        await cache_service.set("b", "Pessoa", mock_model)
+        await cache_service._writer.close()
+
+        assert pipe.setex.call_count == 2
+        assert cache_service.counters()["Pessoa"]["sets"] == 2
+
+    @pytest.mark.asyncio
+    async def test_overflow_is_dropped_and_counted(
+        self, cache_service: CacheService
+    ) -> None:
+        """Fila cheia descarta a escrita em vez de segurar a request."""
+        cache_service._writer = WriteBehindQueue(cache_service._flush_writes, maxsize=1)
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        await cache_service.set("a", "Pessoa", mock_model)
+        await cache_service.set("b", "Pessoa", mock_model)
+
+        assert cache_service.counters()["Pessoa"]["dropped_writes"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("pipe")
+    async def test_wait_writes_through_the_queue(
+        self, cache_service: CacheService
+    ) -> None:
+        """set(wait=True), usado pelo refresh, grava antes de retornar."""
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        await cache_service.set("a", "Pessoa", mock_model, wait=True)
+
+        cache_service._redis.setex.assert_awaited_once()  # type: ignore[union-attr]
+        assert cache_service._writer is not None
+        assert cache_service._writer.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_counts_errors(
+        self, cache_service: CacheService, pipe: MagicMock
+    ) -> None:
+        """Erro no pipeline é contabilizado e não conta como set."""
+        pipe.execute = AsyncMock(side_effect=redis.RedisError("down"))
+
+        await cache_service._flush_writes([("Pessoa", "k", "v", 60)])
+
+        counters = cache_service.counters()["Pessoa"]
+        assert counters["errors"] == 1
+        assert "sets" not in counters
+
+
+class TestBloomFilter:
+    """Testes do Bloom filter de chaves escritas."""
+
+    @pytest.fixture
+    def bloom(self, cache_service: CacheService) -> BloomFilter:
+        """Filtro pronto e vazio."""
+        cache_service._bloom = BloomFilter(capacity=1000)
+        cache_service._bloom_ready = True
+        return cache_service._bloom
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_skips_redis(
+        self, cache_service: CacheService, bloom: BloomFilter
+    ) -> None:
+        """Chave nunca escrita é miss sem GET."""
+        result = await cache_service.get("texto novo", "Pessoa")
+
+        assert result is None
+        cache_service._redis.get.assert_not_called()  # type: ignore[union-attr]
+        assert cache_service.counters()["Pessoa"]["bloom_skips"] == 1
+        assert bloom.count == 0
+
+    @pytest.mark.asyncio
+    async def test_known_key_reads_redis(
+        self, cache_service: CacheService, bloom: BloomFilter
+    ) -> None:
+        """Chave presente no filtro vai ao Redis."""
+        bloom.add(cache_service._generate_key("texto", "Pessoa"))
+        cache_service._redis.get = AsyncMock(return_value='{"nome": "João"}')  # type: ignore[union-attr]
+
+        assert await cache_service.get("texto", "Pessoa") == {"nome": "João"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("bloom")
+    async def test_not_ready_filter_is_ignored(
+        self, cache_service: CacheService
+    ) -> None:
+        """Durante a reconstrução toda chave é consultada no Redis."""
+        cache_service._bloom_ready = False
+        cache_service._redis.get = AsyncMock(return_value=None)  # type: ignore[union-attr]
+
+        await cache_service.get("texto", "Pessoa")
+
+        cache_service._redis.get.assert_called_once()  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_set_adds_and_publishes_key(
+        self, cache_service: CacheService, bloom: BloomFilter
+    ) -> None:
+        """Escrita registra a chave e a anuncia às outras réplicas."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, 1])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        await cache_service.set("texto", "Pessoa", mock_model)
+
+        key = cache_service._generate_key("texto", "Pessoa")
+        assert key in bloom
+        pipe.publish.assert_called_once_with(BLOOM_CHANNEL, key)
+
+    @pytest.mark.asyncio
+    async def test_exists_many_only_checks_candidates(
+        self, cache_service: CacheService, bloom: BloomFilter
+    ) -> None:
+        """EXISTS em pipeline só para chaves que podem existir."""
+        bloom.add(cache_service._generate_key("b", "Pessoa"))
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1])
+        cache_service._redis.pipeline = MagicMock(return_value=pipe)  # type: ignore[union-attr]
+
+        found = await cache_service.exists_many([("a", "Pessoa"), ("b", "Pessoa")])
+
+        assert found == [False, True]
+        assert pipe.exists.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_rebuilds_from_scan_and_pubsub(
+        self, cache_service: CacheService
+    ) -> None:
+        """Reconstrução via SCAN e atualização por mensagens de outras réplicas."""
+        cache_service._bloom = BloomFilter(capacity=1000)
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.get_message = AsyncMock(
+            side_effect=[
+                {"data": "extract:Pessoa:b\nextract:Pessoa:c"},
+                redis.ConnectionError("down"),
+            ]
+        )
+        cache_service._redis.pubsub = MagicMock(return_value=pubsub)  # type: ignore[union-attr]
+        cache_service._redis.scan_iter = _scan_results(["extract:Pessoa:a"])  # type: ignore[union-attr]
+
+        with (
+            patch(
+                "extractor.core.cache.asyncio.sleep",
+                AsyncMock(side_effect=asyncio.CancelledError),
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await cache_service._bloom_sync()
+
+        assert all(
+            f"extract:Pessoa:{k}" in cache_service._bloom for k in ("a", "b", "c")
+        )
+        assert cache_service._bloom_ready is False
+        pubsub.subscribe.assert_called_once_with(BLOOM_CHANNEL)
+
+    @pytest.mark.asyncio
+    async def test_sync_rebuilds_periodically_to_drop_expired_keys(
+        self, cache_service: CacheService
+    ) -> None:
+        """Após cache_ttl_seconds o filtro é trocado por um montado do zero."""
+        cache_service._bloom = BloomFilter(capacity=1000)
+        cache_service.settings.cache_ttl_seconds = 0
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        cache_service._redis.pubsub = MagicMock(return_value=pubsub)  # type: ignore[union-attr]
+        scans = iter([["extract:Pessoa:a"], ["extract:Pessoa:b"]])
+        filters: list[BloomFilter] = []
+
+        async def scan_iter(**_kwargs: object) -> AsyncIterator[str]:
+            assert cache_service._bloom is not None
+            filters.append(cache_service._bloom)
+            keys = next(scans, None)
+            if keys is None:
+                raise asyncio.CancelledError
+            for key in keys:
+                yield key
+
+        cache_service._redis.scan_iter = MagicMock(side_effect=scan_iter)  # type: ignore[union-attr]
+
+        with pytest.raises(asyncio.CancelledError):
+            await cache_service._bloom_sync()
+
+        assert "extract:Pessoa:a" not in cache_service._bloom
+        assert "extract:Pessoa:b" in cache_service._bloom
+        assert cache_service._bloom_ready is True
+        # O filtro anterior segue em uso enquanto o novo é montado
+        assert "extract:Pessoa:a" in filters[1]
+
+    def test_outdated_when_filter_passes_capacity(
+        self, cache_service: CacheService
+    ) -> None:
+        """Filtro que estourou a capacidade depois de montado é reconstruído."""
+        cache_service._bloom = BloomFilter(capacity=2)
+        for key in "abc":
+            cache_service._bloom.add(key)
+        cache_service.settings.cache_ttl_seconds = 86_400
+        long_ago = time.monotonic() - 3600
+
+        # Reconstrução recente: espera o intervalo mínimo
+        assert cache_service._bloom_outdated(time.monotonic(), built_keys=1) is False
+        assert cache_service._bloom_outdated(long_ago, built_keys=1) is True
+        # Montado já acima da capacidade: reconstruir não ajudaria
+        assert cache_service._bloom_outdated(long_ago, built_keys=3) is False
+
+    @pytest.mark.asyncio
+    async def test_sync_survives_unexpected_errors(
+        self, cache_service: CacheService
+    ) -> None:
+        """Erro fora do Redis desativa o filtro e a sincronização recomeça."""
+        cache_service._bloom = BloomFilter(capacity=1000)
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock(side_effect=RuntimeError("fechada"))
+        pubsub.get_message = AsyncMock(return_value={"data": None})
+        cache_service._redis.pubsub = MagicMock(return_value=pubsub)  # type: ignore[union-attr]
+        cache_service._redis.scan_iter = _scan_results([])  # type: ignore[union-attr]
+
+        with (
+            patch(
+                "extractor.core.cache.asyncio.sleep",
+                AsyncMock(side_effect=[None, asyncio.CancelledError]),
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await cache_service._bloom_sync()
+
+        assert cache_service._bloom_ready is False
+        assert pubsub.subscribe.await_count == 2
+
+
+class TestLocalCacheTier:
+    """Testes do cache local como fallback / write-through."""
+
+    @pytest.fixture
+    def local(self, tmp_path: Path) -> Iterator[LocalCache]:
+        """Cache local em arquivo temporário."""
+        local = LocalCache(tmp_path / "cache.db")
+        local.open()
+        yield local
+        local.close()
+
+    @pytest.mark.asyncio
+    async def test_fallback_serves_from_local_when_redis_fails(
+        self, cache_service: CacheService, local: LocalCache
+    ) -> None:
+        """Com o Redis fora, escrita e leitura usam o disco."""
+        cache_service._local = local
+        cache_service._redis.get = AsyncMock(  # type: ignore[union-attr]
+            side_effect=redis.RedisError("down")
+        )
+        cache_service._redis.setex = AsyncMock(  # type: ignore[union-attr]
+            side_effect=redis.RedisError("down")
+        )
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = '{"nome": "João"}'
+
+        await cache_service.set("texto", "Pessoa", mock_model)
+        result = await cache_service.get("texto", "Pessoa")
+
+        assert result == {"nome": "João"}
+        assert cache_service.counters()["Pessoa"]["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exists_checks_local_when_redis_fails(
+        self, cache_service: CacheService, local: LocalCache
+    ) -> None:
+        """exists() cai para o disco como get() e exists_many()."""
+        cache_service._local = local
+        await local.set(cache_service._generate_key("texto", "Pessoa"), "{}", 60)
+        cache_service._redis.exists = AsyncMock(  # type: ignore[union-attr]
+            side_effect=redis.RedisError("down")
+        )
+
+        assert await cache_service.exists("texto", "Pessoa") is True
+        assert await cache_service.exists("outro", "Pessoa") is False
+
+    @pytest.mark.asyncio
+    async def test_fallback_skips_local_when_redis_healthy(
+        self, cache_service: CacheService, local: LocalCache
+    ) -> None:
+        """No modo fallback o disco não é escrito com Redis saudável."""
+        cache_service._local = local
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = "{}"
+
+        await cache_service.set("texto", "Pessoa", mock_model)
+
+        key = cache_service._generate_key("texto", "Pessoa")
+        assert await local.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_write_through_reads_local_on_redis_miss(
+        self, cache_service: CacheService, local: LocalCache
+    ) -> None:
+        """No modo write_through misses do Redis consultam o disco."""
+        cache_service._local = local
+        cache_service.settings.local_cache_mode = "write_through"
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = '{"v": 1}'
+
+        await cache_service.set("texto", "Pessoa", mock_model)
+        result = await cache_service.get("texto", "Pessoa")
+
+        cache_service._redis.setex.assert_called_once()  # type: ignore[union-attr]
+        assert result == {"v": 1}
+
+    @pytest.mark.asyncio
+    async def test_works_without_redis(self, local: LocalCache) -> None:
+        """Sem Redis configurado o cache local atende sozinho."""
+        service = CacheService(Settings(cache_enabled=True))
+        service._local = local
+        mock_model = MagicMock()
+        mock_model.model_dump_json.return_value = '{"v": 2}'
+
+        await service.set("texto", "Pessoa", mock_model)
+
+        assert await service.get("texto", "Pessoa") == {"v": 2}
+        assert await service.purge_schema("Pessoa") == 1
+        assert await service.get("texto", "Pessoa") is None
@@ -0,0 +1,92 @@
+"""Testes unitários para circuit_breaker.py."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from extractor.core.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Testes para CircuitBreaker."""
+
+    def test_starts_closed(self) -> None:
+        """Circuito começa fechado."""
+        breaker = CircuitBreaker("t", probe=AsyncMock(return_value=True))
+
+        assert breaker.allow() is True
+        assert breaker.is_open is False
+
+    def test_opens_after_threshold(self) -> None:
+        """Abre após falhas consecutivas."""
+        breaker = CircuitBreaker(
+            "t", probe=AsyncMock(return_value=True), failure_threshold=3
+        )
+
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow() is True
+        breaker.record_failure()
+
+        assert breaker.is_open is True
+        assert breaker.allow() is False
+
+    def test_success_resets_failures(self) -> None:
+        """Sucesso zera a contagem de falhas."""
+        breaker = CircuitBreaker(
+            "t", probe=AsyncMock(return_value=True), failure_threshold=2
+        )
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.is_open is False
+
+    @pytest.mark.asyncio
+    async def test_probe_closes_after_cooldown(self) -> None:
+        """Probe bem-sucedido em background fecha o circuito."""
+        probe = AsyncMock(return_value=True)
+        breaker = CircuitBreaker("t", probe=probe, failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        assert breaker.allow() is False
+        assert breaker._probe_task is not None
+        await breaker._probe_task
+
+        probe.assert_awaited_once()
+        assert breaker.allow() is True
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_keeps_open(self) -> None:
+        """Probe com falha mantém o circuito aberto."""
+        probe = AsyncMock(side_effect=ConnectionError("down"))
+        breaker = CircuitBreaker("t", probe=probe, failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        breaker.allow()
+        assert breaker._probe_task is not None
+        await breaker._probe_task
+
+        assert breaker.is_open is True
+
+    @pytest.mark.asyncio
+    async def test_single_probe_at_a_time(self) -> None:
+        """Só um probe roda por vez."""
+        release = asyncio.Event()
+
+        async def probe() -> bool:
+            await release.wait()
+            return True
+
+        breaker = CircuitBreaker("t", probe=probe, failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+
+        breaker.allow()
+        task = breaker._probe_task
+        breaker.allow()
+
+        assert breaker._probe_task is task
+        release.set()
+        await breaker.close()
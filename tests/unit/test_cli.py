@@ -0,0 +1,140 @@
+"""Testes unitários para cli.py."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.cli import build_parser, main
+from extractor.core.cache import ExportedEntry
+from extractor.core.snapshot import SnapshotReader
+
+
+class TestParser:
+    """Testes para o parser de argumentos."""
+
+    def test_cache_clear_defaults(self) -> None:
+        """`cache clear` sem opções limpa tudo."""
+        args = build_parser().parse_args(["cache", "clear"])
+
+        assert args.schema is None
+        assert args.batch_size is None
+
+    def test_cache_clear_with_schema(self) -> None:
+        """`cache clear --schema` restringe ao schema."""
+        args = build_parser().parse_args(
+            ["cache", "clear", "--schema", "Fatura", "--batch-size", "50"]
+        )
+
+        assert args.schema == "Fatura"
+        assert args.batch_size == 50
+
+    def test_requires_command(self) -> None:
+        """Comando é obrigatório."""
+        with pytest.raises(SystemExit):
+            build_parser().parse_args([])
+
+
+class TestCacheClear:
+    """Testes para `extractor cache clear`."""
+
+    def test_purges_schema(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Com --schema chama purge_schema."""
+        cache = MagicMock()
+        cache.connect = AsyncMock()
+        cache.disconnect = AsyncMock()
+        cache.purge_schema = AsyncMock(return_value=7)
+
+        with patch("extractor.cli.CacheService", return_value=cache):
+            exit_code = main(["cache", "clear", "--schema", "Fatura"])
+
+        assert exit_code == 0
+        cache.purge_schema.assert_awaited_once()
+        cache.disconnect.assert_awaited_once()
+        assert "7 chaves removidas" in capsys.readouterr().out
+
+    def test_clears_all(self) -> None:
+        """Sem --schema chama clear_all."""
+        cache = MagicMock()
+        cache.connect = AsyncMock()
+        cache.disconnect = AsyncMock()
+        cache.clear_all = AsyncMock(return_value=0)
+
+        with patch("extractor.cli.CacheService", return_value=cache):
+            main(["cache", "clear"])
+
+        cache.clear_all.assert_awaited_once()
+
+
+def _mock_cache() -> MagicMock:
+    """CacheService mockado com connect/disconnect."""
+    cache = MagicMock()
+    cache.connect = AsyncMock()
+    cache.disconnect = AsyncMock()
+    return cache
+
+
+class TestCacheExportImport:
+    """Testes para `extractor cache export` / `cache import`."""
+
+    def test_export_then_import(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """O arquivo exportado é carregado de volta com os TTLs."""
+        path = tmp_path / "cache.jsonl.gz"
+
+        async def export_entries(
+            _batch_size: int | None,
+        ) -> AsyncIterator[ExportedEntry]:
+            yield ("extract:Pessoa:a", '{"nome": "João"}', 60_000)
+            yield ("extract:Pessoa:b", "{}", None)
+
+        source = _mock_cache()
+        source.export_entries = export_entries
+        with patch("extractor.cli.CacheService", return_value=source):
+            assert main(["cache", "export", str(path)]) == 0
+        assert "2 chaves exportadas" in capsys.readouterr().out
+
+        target = _mock_cache()
+        loaded: list[ExportedEntry] = []
+
+        async def import_entries(snapshot: SnapshotReader, **_kwargs: object) -> int:
+            loaded.extend(snapshot)
+            return len(loaded)
+
+        target.import_entries = import_entries
+        with patch("extractor.cli.CacheService", return_value=target):
+            assert main(["cache", "import", str(path), "--replace"]) == 0
+
+        assert [key for key, _, _ in loaded] == ["extract:Pessoa:a", "extract:Pessoa:b"]
+        assert "2 chaves importadas" in capsys.readouterr().out
+        target.disconnect.assert_awaited_once()
+
+    def test_export_error_removes_partial_file(self, tmp_path: Path) -> None:
+        """Falha do Redis no meio da exportação não deixa arquivo parcial."""
+        path = tmp_path / "cache.jsonl.gz"
+
+        async def export_entries(
+            _batch_size: int | None,
+        ) -> AsyncIterator[ExportedEntry]:
+            yield ("extract:Pessoa:a", "{}", 1000)
+            raise redis.ConnectionError("down")
+
+        cache = _mock_cache()
+        cache.export_entries = export_entries
+        with patch("extractor.cli.CacheService", return_value=cache):
+            assert main(["cache", "export", str(path)]) == 1
+
+        assert not path.exists()
+
+    def test_import_rejects_invalid_file(self, tmp_path: Path) -> None:
+        """Arquivo que não é snapshot falha antes de conectar ao Redis."""
+        path = tmp_path / "corpus.jsonl"
+        path.write_text('{"text": "x"}\n')
+
+        with patch("extractor.cli.CacheService") as service:
+            assert main(["cache", "import", str(path)]) == 1
+
+        service.assert_not_called()
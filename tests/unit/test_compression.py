@@ -0,0 +1,267 @@
+"""Testes unitários para compression.py."""
+
+import gzip
+import zlib
+from unittest.mock import AsyncMock
+
+import pytest
+import zstandard
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+
+from extractor.api.compression import (
+    BodyTooLargeError,
+    CompressionMiddleware,
+    DecompressionError,
+    choose_encoding,
+    decompress,
+)
+
+BIG = "cláusula " * 500
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """App com resposta pequena, grande e eco do corpo."""
+    app = FastAPI()
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/big")
+    async def big() -> PlainTextResponse:
+        return PlainTextResponse(BIG)
+
+    @app.post("/echo")
+    async def echo(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(await request.body())
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100, max_request_size=5000)
+    return TestClient(app)
+
+
+class TestChooseEncoding:
+    """Testes para choose_encoding."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("gzip", "gzip"),
+            ("zstd;q=0, gzip", "gzip"),
+            ("*", "zstd"),
+            ("*, zstd;q=0", "gzip"),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_accept_encoding(self, accept: str, expected: str | None) -> None:
+        """zstd tem preferência; q=0 exclui."""
+        assert choose_encoding(accept) == expected
+
+
+class TestDecompress:
+    """Testes para decompress."""
+
+    def test_roundtrip(self) -> None:
+        """gzip e zstd voltam ao original."""
+        data = BIG.encode()
+
+        assert decompress(gzip.compress(data), "gzip", len(data)) == data
+        zstd = zstandard.ZstdCompressor().compress(data)
+        assert decompress(zstd, "zstd", len(data)) == data
+
+    def test_limit_applies_to_decompressed_size(self) -> None:
+        """Corpo que se expande além do limite é recusado sem ser lido todo."""
+        bomb = gzip.compress(b"\0" * 10_000_000)
+
+        with pytest.raises(BodyTooLargeError):
+            decompress(bomb, "gzip", 1000)
+
+    def test_corrupt_body(self) -> None:
+        """Corpo corrompido gera DecompressionError."""
+        with pytest.raises(DecompressionError):
+            decompress(b"nao e gzip", "gzip", 1000)
+
+
+class TestResponseCompression:
+    """Compressão das respostas."""
+
+    def test_small_response_is_not_compressed(self, client: TestClient) -> None:
+        """Abaixo do mínimo a resposta vai como está."""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    @pytest.mark.parametrize(
+        ("encoding", "decode"),
+        [
+            ("gzip", gzip.decompress),
+            ("zstd", lambda raw: zstandard.ZstdDecompressor().decompress(raw)),
+        ],
+    )
+    def test_large_response_is_compressed(
+        self, client: TestClient, encoding: str, decode: object
+    ) -> None:
+        """Respostas grandes são comprimidas com Content-Length correto."""
+        with client.stream(
+            "GET", "/big", headers={"Accept-Encoding": encoding}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == encoding
+        assert int(response.headers["content-length"]) == len(raw) < len(BIG)
+        assert decode(raw).decode() == BIG  # type: ignore[operator]
+
+    async def test_streaming_chunks_are_flushed(self) -> None:
+        """Cada chunk em streaming pode ser descomprimido ao chegar."""
+        lines = [b'{"linha":0}\n', b'{"linha":1}\n', b'{"linha":2}\n']
+
+        async def app(_scope: Scope, _receive: Receive, send: Send) -> None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")],
+                }
+            )
+            for line in lines:
+                await send(
+                    {"type": "http.response.body", "body": line, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        messages: list[Message] = []
+
+        async def collect(message: Message) -> None:
+            messages.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app)(scope, AsyncMock(), collect)
+
+        start, *bodies = messages
+        headers = dict(start["headers"])
+        decoder = zlib.decompressobj(31)
+        assert headers[b"content-encoding"] == b"gzip"
+        assert [decoder.decompress(m["body"]) for m in bodies] == [*lines, b""]
+        assert decoder.eof
+
+    def test_without_accept_encoding(self, client: TestClient) -> None:
+        """Sem Accept-Encoding nada muda."""
+        response = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == BIG
+
+
+class TestRequestDecompression:
+    """Descompressão do corpo das requests."""
+
+    @pytest.mark.parametrize(
+        ("encoding", "encode"),
+        [
+            ("gzip", gzip.compress),
+            ("zstd", zstandard.ZstdCompressor().compress),
+        ],
+    )
+    def test_compressed_body_reaches_app_decoded(
+        self, client: TestClient, encoding: str, encode: object
+    ) -> None:
+        """A aplicação recebe o corpo original."""
+        response = client.post(
+            "/echo",
+            content=encode(b"texto comprimido"),  # type: ignore[operator]
+            headers={"Content-Encoding": encoding, "Accept-Encoding": "identity"},
+        )
+
+        assert response.text == "texto comprimido"
+
+    def test_invalid_body_is_400(self, client: TestClient) -> None:
+        """Corpo que não decodifica responde 400."""
+        response = client.post(
+            "/echo", content=b"lixo", headers={"Content-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 400
+
+    def test_too_large_body_is_413(self, client: TestClient) -> None:
+        """Corpo descomprimido acima do limite responde 413."""
+        response = client.post(
+            "/echo",
+            content=gzip.compress(b"a" * 6000),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 413
+
+    def test_unsupported_encoding_is_415(self, client: TestClient) -> None:
+        """Codificações desconhecidas respondem 415."""
+        response = client.post(
+            "/echo", content=b"x", headers={"Content-Encoding": "br"}
+        )
+
+        assert response.status_code == 415
+
+    def test_truncated_body_is_400(self, client: TestClient) -> None:
+        """Stream comprimido que termina no meio responde 400."""
+        response = client.post(
+            "/echo",
+            content=gzip.compress(b"texto comprimido")[:-8],
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        ("encoding", "encode"),
+        [
+            ("gzip", gzip.compress),
+            ("zstd", zstandard.ZstdCompressor().compress),
+        ],
+    )
+    async def test_streaming_path_is_decoded_incrementally(
+        self, encoding: str, encode: object
+    ) -> None:
+        """Em rotas de streaming o corpo chega aos poucos e sem limite total."""
+        body = b"".join(b'{"linha":%d}\n' % i for i in range(50_000))
+        compressed: bytes = encode(body)  # type: ignore[operator]
+        chunks = [compressed[i : i + 4096] for i in range(0, len(compressed), 4096)]
+        pending = [
+            {"type": "http.request", "body": chunk, "more_body": True}
+            for chunk in chunks
+        ] + [{"type": "http.request", "body": b"", "more_body": False}]
+        delivered = 0
+
+        async def receive() -> Message:
+            nonlocal delivered
+            delivered += 1
+            return pending.pop(0)
+
+        received: list[tuple[int, int]] = []
+
+        async def app(scope: Scope, app_receive: Receive, _send: Send) -> None:
+            assert b"content-encoding" not in dict(scope["headers"])
+            more_body = True
+            while more_body:
+                message = await app_receive()
+                received.append((len(message["body"]), delivered))
+                more_body = message["more_body"]
+
+        scope = {
+            "type": "http",
+            "path": "/stream",
+            "headers": [(b"content-encoding", encoding.encode())],
+        }
+        middleware = CompressionMiddleware(
+            app, max_request_size=1024, streaming_paths=["/stream"]
+        )
+        await middleware(scope, receive, AsyncMock())
+
+        assert sum(size for size, _ in received) == len(body)
+        # O primeiro pedaço chega antes do resto do upload ser lido
+        assert received[0][1] < len(chunks)
+        assert max(size for size, _ in received) <= 4 * 1024 * 1024
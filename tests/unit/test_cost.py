@@ -0,0 +1,64 @@
+"""Testes unitários para cost.py."""
+
+from pydantic import BaseModel
+
+from extractor.core.cost import (
+    CHARS_PER_TOKEN,
+    ITEMS_PER_LIST,
+    TOKENS_PER_FIELD,
+    estimate_tokens,
+    schema_output_tokens,
+)
+
+
+class Endereco(BaseModel):
+    """Modelo aninhado."""
+
+    rua: str
+    cidade: str
+
+
+class Cadastro(BaseModel):
+    """Modelo com campos opcionais, listas e aninhamento."""
+
+    nome: str
+    apelido: str | None = None
+    telefones: list[str]
+    endereco: Endereco
+
+
+class TestSchemaOutputTokens:
+    """Testes para schema_output_tokens."""
+
+    def test_counts_nested_models_and_lists(self) -> None:
+        """Escalares, opcionais, listas e modelos aninhados entram na conta."""
+        expected = TOKENS_PER_FIELD * (1 + 1 + ITEMS_PER_LIST + 2)
+
+        assert schema_output_tokens(Cadastro) == expected
+
+    def test_larger_schemas_cost_more(self) -> None:
+        """Schema com mais campos tem saída maior."""
+        assert schema_output_tokens(Cadastro) > schema_output_tokens(Endereco)
+
+
+class TestEstimateTokens:
+    """Testes para estimate_tokens."""
+
+    def test_input_plus_output(self) -> None:
+        """Custo é texto + prompt + saída do schema."""
+        text, prompt = "a" * 400, "b" * 40
+
+        assert estimate_tokens(text, Endereco, prompt) == (
+            440 // CHARS_PER_TOKEN + schema_output_tokens(Endereco)
+        )
+
+    def test_scales_with_text_length(self) -> None:
+        """Texto 1000x maior custa proporcionalmente mais."""
+        short = estimate_tokens("a" * 50, Endereco)
+        long = estimate_tokens("a" * 50_000, Endereco)
+
+        assert long > 100 * short
+
+    def test_minimum_is_one(self) -> None:
+        """Nenhuma extração é de graça."""
+        assert estimate_tokens("") == 1
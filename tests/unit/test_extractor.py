@@ -1,9 +1,17 @@
 """Testes unitários para extractor.py."""
 
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import ValidationError
 
+from extractor.core.admission import (
+    AdmissionController,
+    DeadlineExceededError,
+    OverloadedError,
+)
 from extractor.core.cache import CacheService
 from extractor.core.extractor import ExtractionError, ExtractorService
 from extractor.schemas.base import BaseSchema
@@ -20,6 +28,9 @@ def extractor_service(
     mock_cache = MagicMock(spec=CacheService)
     mock_cache.get = AsyncMock(return_value=None)
     mock_cache.set = AsyncMock()
+    mock_cache.get_raw = AsyncMock(return_value=None)
+    mock_cache.get_failure = AsyncMock(return_value=None)
+    mock_cache.set_failure = AsyncMock()
 
     return ExtractorService(
         client=mock_instructor_client,
@@ -39,14 +50,14 @@ class TestExtractorService:
         """extract() chama o cliente LLM."""
         mock_result = MagicMock()
         mock_result.model_dump.return_value = {"nome": "João", "idade": 30}
-        extractor_service.client.extract = MagicMock(return_value=mock_result)
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
 
         result = await extractor_service.extract(
             text="João tem 30 anos",
             schema_name="TestPessoa",
         )
 
-        extractor_service.client.extract.assert_called_once()
+        extractor_service.client.extract.assert_awaited_once()
         assert result == {"nome": "João", "idade": 30}
 
     @pytest.mark.asyncio
@@ -76,7 +87,7 @@ class TestExtractorService:
 
         mock_result = MagicMock()
         mock_result.model_dump.return_value = {"nome": "João", "idade": 30}
-        extractor_service.client.extract = MagicMock(return_value=mock_result)
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
 
         result = await extractor_service.extract(
             text="João tem 30 anos",
@@ -95,7 +106,7 @@ class TestExtractorService:
         """extract() armazena resultado no cache."""
         mock_result = MagicMock()
         mock_result.model_dump.return_value = {"nome": "João", "idade": 30}
-        extractor_service.client.extract = MagicMock(return_value=mock_result)
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
 
         await extractor_service.extract(
             text="João tem 30 anos",
@@ -124,7 +135,7 @@ class TestExtractorService:
         extractor_service: ExtractorService,
     ) -> None:
         """extract() lança ExtractionError quando LLM falha."""
-        extractor_service.client.extract = MagicMock(side_effect=Exception("LLM Error"))
+        extractor_service.client.extract = AsyncMock(side_effect=Exception("LLM Error"))
 
         with pytest.raises(ExtractionError) as exc_info:
             await extractor_service.extract(
@@ -134,6 +145,307 @@ class TestExtractorService:
 
         assert "LLM Error" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_extract_fails_fast_on_negative_cache(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """extract() não chama o LLM quando há falha recente em cache."""
+        extractor_service.cache.get_failure = AsyncMock(return_value="sem fatura")
+
+        with pytest.raises(ExtractionError) as exc_info:
+            await extractor_service.extract(
+                text="Texto sem fatura",
+                schema_name="TestPessoa",
+            )
+
+        assert "sem fatura" in str(exc_info.value)
+        extractor_service.client.extract.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_ignores_negative_cache_when_opted_out(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """use_negative_cache=False sempre tenta o LLM."""
+        extractor_service.cache.get_failure = AsyncMock(return_value="sem fatura")
+        mock_result = MagicMock()
+        mock_result.model_dump.return_value = {"nome": "João", "idade": 30}
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
+
+        result = await extractor_service.extract(
+            text="João tem 30 anos",
+            schema_name="TestPessoa",
+            use_negative_cache=False,
+        )
+
+        assert result == {"nome": "João", "idade": 30}
+        extractor_service.cache.get_failure.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_caches_validation_failure(
+        self,
+        extractor_service: ExtractorService,
+        sample_schema: type[BaseSchema],
+    ) -> None:
+        """Falha de validação gera entrada negativa."""
+        try:
+            sample_schema.model_validate({"nome": "João", "idade": -1})
+        except ValidationError as e:
+            validation_error = e
+        extractor_service.client.extract = AsyncMock(side_effect=validation_error)
+
+        with pytest.raises(ExtractionError):
+            await extractor_service.extract(
+                text="João tem -1 anos",
+                schema_name="TestPessoa",
+            )
+
+        extractor_service.cache.set_failure.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_does_not_cache_infra_failure(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Erros de conexão não vão para o cache negativo."""
+        extractor_service.client.extract = AsyncMock(
+            side_effect=ConnectionError("Connection error.")
+        )
+
+        with pytest.raises(ExtractionError):
+            await extractor_service.extract(
+                text="João tem 30 anos",
+                schema_name="TestPessoa",
+            )
+
+        extractor_service.cache.set_failure.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_before_llm_call_runs_only_on_new_llm_calls(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """O hook (orçamento de tokens) não roda em hits nem para quem compartilha."""
+        before_llm_call = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João"}'
+
+        async def slow_extract(**_kwargs: object) -> MagicMock:
+            await asyncio.sleep(0.01)
+            return mock_result
+
+        extractor_service.client.extract = AsyncMock(side_effect=slow_extract)
+
+        await asyncio.gather(
+            *(
+                extractor_service.extract_json(
+                    "João tem 30 anos", "TestPessoa", before_llm_call=before_llm_call
+                )
+                for _ in range(2)
+            )
+        )
+        extractor_service.cache.get_raw = AsyncMock(return_value='{"nome":"João"}')
+        await extractor_service.extract_json(
+            "João tem 30 anos", "TestPessoa", before_llm_call=before_llm_call
+        )
+
+        before_llm_call.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_json_passes_cached_payload_through(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """extract_json() devolve o JSON do cache sem desserializar."""
+        extractor_service.cache.get_raw = AsyncMock(return_value='{"nome":"Maria"}')
+
+        result = await extractor_service.extract_json(
+            text="Maria tem 25 anos",
+            schema_name="TestPessoa",
+        )
+
+        assert result == '{"nome":"Maria"}'
+        extractor_service.client.extract.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_json_serializes_fresh_result(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Em miss, extract_json() serializa o resultado do LLM."""
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João","idade":30}'
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
+
+        result = await extractor_service.extract_json(
+            text="João tem 30 anos",
+            schema_name="TestPessoa",
+        )
+
+        assert result == '{"nome":"João","idade":30}'
+        extractor_service.cache.set.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_shared_call_does_not_inherit_first_deadline(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Quem se junta sem deadline recebe o resultado após o deadline do primeiro."""
+        extractor_service.admission = AdmissionController(4, 4)
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João"}'
+
+        async def slow_extract(**_kwargs: object) -> MagicMock:
+            await asyncio.sleep(0.1)
+            return mock_result
+
+        extractor_service.client.extract = AsyncMock(side_effect=slow_extract)
+
+        hurried, patient = await asyncio.gather(
+            extractor_service.extract_json(
+                "João tem 30 anos", "TestPessoa", deadline=time.monotonic() + 0.02
+            ),
+            extractor_service.extract_json("João tem 30 anos", "TestPessoa"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(hurried, DeadlineExceededError)
+        assert patient == '{"nome":"João"}'
+        extractor_service.client.extract.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_queue_bound_holds_for_concurrent_requests(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """A fila é contada antes do débito: requests simultâneas não a estouram."""
+        extractor_service.admission = AdmissionController(1, 1)
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João"}'
+
+        async def slow_extract(**_kwargs: object) -> MagicMock:
+            await asyncio.sleep(0.05)
+            return mock_result
+
+        async def charge() -> None:
+            await asyncio.sleep(0)
+
+        extractor_service.client.extract = AsyncMock(side_effect=slow_extract)
+
+        results = await asyncio.gather(
+            *(
+                extractor_service.extract_json(
+                    f"texto {i}", "TestPessoa", before_llm_call=charge
+                )
+                for i in range(4)
+            ),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, OverloadedError) for r in results) == 2
+        assert extractor_service.client.extract.await_count == 2
+        assert extractor_service.admission.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_budget_rejection_does_not_fail_joiners(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Orçamento esgotado de quem iniciou a chamada só recusa essa request."""
+        extractor_service.admission = AdmissionController(4, 4)
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João"}'
+        extractor_service.client.extract = AsyncMock(return_value=mock_result)
+        exhausted = AsyncMock(side_effect=PermissionError("orçamento esgotado"))
+        charged = AsyncMock()
+
+        leader, joiner = await asyncio.gather(
+            extractor_service.extract_json(
+                "João tem 30 anos", "TestPessoa", before_llm_call=exhausted
+            ),
+            extractor_service.extract_json(
+                "João tem 30 anos", "TestPessoa", before_llm_call=charged
+            ),
+            return_exceptions=True,
+        )
+
+        assert isinstance(leader, PermissionError)
+        assert joiner == '{"nome":"João"}'
+        charged.assert_awaited_once()
+        assert extractor_service.admission.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_extract_drops_expired_deadline_before_llm(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Deadline já vencido não chega ao LLM nem ao cache negativo."""
+        with pytest.raises(DeadlineExceededError):
+            await extractor_service.extract(
+                text="João tem 30 anos",
+                schema_name="TestPessoa",
+                deadline=time.monotonic() - 1,
+            )
+
+        extractor_service.client.extract.assert_not_called()
+        extractor_service.cache.set_failure.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_extractions_share_llm_call(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Requests idênticas simultâneas fazem uma única chamada ao LLM."""
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"nome":"João"}'
+
+        async def slow_extract(**_kwargs: object) -> MagicMock:
+            await asyncio.sleep(0.01)
+            return mock_result
+
+        extractor_service.client.extract = AsyncMock(side_effect=slow_extract)
+
+        results = await asyncio.gather(
+            *(
+                extractor_service.extract_json("João tem 30 anos", "TestPessoa")
+                for _ in range(3)
+            )
+        )
+
+        assert results == ['{"nome":"João"}'] * 3
+        extractor_service.client.extract.assert_awaited_once()
+        extractor_service.cache.set.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disconnected_request_cancels_llm_call(
+        self,
+        extractor_service: ExtractorService,
+    ) -> None:
+        """Cancelar a única request interessada cancela a chamada ao LLM."""
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def hanging_extract(**_kwargs: object) -> MagicMock:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return MagicMock()
+
+        extractor_service.client.extract = AsyncMock(side_effect=hanging_extract)
+
+        request = asyncio.create_task(
+            extractor_service.extract_json("João tem 30 anos", "TestPessoa")
+        )
+        await started.wait()
+        request.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert extractor_service.flights.cancelled == 1
+        extractor_service.cache.set.assert_not_called()
+
     def test_list_schemas_delegates_to_registry(
         self,
         extractor_service: ExtractorService,
@@ -0,0 +1,170 @@
+"""Testes unitários para health.py."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from extractor.config import Settings
+from extractor.core.health import HealthMonitor, build_health_monitor
+
+
+async def _ok() -> dict[str, Any]:
+    return {"model": "llama3.1:8b"}
+
+
+async def _down() -> dict[str, Any]:
+    raise ConnectionError("Redis inacessível")
+
+
+async def _hangs() -> dict[str, Any]:
+    await asyncio.sleep(10)
+    return {}
+
+
+class TestHealthMonitor:
+    """Testes para HealthMonitor."""
+
+    async def test_not_ready_before_first_round(self) -> None:
+        """Sem resultado dos probes críticos a instância não está pronta."""
+        monitor = HealthMonitor({"llm": _ok}, critical=frozenset({"llm"}))
+
+        assert monitor.ready is False
+        assert monitor.status == "not_ready"
+        assert HealthMonitor({"redis": _ok}).ready is False
+
+    async def test_run_once_caches_results(self) -> None:
+        """O resultado fica guardado com detalhes e latência."""
+        monitor = HealthMonitor({"llm": _ok}, critical=frozenset({"llm"}))
+
+        await monitor.run_once()
+
+        result = monitor.results["llm"]
+        assert result.ok is True
+        assert result.details == {"model": "llama3.1:8b"}
+        assert result.latency_ms >= 0
+        assert monitor.status == "ready"
+
+    async def test_non_critical_failure_only_degrades(self) -> None:
+        """Probe não crítico com falha mantém a instância pronta."""
+        monitor = HealthMonitor(
+            {"llm": _ok, "redis": _down}, critical=frozenset({"llm"})
+        )
+
+        await monitor.run_once()
+
+        assert monitor.ready is True
+        assert monitor.status == "degraded"
+        assert monitor.results["redis"].error == "Redis inacessível"
+
+    async def test_slow_probe_times_out(self) -> None:
+        """Probe travado vira falha no timeout, sem segurar os demais."""
+        monitor = HealthMonitor(
+            {"llm": _hangs, "redis": _ok}, critical=frozenset({"llm"}), timeout=0.01
+        )
+
+        await asyncio.wait_for(monitor.run_once(), timeout=1)
+
+        assert monitor.results["llm"].error == "timeout após 0.01s"
+        assert monitor.results["redis"].ok is True
+        assert monitor.status == "not_ready"
+
+    async def test_loop_refreshes_results(self) -> None:
+        """Os probes rodam de novo a cada intervalo até o close."""
+        probe = AsyncMock(return_value=None)
+        monitor = HealthMonitor({"redis": probe}, interval=0.01)
+
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.close()
+        calls = probe.await_count
+        await asyncio.sleep(0.03)
+
+        assert calls >= 2
+        assert probe.await_count == calls
+
+
+class TestBuildHealthMonitor:
+    """Testes para os probes da aplicação."""
+
+    @staticmethod
+    def _monitor(
+        *,
+        redis_ok: bool = True,
+        llm_ok: bool = True,
+        loaded: bool | None = True,
+        bloom: bool = True,
+    ) -> HealthMonitor:
+        cache = MagicMock()
+        cache.health_check = AsyncMock(return_value=redis_ok)
+        cache.bloom_stats.return_value = {"ready": bloom}
+        client = MagicMock()
+        client.check_model = AsyncMock(
+            return_value={"model": "llama3.1:8b"},
+            side_effect=None if llm_ok else ConnectionError("Connection error."),
+        )
+        client.model_loaded = AsyncMock(return_value=loaded)
+        return build_health_monitor(Settings(), cache, client)
+
+    async def test_all_probes_ok(self) -> None:
+        """Com tudo no ar a instância fica pronta."""
+        monitor = self._monitor()
+
+        await monitor.run_once()
+
+        assert monitor.status == "ready"
+        assert monitor.results["warmup"].details == {
+            "model_loaded": True,
+            "bloom_filter_ready": True,
+        }
+
+    async def test_redis_down_degrades(self) -> None:
+        """O cache falha aberto: Redis fora não tira a instância do ar."""
+        monitor = self._monitor(redis_ok=False)
+
+        await monitor.run_once()
+
+        assert monitor.ready is True
+        assert monitor.results["redis"].ok is False
+
+    async def test_llm_down_does_not_take_replicas_out_of_rotation(self) -> None:
+        """O provider é comum a todas as réplicas: falha só degrada."""
+        monitor = self._monitor(llm_ok=False)
+
+        await monitor.run_once()
+
+        assert monitor.ready is True
+        assert monitor.status == "degraded"
+        assert monitor.results["llm"].error == "Connection error."
+
+    async def test_cold_replica_is_not_ready(self) -> None:
+        """Modelo fora da memória deixa a réplica fria fora de rotação."""
+        monitor = self._monitor(loaded=False)
+
+        await monitor.run_once()
+
+        assert monitor.status == "not_ready"
+        assert monitor.results["warmup"].error == "Aquecendo: model_loaded"
+
+    async def test_warm_replica_stays_ready_after_unload(self) -> None:
+        """Depois do primeiro warmup, modelo descarregado não tira de rotação."""
+        client = MagicMock()
+        client.check_model = AsyncMock(return_value={})
+        client.model_loaded = AsyncMock(side_effect=[True, False])
+        cache = MagicMock()
+        cache.health_check = AsyncMock(return_value=True)
+        cache.bloom_stats.return_value = None
+        monitor = build_health_monitor(Settings(), cache, client)
+
+        await monitor.run_once()
+        await monitor.run_once()
+
+        assert monitor.ready is True
+        assert monitor.results["warmup"].details == {"model_loaded": False}
+
+    async def test_cloud_provider_skips_model_loaded(self) -> None:
+        """Providers de nuvem não têm estado de carregamento do modelo."""
+        monitor = self._monitor(loaded=None)
+
+        await monitor.run_once()
+
+        assert monitor.results["warmup"].details == {"bloom_filter_ready": True}
@@ -0,0 +1,129 @@
+"""Testes unitários para idempotency.py."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.core.idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyMismatchError,
+    IdempotencyStore,
+    StoredResponse,
+    fingerprint,
+)
+
+OK = StoredResponse(200, b'{"ok":true}', {"content-type": "application/json"})
+
+
+class TestIdempotencyStore:
+    """Testes para IdempotencyStore."""
+
+    async def test_first_request_owns_the_key(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """A primeira request vira dona da chave; a repetição recebe a resposta."""
+        async with idempotency_store.claim("k", "fp") as claim:
+            assert claim.token is not None
+            assert claim.replay is None
+            await idempotency_store.save(claim, OK)
+
+        async with idempotency_store.claim("k", "fp") as repeat:
+            assert repeat.replay == OK
+            assert repeat.token is None
+
+    async def test_duplicate_waits_for_original(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """Repetição concorrente espera a original e recebe a mesma resposta."""
+        release = asyncio.Event()
+
+        async def original() -> None:
+            async with idempotency_store.claim("k", "fp") as claim:
+                await release.wait()
+                await idempotency_store.save(claim, OK)
+
+        task = asyncio.create_task(original())
+        await asyncio.sleep(0)
+        asyncio.get_running_loop().call_later(0.05, release.set)
+
+        async with idempotency_store.claim("k", "fp") as claim:
+            assert claim.replay == OK
+        await task
+
+    async def test_reuse_with_other_body_is_rejected(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """A mesma chave com outro corpo não devolve a resposta de outro."""
+        async with idempotency_store.claim("k", "fp") as claim:
+            await idempotency_store.save(claim, OK)
+
+        with pytest.raises(IdempotencyMismatchError):
+            async with idempotency_store.claim("k", "outro"):
+                pass
+
+    async def test_gives_up_waiting_after_timeout(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """Original que não termina a tempo gera IdempotencyInProgressError."""
+        async with idempotency_store.claim("k", "fp"):
+            with pytest.raises(IdempotencyInProgressError):
+                async with idempotency_store.claim("k", "fp", timeout=0.05):
+                    pass
+
+    async def test_failure_releases_the_key(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """Exceção (ou cancelamento) no dono libera a chave para a repetição."""
+        with pytest.raises(RuntimeError):
+            async with idempotency_store.claim("k", "fp"):
+                raise RuntimeError("LLM")
+
+        async with idempotency_store.claim("k", "fp") as retry:
+            assert retry.token is not None
+
+    async def test_transient_responses_are_not_stored(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """5xx e 429 liberam a chave em vez de serem repetidos."""
+        async with idempotency_store.claim("k", "fp") as claim:
+            await idempotency_store.save(claim, StoredResponse(503, b"{}"))
+
+        async with idempotency_store.claim("k", "fp") as retry:
+            assert retry.replay is None
+            assert retry.token is not None
+
+    async def test_release_ignores_marker_of_new_owner(
+        self, idempotency_store: IdempotencyStore
+    ) -> None:
+        """Dono cujo lock expirou não apaga o marcador de quem assumiu."""
+        async with idempotency_store.claim("k", "fp") as stale:
+            redis_client = idempotency_store._redis
+            key = next(iter(redis_client.data))  # type: ignore[attr-defined]
+            marker = json.loads(redis_client.data[key])  # type: ignore[attr-defined]
+            redis_client.data[key] = json.dumps({**marker, "token": "novo"})  # type: ignore[attr-defined]
+
+            await idempotency_store.release(stale)
+
+            assert key in redis_client.data  # type: ignore[attr-defined]
+
+    async def test_fails_open_when_redis_is_down(self) -> None:
+        """Com o Redis fora, a request segue sem garantia (fail-open)."""
+        client = MagicMock()
+        client.set = AsyncMock(side_effect=redis.ConnectionError("down"))
+        store = IdempotencyStore(client, failure_threshold=1)
+
+        async with store.claim("k", "fp") as claim:
+            assert claim.token is None
+            assert claim.replay is None
+            await store.save(claim, OK)
+
+        client.set.assert_awaited_once()
+
+
+def test_fingerprint_is_stable() -> None:
+    """Mesmo corpo, mesmo hash (str ou bytes)."""
+    assert fingerprint('{"a":1}') == fingerprint(b'{"a":1}')
+    assert fingerprint('{"a":1}') != fingerprint('{"a":2}')
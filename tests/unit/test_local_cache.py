@@ -0,0 +1,86 @@
+"""Testes unitários para local_cache.py."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from extractor.core.local_cache import LocalCache
+
+
+@pytest.fixture
+def local(tmp_path: Path) -> Iterator[LocalCache]:
+    """Cache local em arquivo temporário."""
+    cache = LocalCache(tmp_path / "cache.db", max_entries=20)
+    cache.open()
+    yield cache
+    cache.close()
+
+
+class TestLocalCache:
+    """Testes para LocalCache."""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, local: LocalCache) -> None:
+        """Valor armazenado é retornado."""
+        await local.set("extract:A:1", "valor", ttl=60)
+
+        assert await local.get("extract:A:1") == "valor"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self, local: LocalCache) -> None:
+        """Entrada expirada não é retornada."""
+        await local.set("extract:A:1", "valor", ttl=0)
+
+        assert await local.get("extract:A:1") is None
+
+    @pytest.mark.asyncio
+    async def test_persists_across_reopen(self, tmp_path: Path) -> None:
+        """Entradas sobrevivem a reinícios."""
+        path = tmp_path / "cache.db"
+        first = LocalCache(path)
+        first.open()
+        await first.set("extract:A:1", "valor", ttl=60)
+        first.close()
+
+        second = LocalCache(path)
+        second.open()
+        assert await second.get("extract:A:1") == "valor"
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_uses_wal_mode(self, local: LocalCache) -> None:
+        """Banco é aberto em modo WAL."""
+        assert local._conn is not None
+        (mode,) = local._conn.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    @pytest.mark.asyncio
+    async def test_purge_prefix(self, local: LocalCache) -> None:
+        """Remove só as chaves do prefixo."""
+        await local.set("extract:A:1", "a", ttl=60)
+        await local.set("extract:A:2", "a", ttl=60)
+        await local.set("extract:AB:1", "b", ttl=60)
+
+        assert await local.purge_prefix("extract:A:") == 2
+        assert await local.get("extract:AB:1") == "b"
+
+    @pytest.mark.asyncio
+    async def test_delete(self, local: LocalCache) -> None:
+        """delete() remove a chave."""
+        await local.set("extract:A:1", "a", ttl=60)
+
+        assert await local.delete("extract:A:1") is True
+        assert await local.delete("extract:A:1") is False
+
+    @pytest.mark.asyncio
+    async def test_evicts_entries_closest_to_expiry(self, local: LocalCache) -> None:
+        """Acima do limite, remove as entradas que expirariam primeiro."""
+        for i in range(40):
+            await local.set(f"extract:A:{i}", "v", ttl=100 + i)
+
+        assert local._conn is not None
+        (count,) = local._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        assert count <= local.max_entries
+        assert await local.get("extract:A:0") is None
+        assert await local.get("extract:A:39") == "v"
@@ -0,0 +1,274 @@
+"""Testes unitários para middleware.py."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+
+from extractor.api.middleware import (
+    DisconnectMiddleware,
+    RateLimitMiddleware,
+    RequestLoggingMiddleware,
+    client_key,
+)
+
+
+def _app(requests: int = 10) -> FastAPI:
+    """App mínima com os dois middlewares."""
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(3):
+                yield f"{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(RateLimitMiddleware, requests=requests, window=60)
+    return app
+
+
+class TestMiddlewares:
+    """Testes dos middlewares ASGI."""
+
+    def test_headers_on_regular_response(self) -> None:
+        """Rate limit e tempo de processamento nos headers."""
+        client = TestClient(_app(requests=10))
+
+        first = client.get("/ok")
+        second = client.get("/ok")
+
+        assert first.headers["X-RateLimit-Limit"] == "10"
+        assert first.headers["X-RateLimit-Remaining"] == "9"
+        assert second.headers["X-RateLimit-Remaining"] == "8"
+        assert float(first.headers["X-Process-Time"]) >= 0
+
+    def test_streaming_response_passes_through(self) -> None:
+        """Respostas em streaming chegam completas e com os headers."""
+        response = TestClient(_app()).get("/stream")
+
+        assert response.text == "0\n1\n2\n"
+        assert "X-Process-Time" in response.headers
+        assert "X-RateLimit-Remaining" in response.headers
+
+    def test_lifespan_is_forwarded(self) -> None:
+        """Eventos que não são HTTP passam direto."""
+        with TestClient(_app()) as client:
+            assert client.get("/ok").status_code == 200
+
+    def test_returns_429_with_retry_after(self) -> None:
+        """Limite excedido responde 429 (não 500) com Retry-After."""
+        client = TestClient(_app(requests=2))
+        client.get("/ok")
+        client.get("/ok")
+
+        response = client.get("/ok")
+
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Rate limit exceeded. Try again later."}
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+    def test_exempt_paths_skip_the_limiter(self) -> None:
+        """Probes não consomem a cota nem recebem 429."""
+        app = FastAPI()
+
+        @app.get("/livez")
+        async def livez() -> dict[str, str]:
+            return {"status": "alive"}
+
+        app.add_middleware(
+            RateLimitMiddleware, requests=1, window=60, exempt_paths=["/livez"]
+        )
+        client = TestClient(app)
+
+        responses = [client.get("/livez") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200] * 3
+        assert "X-RateLimit-Limit" not in responses[0].headers
+
+
+def _scope(headers: dict[str, str], ip: str = "10.0.0.1") -> dict[str, object]:
+    """Scope HTTP mínimo."""
+    return {
+        "type": "http",
+        "client": (ip, 1234),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+
+
+class TestClientKey:
+    """Testes para client_key."""
+
+    def test_ip_by_default(self) -> None:
+        """Sem configuração, a chave é o IP."""
+        assert client_key(_scope({"X-API-Key": "s3cr3t"})) == "ip:10.0.0.1"
+
+    def test_api_key_header_is_hashed(self) -> None:
+        """A API key entra só como hash."""
+        key = client_key(_scope({"X-API-Key": "s3cr3t"}), "api_key")
+
+        assert key.startswith("key:")
+        assert "s3cr3t" not in key
+
+    def test_bearer_token_and_ip_fallback(self) -> None:
+        """Bearer vale como API key; sem credencial, volta para o IP."""
+        bearer = client_key(_scope({"Authorization": "Bearer s3cr3t"}), "api_key")
+        header = client_key(_scope({"X-API-Key": "s3cr3t"}), "api_key")
+
+        assert bearer == header
+        assert client_key(_scope({}), "api_key") == "ip:10.0.0.1"
+
+    def test_api_key_limits_are_shared_across_ips(self) -> None:
+        """Mesma API key em IPs diferentes consome a mesma cota."""
+        app = FastAPI()
+
+        @app.get("/ok")
+        async def ok() -> dict[str, bool]:
+            return {"ok": True}
+
+        app.add_middleware(RateLimitMiddleware, requests=1, key_by="api_key")
+        client = TestClient(app)
+
+        assert client.get("/ok", headers={"X-API-Key": "a"}).status_code == 200
+        assert client.get("/ok", headers={"X-API-Key": "a"}).status_code == 429
+        assert client.get("/ok", headers={"X-API-Key": "b"}).status_code == 200
+
+    def test_unknown_api_keys_fall_back_to_ip(self) -> None:
+        """Com a lista de chaves, credenciais inventadas não ganham bucket novo."""
+        app = FastAPI()
+
+        @app.get("/ok")
+        async def ok() -> dict[str, bool]:
+            return {"ok": True}
+
+        app.add_middleware(
+            RateLimitMiddleware, requests=1, key_by="api_key", api_keys={"a"}
+        )
+        client = TestClient(app)
+
+        assert client_key(_scope({"X-API-Key": "z"}), "api_key", {"a"}) == (
+            "ip:10.0.0.1"
+        )
+        assert client.get("/ok", headers={"X-API-Key": "x"}).status_code == 200
+        assert client.get("/ok", headers={"X-API-Key": "y"}).status_code == 429
+        assert client.get("/ok", headers={"X-API-Key": "a"}).status_code == 200
+
+
+def _receiver(disconnect: asyncio.Event) -> Receive:
+    """``receive`` que entrega o corpo e depois espera a desconexão."""
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+    async def receive() -> Message:
+        if messages:
+            return messages.pop(0)
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+_HTTP_SCOPE = {"type": "http", "method": "POST", "path": "/extract", "headers": []}
+
+
+class TestDisconnectMiddleware:
+    """Testes para DisconnectMiddleware."""
+
+    async def test_cancels_app_when_client_disconnects(self) -> None:
+        """Desconexão antes da resposta cancela o processamento."""
+        cancelled = asyncio.Event()
+        sent: list[Message] = []
+
+        async def app(_scope: Scope, receive: Receive, _send: Send) -> None:
+            await receive()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        disconnect = asyncio.Event()
+        call = asyncio.create_task(
+            DisconnectMiddleware(app)(_HTTP_SCOPE, _receiver(disconnect), send)
+        )
+        await asyncio.sleep(0.01)
+        disconnect.set()
+        await asyncio.wait_for(call, 1)
+
+        assert cancelled.is_set()
+        assert sent == []
+
+    async def test_other_paths_pass_through(self) -> None:
+        """Fora dos prefixos configurados a aplicação recebe o receive original."""
+        seen: list[Receive] = []
+
+        async def app(_scope: Scope, receive: Receive, _send: Send) -> None:
+            seen.append(receive)
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b""}
+
+        async def send(message: Message) -> None:
+            pass
+
+        middleware = DisconnectMiddleware(app, path_prefixes=("/api/v1/extract",))
+        await middleware({**_HTTP_SCOPE, "path": "/api/v1/schemas"}, receive, send)
+        await middleware({**_HTTP_SCOPE, "path": "/api/v1/extract"}, receive, send)
+
+        assert seen[0] is receive
+        assert seen[1] is not receive
+
+    async def test_work_after_response_is_not_cancelled(self) -> None:
+        """Tarefas após a resposta completa (background) seguem até o fim."""
+        disconnect = asyncio.Event()
+        finished = False
+
+        async def app(_scope: Scope, receive: Receive, send: Send) -> None:
+            nonlocal finished
+            await receive()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+            disconnect.set()
+            await asyncio.sleep(0.01)
+            finished = True
+
+        async def send(message: Message) -> None:
+            pass
+
+        await DisconnectMiddleware(app)(_HTTP_SCOPE, _receiver(disconnect), send)
+
+        assert finished
+
+    async def test_app_receives_disconnect_after_body(self) -> None:
+        """A aplicação ainda recebe o http.disconnect depois do corpo."""
+        disconnect = asyncio.Event()
+        received: list[Message] = []
+
+        async def app(_scope: Scope, receive: Receive, send: Send) -> None:
+            received.append(await receive())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+            disconnect.set()
+            received.append(await receive())
+
+        async def send(message: Message) -> None:
+            pass
+
+        await DisconnectMiddleware(app)(_HTTP_SCOPE, _receiver(disconnect), send)
+
+        assert [message["type"] for message in received] == [
+            "http.request",
+            "http.disconnect",
+        ]
@@ -0,0 +1,110 @@
+"""Testes unitários para negotiation.py."""
+
+import msgpack
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from extractor.api.negotiation import MsgpackRoute, prefers_msgpack
+
+
+class Item(BaseModel):
+    """Corpo de teste."""
+
+    nome: str
+    quantidade: int
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """App com uma rota negociada que ecoa o corpo."""
+    router = APIRouter(route_class=MsgpackRoute)
+
+    @router.post("/echo")
+    async def echo(item: Item) -> Item:
+        return item
+
+    @router.get("/text")
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestPrefersMsgpack:
+    """Testes para prefers_msgpack."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("application/msgpack", True),
+            ("application/x-msgpack", True),
+            ("application/msgpack, application/json", True),
+            ("application/json, application/msgpack;q=0.5", False),
+            ("application/json;q=0.5, application/msgpack", True),
+            ("*/*", False),
+            ("", False),
+            (None, False),
+            ("application/msgpack;q=0", False),
+        ],
+    )
+    def test_accept_header(self, accept: str | None, expected: bool) -> None:
+        """Msgpack só quando pedido explicitamente com peso maior ou igual."""
+        assert prefers_msgpack(accept) is expected
+
+
+class TestMsgpackRoute:
+    """Testes para MsgpackRoute."""
+
+    def test_json_by_default(self, client: TestClient) -> None:
+        """Sem Accept msgpack, a resposta continua JSON."""
+        response = client.post("/echo", json={"nome": "caneta", "quantidade": 2})
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"nome": "caneta", "quantidade": 2}
+        assert response.headers["Vary"] == "Accept"
+
+    def test_msgpack_request_and_response(self, client: TestClient) -> None:
+        """Corpo msgpack é validado como JSON e a resposta volta em msgpack."""
+        response = client.post(
+            "/echo",
+            content=msgpack.packb({"nome": "caneta", "quantidade": 2}),
+            headers={
+                "Content-Type": "application/msgpack",
+                "Accept": "application/msgpack",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == {"nome": "caneta", "quantidade": 2}
+
+    def test_msgpack_body_is_validated(self, client: TestClient) -> None:
+        """Erros de validação continuam 422."""
+        response = client.post(
+            "/echo",
+            content=msgpack.packb({"nome": "caneta"}),
+            headers={"Content-Type": "application/msgpack"},
+        )
+
+        assert response.status_code == 422
+
+    def test_invalid_msgpack_is_400(self, client: TestClient) -> None:
+        """Corpo que não é msgpack responde 400."""
+        response = client.post(
+            "/echo",
+            content=b"\xc1",
+            headers={"Content-Type": "application/msgpack"},
+        )
+
+        assert response.status_code == 400
+
+    def test_non_json_response_is_untouched(self, client: TestClient) -> None:
+        """Respostas que não são JSON não são convertidas."""
+        response = client.get("/text", headers={"Accept": "application/msgpack"})
+
+        assert response.text == "ok"
@@ -0,0 +1,138 @@
+"""Testes unitários para rate_limit.py."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.config import Settings
+from extractor.core.rate_limit import (
+    RedisRateLimiter,
+    TokenBucketLimiter,
+    build_rate_limiter,
+)
+
+
+class TestTokenBucketLimiter:
+    """Testes para TokenBucketLimiter."""
+
+    def test_allows_burst_up_to_limit(self) -> None:
+        """Até ``limit`` requests seguidas passam; a seguinte é negada."""
+        limiter = TokenBucketLimiter(limit=3, window=60)
+
+        decisions = [limiter.acquire("ip", now=0.0) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+
+    def test_retry_after_until_next_token(self) -> None:
+        """Retry-After é o tempo até repor o token que falta."""
+        limiter = TokenBucketLimiter(limit=2, window=60)
+        limiter.acquire("ip", now=0.0)
+        limiter.acquire("ip", now=0.0)
+
+        denied = limiter.acquire("ip", now=10.0)
+
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(20.0)
+        assert denied.retry_after_seconds == 20
+
+    def test_refills_over_time(self) -> None:
+        """Tokens são repostos à taxa limit/window."""
+        limiter = TokenBucketLimiter(limit=2, window=60)
+        limiter.acquire("ip", now=0.0)
+        limiter.acquire("ip", now=0.0)
+
+        assert limiter.acquire("ip", now=30.0).allowed
+        assert not limiter.acquire("ip", now=30.0).allowed
+
+    def test_clients_are_independent(self) -> None:
+        """Cada IP tem seu próprio bucket."""
+        limiter = TokenBucketLimiter(limit=1, window=60)
+
+        assert limiter.acquire("a", now=0.0).allowed
+        assert limiter.acquire("b", now=0.0).allowed
+        assert not limiter.acquire("a", now=0.0).allowed
+
+    def test_cost_consumes_multiple_tokens(self) -> None:
+        """Custo maior consome mais tokens."""
+        limiter = TokenBucketLimiter(limit=10, window=60)
+
+        assert limiter.acquire("ip", cost=8, now=0.0).remaining == 2
+        assert not limiter.acquire("ip", cost=5, now=0.0).allowed
+
+    def test_evicts_idle_clients(self) -> None:
+        """Clientes parados por uma janela inteira são removidos."""
+        limiter = TokenBucketLimiter(limit=5, window=60, evict_interval=10)
+        limiter.acquire("parado", now=0.0)
+        limiter.acquire("ativo", now=55.0)
+
+        limiter.acquire("ativo", now=66.0)
+
+        assert len(limiter) == 1
+        # Removido volta com o bucket cheio, como se nunca tivesse saído
+        assert limiter.acquire("parado", now=66.0).remaining == 4
+
+
+class TestRedisRateLimiter:
+    """Testes para RedisRateLimiter (script Lua mockado)."""
+
+    @pytest.fixture
+    def script(self) -> AsyncMock:
+        """Script GCRA registrado."""
+        return AsyncMock(return_value=[1, 9, 0])
+
+    @pytest.fixture
+    def limiter(self, script: AsyncMock) -> RedisRateLimiter:
+        """Limitador sobre cliente Redis mockado."""
+        client = MagicMock()
+        client.register_script.return_value = script
+        return RedisRateLimiter(client, limit=10, window=60, failure_threshold=2)
+
+    @pytest.mark.asyncio
+    async def test_uses_gcra_script(
+        self, limiter: RedisRateLimiter, script: AsyncMock
+    ) -> None:
+        """Decisão vem do script, com chave por cliente."""
+        decision = await limiter.check("ip:1.2.3.4", cost=2)
+
+        assert decision.allowed
+        assert decision.remaining == 9
+        script.assert_awaited_once_with(
+            keys=["ratelimit:ip:1.2.3.4"], args=[6000.0, 60000, 2]
+        )
+
+    @pytest.mark.asyncio
+    async def test_denial_carries_retry_after(
+        self, limiter: RedisRateLimiter, script: AsyncMock
+    ) -> None:
+        """retry_after chega em ms e é convertido para segundos."""
+        script.return_value = [0, 0, 4500]
+
+        decision = await limiter.check("ip:x")
+
+        assert not decision.allowed
+        assert decision.retry_after_seconds == 5
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_when_redis_fails(
+        self, limiter: RedisRateLimiter, script: AsyncMock
+    ) -> None:
+        """Com o Redis fora, o limite local assume e o circuito abre."""
+        script.side_effect = redis.ConnectionError("down")
+
+        decisions = [await limiter.check("ip:x") for _ in range(3)]
+
+        assert all(d.allowed for d in decisions)
+        assert decisions[-1].remaining == 7
+        # Após 2 falhas o circuito abre e o Redis deixa de ser chamado
+        assert script.await_count == 2
+        await limiter._breaker.close()
+
+
+def test_build_rate_limiter_uses_backend_setting() -> None:
+    """rate_limit_backend escolhe a implementação."""
+    assert isinstance(build_rate_limiter(Settings()), TokenBucketLimiter)
+    assert isinstance(
+        build_rate_limiter(Settings(rate_limit_backend="redis")), RedisRateLimiter
+    )
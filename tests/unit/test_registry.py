@@ -1,5 +1,7 @@
 """Testes unitários para registry.py."""
 
+import json
+
 import pytest
 from pydantic import Field
 
@@ -123,6 +125,66 @@ class TestSchemaRegistry:
         assert "B" in names
 
 
+class TestSchemaCatalog:
+    """Testes do catálogo pré-serializado."""
+
+    def test_catalog_is_serialized_once(self) -> None:
+        """Acessos repetidos reaproveitam o mesmo documento."""
+        registry = SchemaRegistry()
+
+        @registry.register
+        class A(BaseSchema):
+            __schema_name__ = "A"
+            v: int = Field(description="V")
+
+        catalog = registry.catalog()
+
+        assert registry.catalog() is catalog
+        assert json.loads(catalog.body) == {
+            "schemas": registry.list_schemas(),
+            "total": 1,
+        }
+        assert catalog.etag.startswith('W/"')
+
+    def test_register_invalidates_catalog(self) -> None:
+        """Registrar um schema muda o catálogo e o ETag."""
+        registry = SchemaRegistry()
+
+        @registry.register
+        class A(BaseSchema):
+            __schema_name__ = "A"
+            v: int = Field(description="V")
+
+        before = registry.catalog()
+        schema_before = registry.json_schema("A")
+
+        @registry.register
+        class B(BaseSchema):
+            __schema_name__ = "B"
+            v: str = Field(description="V")
+
+        after = registry.catalog()
+        assert after.etag != before.etag
+        assert json.loads(after.body)["total"] == 2
+        assert registry.json_schema("A") is not schema_before
+
+    def test_json_schema(self) -> None:
+        """JSON Schema serializado por schema; desconhecido gera KeyError."""
+        registry = SchemaRegistry()
+
+        @registry.register
+        class A(BaseSchema):
+            __schema_name__ = "A"
+            v: int = Field(description="V")
+
+        document = registry.json_schema("A")
+
+        assert json.loads(document.body) == A.model_json_schema()
+        assert registry.json_schema("A") is document
+        with pytest.raises(KeyError):
+            registry.json_schema("Inexistente")
+
+
 class TestBaseSchema:
     """Testes para BaseSchema."""
 
@@ -0,0 +1,194 @@
+"""Testes unitários para sharding.py."""
+
+import fnmatch
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import redis.asyncio as redis
+
+from extractor.config import RedisShard
+from extractor.core.sharding import HashRing, Shard, ShardedRedis
+
+
+class FakeRedis:
+    """Redis em memória com os comandos usados pelo ShardedRedis."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key: str, _ttl: int, value: str) -> bool:
+        self.data[key] = value
+        return True
+
+    async def unlink(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match: str, **_kwargs: Any) -> AsyncIterator[str]:
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def dbsize(self) -> int:
+        return len(self.data)
+
+    def pipeline(self, **_kwargs: Any) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Pipeline que executa os comandos do FakeRedis em ordem."""
+
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.queued: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any) -> "FakePipeline":
+            self.queued.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        return [await getattr(self.client, name)(*args) for name, args in self.queued]
+
+
+@pytest.fixture
+def shards() -> list[FakeRedis]:
+    """Três primários em memória."""
+    return [FakeRedis(), FakeRedis(), FakeRedis()]
+
+
+@pytest.fixture
+def sharded(shards: list[FakeRedis]) -> ShardedRedis:
+    """ShardedRedis sobre os primários em memória."""
+    return ShardedRedis(
+        [Shard(client) for client in shards],  # type: ignore[arg-type]
+        ["redis://a", "redis://b", "redis://c"],
+    )
+
+
+class TestHashRing:
+    """Testes para HashRing."""
+
+    def test_distributes_keys_across_nodes(self) -> None:
+        """Chaves se espalham de forma razoavelmente uniforme."""
+        ring = HashRing(["a", "b", "c"])
+        counts = [0, 0, 0]
+        for i in range(30000):
+            counts[ring.node_for(f"extract:Pessoa:{i:016x}")] += 1
+
+        assert min(counts) > 7000
+
+    def test_adding_node_moves_few_keys(self) -> None:
+        """Novo nó move só parte das chaves, todas para ele."""
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+        keys = [f"k{i}" for i in range(10000)]
+
+        moved = [k for k in keys if before.node_for(k) != after.node_for(k)]
+
+        assert len(moved) < 4000
+        assert all(after.node_for(k) == 3 for k in moved)
+
+    def test_requires_nodes(self) -> None:
+        """Anel vazio é erro de configuração."""
+        with pytest.raises(ValueError):
+            HashRing([])
+
+
+class TestShardedRedis:
+    """Testes para ShardedRedis."""
+
+    @pytest.mark.asyncio
+    async def test_writes_land_on_one_shard(
+        self, sharded: ShardedRedis, shards: list[FakeRedis]
+    ) -> None:
+        """Cada chave vive em exatamente um shard e é lida de lá."""
+        for i in range(50):
+            await sharded.setex(f"extract:S:{i}", 60, str(i))
+
+        assert sum(len(s.data) for s in shards) == 50
+        assert all(s.data for s in shards)
+        assert await sharded.get("extract:S:7") == "7"
+
+    @pytest.mark.asyncio
+    async def test_mget_preserves_order(self, sharded: ShardedRedis) -> None:
+        """MGET dividido por shard volta na ordem pedida."""
+        keys = [f"extract:S:{i}" for i in range(20)]
+        for i, key in enumerate(keys):
+            if i % 2:
+                await sharded.setex(key, 60, str(i))
+
+        values = await sharded.mget(keys)
+
+        assert values == [str(i) if i % 2 else None for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_splits_and_merges(self, sharded: ShardedRedis) -> None:
+        """UNLINK multi-chave é dividido por shard e o resultado somado."""
+        keys = [f"extract:S:{i}" for i in range(30)]
+        for key in keys:
+            await sharded.setex(key, 60, "v")
+
+        pipe = sharded.pipeline(transaction=False)
+        pipe.unlink(*keys[:10])
+        pipe.get(keys[20])
+        pipe.unlink(*keys[10:20])
+
+        assert await pipe.execute() == [10, "v", 10]
+        assert await sharded.dbsize() == 10
+
+    @pytest.mark.asyncio
+    async def test_scan_covers_all_shards(self, sharded: ShardedRedis) -> None:
+        """SCAN percorre todos os primários."""
+        for i in range(30):
+            await sharded.setex(f"extract:S:{i}", 60, "v")
+        await sharded.setex("outro:1", 60, "v")
+
+        keys = [key async for key in sharded.scan_iter(match="extract:*")]
+
+        assert len(keys) == 30
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_with_primary_fallback(self) -> None:
+        """GET vai para a réplica; em erro, cai para o primário."""
+        primary, replica = FakeRedis(), FakeRedis()
+        primary.data["k"] = "primario"
+        replica.data["k"] = "replica"
+        sharded = ShardedRedis(
+            [Shard(primary, [replica])],  # type: ignore[list-item]
+            ["redis://a"],
+        )
+
+        assert await sharded.get("k") == "replica"
+
+        replica.get = AsyncMock(side_effect=redis.ConnectionError("down"))  # type: ignore[method-assign]
+        assert await sharded.get("k") == "primario"
+
+    def test_rejects_transactions(self, sharded: ShardedRedis) -> None:
+        """MULTI/EXEC entre shards não é suportado."""
+        with pytest.raises(ValueError):
+            sharded.pipeline(transaction=True)
+
+    def test_from_topology_creates_clients(self) -> None:
+        """Um cliente por primário e por réplica, com as mesmas opções."""
+        topology = [
+            RedisShard(url="redis://a:6379/0", replicas=["redis://a2:6379/0"]),  # type: ignore[arg-type,list-item]
+            RedisShard(url="redis://b:6379/0"),  # type: ignore[arg-type]
+        ]
+
+        with patch("extractor.core.sharding.redis.from_url") as from_url:
+            sharded = ShardedRedis.from_topology(topology, socket_timeout=0.1)
+
+        assert from_url.call_count == 3
+        assert all(c.kwargs == {"socket_timeout": 0.1} for c in from_url.call_args_list)
+        assert len(sharded.shards[0].replicas) == 1
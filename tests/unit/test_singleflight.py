@@ -0,0 +1,103 @@
+"""Testes unitários para singleflight.py."""
+
+import asyncio
+
+import pytest
+
+from extractor.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Testes para SingleFlight."""
+
+    async def test_concurrent_calls_share_one_execution(self) -> None:
+        """Chamadas simultâneas com a mesma chave executam uma vez só."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        results = await asyncio.gather(*(flights.run("k", work) for _ in range(3)))
+
+        assert results == ["ok"] * 3
+        assert calls == 1
+        assert flights.shared == 2
+        assert len(flights) == 0
+
+    async def test_call_survives_while_someone_waits(self) -> None:
+        """Um interessado que desiste não cancela a chamada dos demais."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work() -> str:
+            await release.wait()
+            return "ok"
+
+        leaving = asyncio.create_task(flights.run("k", work))
+        staying = asyncio.create_task(flights.run("k", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await staying == "ok"
+        assert leaving.cancelled()
+        assert flights.cancelled == 0
+
+    async def test_last_waiter_leaving_cancels_the_call(self) -> None:
+        """Sem interessados, a chamada é cancelada e o tempo contabilizado."""
+        flights = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work() -> str:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "nunca"
+
+        waiter = asyncio.create_task(flights.run("k", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert flights.cancelled == 1
+        assert flights.wasted_seconds > 0
+        assert len(flights) == 0
+
+    async def test_timeout_leaves_the_call_to_others(self) -> None:
+        """O timeout de uma request não afeta a espera das outras."""
+        flights = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        patient = asyncio.create_task(flights.run("k", work))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TimeoutError):
+            await flights.run("k", work, timeout=0.01)
+
+        assert await patient == "ok"
+        assert flights.cancelled == 0
+
+    async def test_errors_reach_every_waiter(self) -> None:
+        """A falha da chamada chega a todos os interessados."""
+        flights = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0)
+            raise ValueError("provider")
+
+        results = await asyncio.gather(
+            flights.run("k", work), flights.run("k", work), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.counters()["in_flight"] == 0
@@ -0,0 +1,64 @@
+"""Testes unitários para snapshot.py."""
+
+import gzip
+import json
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from extractor.core.cache import ExportedEntry
+from extractor.core.snapshot import SnapshotReader, write_snapshot
+
+
+async def _entries(rows: list[ExportedEntry]) -> AsyncIterator[ExportedEntry]:
+    """Gera as entradas como o export do cache."""
+    for row in rows:
+        yield row
+
+
+class TestSnapshot:
+    """Testes para write_snapshot e SnapshotReader."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, tmp_path: Path) -> None:
+        """Entradas gravadas voltam iguais (TTL descontado do tempo decorrido)."""
+        path = tmp_path / "cache.jsonl.gz"
+        rows: list[ExportedEntry] = [
+            ("extract:Pessoa:a", '{"nome": "João"}', 60_000),
+            ("extract:Pessoa:b", "{}", None),
+        ]
+
+        assert await write_snapshot(path, _entries(rows)) == 2
+
+        reader = SnapshotReader(path)
+        loaded = list(reader)
+        assert [(k, v) for k, v, _ in loaded] == [(k, v) for k, v, _ in rows]
+        assert 59_000 < loaded[0][2] <= 60_000  # type: ignore[operator]
+        assert loaded[1][2] is None
+
+    @pytest.mark.asyncio
+    async def test_skips_expired_entries(self, tmp_path: Path) -> None:
+        """Entradas vencidas desde a exportação são puladas."""
+        path = tmp_path / "cache.jsonl.gz"
+        rows: list[ExportedEntry] = [
+            ("extract:S:curta", "{}", 1_000),
+            ("extract:S:longa", "{}", 3_600_000),
+        ]
+        await write_snapshot(path, _entries(rows))
+
+        reader = SnapshotReader(path, now=time.time() + 60)
+        loaded = list(reader)
+
+        assert [key for key, _, _ in loaded] == ["extract:S:longa"]
+        assert reader.expired == 1
+
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        """Arquivo sem o cabeçalho do snapshot é recusado."""
+        path = tmp_path / "outro.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(json.dumps({"text": "x"}) + "\n")
+
+        with pytest.raises(ValueError):
+            SnapshotReader(path)
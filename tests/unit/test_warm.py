@@ -0,0 +1,138 @@
+"""Testes unitários para warm.py."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from extractor.core.extractor import ExtractionError
+from extractor.warm import Checkpoint, CorpusRow, RateLimiter, read_corpus, warm_cache
+
+
+def _extractor(cached: set[str] | None = None) -> MagicMock:
+    """ExtractorService falso; textos em `cached` já estão no cache."""
+    cached = cached or set()
+    extractor = MagicMock()
+    extractor.cache.exists = AsyncMock(side_effect=lambda text, _: text in cached)
+    extractor.extract = AsyncMock(return_value={})
+    return extractor
+
+
+def _rows(*texts: str) -> list[CorpusRow]:
+    return [CorpusRow(i, text, "Pessoa") for i, text in enumerate(texts)]
+
+
+class TestReadCorpus:
+    """Testes para read_corpus."""
+
+    def test_reads_jsonl(self, tmp_path: Path) -> None:
+        """Lê JSONL ignorando linhas em branco."""
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text(
+            json.dumps({"text": "a", "schema_name": "Pessoa"})
+            + "\n\n"
+            + json.dumps({"text": "b", "schema_name": "Fatura"})
+            + "\n"
+        )
+
+        rows = list(read_corpus(corpus))
+
+        assert rows == [CorpusRow(0, "a", "Pessoa"), CorpusRow(2, "b", "Fatura")]
+
+    def test_reads_csv(self, tmp_path: Path) -> None:
+        """Lê CSV com cabeçalho."""
+        corpus = tmp_path / "corpus.csv"
+        corpus.write_text('text,schema_name\n"texto, com vírgula",Pessoa\n')
+
+        rows = list(read_corpus(corpus))
+
+        assert rows == [CorpusRow(0, "texto, com vírgula", "Pessoa")]
+
+
+class TestCheckpoint:
+    """Testes para Checkpoint."""
+
+    def test_persists_done_rows(self, tmp_path: Path) -> None:
+        """Linhas marcadas são recarregadas."""
+        path = tmp_path / "ckpt"
+        checkpoint = Checkpoint(path)
+        checkpoint.mark(3)
+        checkpoint.mark(7)
+        checkpoint.close()
+
+        assert Checkpoint(path).done == {3, 7}
+
+
+class TestRateLimiter:
+    """Testes para RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_spaces_acquisitions(self) -> None:
+        """Respeita o intervalo mínimo entre aquisições."""
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+
+        for _ in range(4):
+            await limiter.acquire()
+
+        assert time.monotonic() - start >= 0.05
+
+
+class TestWarmCache:
+    """Testes para warm_cache."""
+
+    @pytest.mark.asyncio
+    async def test_extracts_only_missing(self, tmp_path: Path) -> None:
+        """Entradas já em cache são puladas."""
+        extractor = _extractor(cached={"b"})
+        checkpoint = Checkpoint(tmp_path / "ckpt")
+
+        stats = await warm_cache(iter(_rows("a", "b", "c")), extractor, checkpoint)
+
+        assert (stats.extracted, stats.skipped, stats.failed) == (2, 1, 0)
+        assert extractor.extract.await_count == 2
+        assert checkpoint.done == {0, 1, 2}
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, tmp_path: Path) -> None:
+        """Linhas do checkpoint não são reprocessadas."""
+        path = tmp_path / "ckpt"
+        path.write_text("0\n1\n")
+        extractor = _extractor()
+
+        stats = await warm_cache(
+            iter(_rows("a", "b", "c")), extractor, Checkpoint(path)
+        )
+
+        assert stats.extracted == 1
+        extractor.extract.assert_awaited_once_with("c", "Pessoa")
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_checkpointed(self, tmp_path: Path) -> None:
+        """Falhas ficam fora do checkpoint para nova tentativa."""
+        extractor = _extractor()
+        extractor.extract = AsyncMock(side_effect=ExtractionError("falhou"))
+        checkpoint = Checkpoint(tmp_path / "ckpt")
+
+        stats = await warm_cache(iter(_rows("a")), extractor, checkpoint)
+
+        assert stats.failed == 1
+        assert checkpoint.done == set()
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_do_not_stall_the_run(self, tmp_path: Path) -> None:
+        """Erro fora da extração conta como falha e o worker segue na fila."""
+        extractor = _extractor()
+        extractor.cache.exists = AsyncMock(side_effect=ConnectionError("Redis fora"))
+        checkpoint = Checkpoint(tmp_path / "ckpt")
+
+        stats = await asyncio.wait_for(
+            warm_cache(iter(_rows(*"abcdef")), extractor, checkpoint, concurrency=1),
+            timeout=1,
+        )
+
+        assert stats.failed == 6
+        assert checkpoint.done == set()
@@ -0,0 +1,64 @@
+"""Testes unitários para write_behind.py."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from extractor.core.write_behind import WriteBehindQueue
+
+
+class TestWriteBehindQueue:
+    """Testes para WriteBehindQueue."""
+
+    def test_submit_drops_when_full(self) -> None:
+        """Fila cheia descarta sem bloquear."""
+        queue: WriteBehindQueue[int] = WriteBehindQueue(AsyncMock(), maxsize=2)
+
+        assert queue.submit(1) is True
+        assert queue.submit(2) is True
+        assert queue.submit(3) is False
+        assert queue.dropped == 1
+        assert queue.pending == 2
+
+    @pytest.mark.asyncio
+    async def test_batches_pending_items(self) -> None:
+        """Itens enfileirados antes do writer rodar saem no mesmo lote."""
+        flush = AsyncMock()
+        queue: WriteBehindQueue[int] = WriteBehindQueue(flush, batch_size=3)
+        for i in range(5):
+            queue.submit(i)
+
+        queue.start()
+        await queue.close()
+
+        assert [call.args[0] for call in flush.await_args_list] == [[0, 1, 2], [3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_flush_error_does_not_stop_writer(self) -> None:
+        """Lote com erro é descartado e o writer continua."""
+        flush = AsyncMock(side_effect=[RuntimeError("boom"), None])
+        queue: WriteBehindQueue[int] = WriteBehindQueue(flush, batch_size=1)
+        queue.start()
+
+        queue.submit(1)
+        queue.submit(2)
+        await queue.close()
+
+        assert flush.await_count == 2
+        assert queue.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_close_times_out_on_stuck_flush(self) -> None:
+        """Drenagem respeita o timeout."""
+
+        async def stuck(_batch: list[int]) -> None:
+            await asyncio.sleep(3600)
+
+        queue: WriteBehindQueue[int] = WriteBehindQueue(stuck)
+        queue.start()
+        queue.submit(1)
+
+        await queue.close(timeout=0.05)
+
+        assert queue._task is None